@@ -77,13 +77,11 @@ function CaseForm({ caseData, onClose, onSuccess }) {
         // Upload documents if any
         if (documents.length > 0) {
           for (const file of documents) {
-            const docFormData = new FormData()
-            docFormData.append('file', file)
-            docFormData.append('case_id', caseId)
-            docFormData.append('title', file.name)
-            docFormData.append('description', 'Case document')
-
-            await documentService.uploadDocument(docFormData)
+            await documentService.uploadDocumentChunked(file, {
+              caseId,
+              title: file.name,
+              description: 'Case document'
+            })
           }
         }
 
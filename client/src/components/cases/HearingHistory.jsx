@@ -4,6 +4,9 @@ import HearingUpdateForm from './HearingUpdateForm'
 
 function HearingHistory({ caseId }) {
   const [hearingUpdates, setHearingUpdates] = useState([])
+  const [summary, setSummary] = useState(null)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [loading, setLoading] = useState(true)
   const [showForm, setShowForm] = useState(false)
   const [editingHearing, setEditingHearing] = useState(null)
@@ -14,8 +17,10 @@ function HearingHistory({ caseId }) {
 
   const loadHearingUpdates = async () => {
     try {
-      const data = await hearingUpdateService.getHearingUpdates(caseId)
-      setHearingUpdates(data)
+      const data = await hearingUpdateService.getTimeline(caseId)
+      setHearingUpdates(data.hearingUpdates)
+      setSummary(data.summary)
+      setNextCursor(data.nextCursor)
     } catch (error) {
       console.error('Failed to load hearing updates:', error)
     } finally {
@@ -23,6 +28,19 @@ function HearingHistory({ caseId }) {
     }
   }
 
+  const loadMoreHearingUpdates = async () => {
+    setLoadingMore(true)
+    try {
+      const data = await hearingUpdateService.getTimeline(caseId, nextCursor)
+      setHearingUpdates([...hearingUpdates, ...data.hearingUpdates])
+      setNextCursor(data.nextCursor)
+    } catch (error) {
+      console.error('Failed to load more hearing updates:', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleEdit = (hearing) => {
     setEditingHearing(hearing)
     setShowForm(true)
@@ -61,6 +79,30 @@ function HearingHistory({ caseId }) {
         </button>
       </div>
 
+      {summary && summary.hearing_count > 0 && (
+        <div style={{
+          display: 'flex',
+          flexWrap: 'wrap',
+          gap: '20px',
+          padding: '10px 15px',
+          marginBottom: '20px',
+          backgroundColor: '#f8f9fa',
+          borderRadius: '8px',
+          fontSize: '14px'
+        }}>
+          <span><strong>{summary.hearing_count}</strong> hearings</span>
+          <span>
+            {new Date(summary.first_hearing_date).toLocaleDateString()} – {new Date(summary.last_hearing_date).toLocaleDateString()}
+          </span>
+          {summary.next_hearing_date && (
+            <span>Next: <strong>{new Date(summary.next_hearing_date).toLocaleDateString()}</strong></span>
+          )}
+          {summary.adjournment_streak > 1 && (
+            <span style={{ color: '#dc3545' }}>Adjourned {summary.adjournment_streak} times in a row</span>
+          )}
+        </div>
+      )}
+
       {hearingUpdates.length === 0 ? (
         <div style={{
           textAlign: 'center',
@@ -203,6 +245,13 @@ function HearingHistory({ caseId }) {
               </div>
             </div>
           ))}
+          {nextCursor && (
+            <div style={{ textAlign: 'center' }}>
+              <button onClick={loadMoreHearingUpdates} className="btn btn-secondary" disabled={loadingMore}>
+                {loadingMore ? 'Loading...' : `Load earlier hearings (${hearingUpdates.length} of ${summary?.hearing_count ?? '?'})`}
+              </button>
+            </div>
+          )}
         </div>
       )}
 
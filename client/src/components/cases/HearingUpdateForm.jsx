@@ -41,13 +41,15 @@ function HearingUpdateForm({ caseId, hearingData, onClose, onSuccess }) {
         case_id: caseId
       }
 
-      if (isEditing) {
-        await hearingUpdateService.updateHearingUpdate(hearingData.id, formData)
-        alert('Hearing update updated successfully!')
-      } else {
-        await hearingUpdateService.createHearingUpdate(submitData)
-        alert('Hearing update created successfully!')
+      const result = isEditing
+        ? await hearingUpdateService.updateHearingUpdate(hearingData.id, formData)
+        : await hearingUpdateService.createHearingUpdate(submitData)
+      let message = `Hearing update ${isEditing ? 'updated' : 'created'} successfully!`
+      if (result.conflicts?.length) {
+        message += '\n\nYou have other engagements on the next hearing date:\n' +
+          result.conflicts.map((event) => `- ${event.title}${event.location ? ` (${event.location})` : ''}`).join('\n')
       }
+      alert(message)
 
       onSuccess()
       onClose()
@@ -2,17 +2,32 @@ import { useState, useEffect } from 'react'
 import { calendarService } from '../services/calendarService'
 import { Link } from 'react-router-dom'
 
+const toDateParam = (date) =>
+  `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}-${String(date.getDate()).padStart(2, '0')}`
+
 function Calendar() {
   const [events, setEvents] = useState([])
   const [loading, setLoading] = useState(true)
+  const [month, setMonth] = useState(() => {
+    const today = new Date()
+    return new Date(today.getFullYear(), today.getMonth(), 1)
+  })
 
   useEffect(() => {
     loadEvents()
-  }, [])
+  }, [month])
+
+  const changeMonth = (offset) => {
+    setMonth(new Date(month.getFullYear(), month.getMonth() + offset, 1))
+  }
 
   const loadEvents = async () => {
     try {
-      const data = await calendarService.getEvents()
+      const nextMonth = new Date(month.getFullYear(), month.getMonth() + 1, 1)
+      const data = await calendarService.getEvents({
+        start: toDateParam(month),
+        end: toDateParam(nextMonth)
+      })
       setEvents(data)
     } catch (error) {
       console.error('Failed to load events:', error)
@@ -30,16 +45,22 @@ function Calendar() {
         <Link to="/" className="btn btn-secondary">Back to Dashboard</Link>
       </div>
 
+      <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', marginBottom: '20px' }}>
+        <button onClick={() => changeMonth(-1)} className="btn btn-secondary">&larr; Previous</button>
+        <h2>{month.toLocaleString(undefined, { month: 'long', year: 'numeric' })}</h2>
+        <button onClick={() => changeMonth(1)} className="btn btn-secondary">Next &rarr;</button>
+      </div>
+
       {events.length === 0 ? (
         <div className="card">
-          <p>No events scheduled. Add your first event to get started.</p>
+          <p>No events scheduled this month.</p>
         </div>
       ) : (
         <div>
           {events.map(event => (
-            <div key={event.id} className="card">
+            <div key={`${event.id}-${event.event_date}`} className="card">
               <h3>{event.title}</h3>
-              <p><strong>Type:</strong> {event.event_type}</p>
+              <p><strong>Type:</strong> {event.event_type}{event.recurrence && ` (repeats ${event.recurrence})`}</p>
               <p><strong>Date:</strong> {new Date(event.event_date).toLocaleString()}</p>
               <p><strong>Location:</strong> {event.location || 'N/A'}</p>
               {event.case && <p><strong>Case:</strong> {event.case.title}</p>}
@@ -7,6 +7,9 @@ import HearingHistory from '../components/cases/HearingHistory'
 function Cases() {
   const [cases, setCases] = useState([])
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [totalCases, setTotalCases] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [showForm, setShowForm] = useState(false)
   const [expandedCase, setExpandedCase] = useState(null)
   const [editingCase, setEditingCase] = useState(null)
@@ -19,7 +22,9 @@ function Cases() {
   const loadCases = async () => {
     try {
       const data = await caseService.getCases()
-      setCases(data)
+      setCases(data.cases)
+      setNextCursor(data.nextCursor)
+      setTotalCases(data.total)
     } catch (error) {
       console.error('Failed to load cases:', error)
     } finally {
@@ -27,6 +32,19 @@ function Cases() {
     }
   }
 
+  const loadMoreCases = async () => {
+    setLoadingMore(true)
+    try {
+      const data = await caseService.getCases({ cursor: nextCursor, count: false })
+      setCases([...cases, ...data.cases])
+      setNextCursor(data.nextCursor)
+    } catch (error) {
+      console.error('Failed to load more cases:', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const toggleDetails = (caseId) => {
     setExpandedCase(expandedCase === caseId ? null : caseId)
   }
@@ -49,6 +67,22 @@ function Cases() {
     }
   }
 
+  const handleImport = async (event) => {
+    const file = event.target.files[0]
+    event.target.value = ''
+    if (!file) return
+    try {
+      const report = await caseService.importCases(file)
+      const errors = report.errors.slice(0, 10).map(e => `Row ${e.row}: ${e.error}`).join('\n')
+      alert(`Imported ${report.cases_imported} cases and ${report.hearings_imported} hearing updates.` +
+        (report.error_count ? `\n${report.error_count} rows failed:\n${errors}` : ''))
+      loadCases()
+    } catch (error) {
+      console.error('Failed to import cases:', error)
+      alert(error.response?.data?.error || 'Failed to import cases')
+    }
+  }
+
   const handleFormClose = () => {
     setShowForm(false)
     setEditingCase(null)
@@ -68,6 +102,10 @@ function Cases() {
           >
             + Add New Case
           </button>
+          <label className="btn btn-secondary" style={{ marginRight: '10px', cursor: 'pointer' }}>
+            Import CSV/Excel
+            <input type="file" accept=".csv,.xlsx" onChange={handleImport} style={{ display: 'none' }} />
+          </label>
           <Link to="/" className="btn btn-secondary">Back to Dashboard</Link>
         </div>
       </div>
@@ -233,6 +271,13 @@ function Cases() {
               )}
             </div>
           ))}
+          {nextCursor && (
+            <div style={{ textAlign: 'center', marginTop: '10px' }}>
+              <button onClick={loadMoreCases} className="btn btn-secondary" disabled={loadingMore}>
+                {loadingMore ? 'Loading...' : `Load more (${cases.length}${totalCases !== null ? ` of ${totalCases}` : ''})`}
+              </button>
+            </div>
+          )}
         </div>
       )}
 
@@ -1,8 +1,24 @@
+import { useState, useEffect } from 'react'
 import { useAuth } from '../context/AuthContext'
 import { Link } from 'react-router-dom'
+import { dashboardService } from '../services/dashboardService'
 
 function Dashboard() {
   const { user, logout } = useAuth()
+  const [summary, setSummary] = useState(null)
+
+  useEffect(() => {
+    loadSummary()
+  }, [])
+
+  const loadSummary = async () => {
+    try {
+      const data = await dashboardService.getSummary()
+      setSummary(data)
+    } catch (error) {
+      console.error('Failed to load dashboard summary:', error)
+    }
+  }
 
   return (
     <div className="container">
@@ -11,6 +27,42 @@ function Dashboard() {
         <button onClick={logout} className="btn btn-secondary">Logout</button>
       </div>
 
+      {summary && (
+        <div style={{ display: 'grid', gridTemplateColumns: 'repeat(auto-fit, minmax(180px, 1fr))', gap: '20px', marginBottom: '30px' }}>
+          <div className="card" style={{ textAlign: 'center' }}>
+            <h3>{summary.cases.total}</h3>
+            <p>Total cases</p>
+            <p style={{ fontSize: '12px', color: '#666' }}>
+              {Object.entries(summary.cases.by_status).map(([status, count]) => `${status}: ${count}`).join(' · ')}
+            </p>
+          </div>
+          <div className="card" style={{ textAlign: 'center' }}>
+            <h3>{summary.hearings_today}</h3>
+            <p>Hearings today</p>
+          </div>
+          <div className="card" style={{ textAlign: 'center' }}>
+            <h3>{summary.hearings_this_week}</h3>
+            <p>Hearings this week</p>
+          </div>
+          <div className="card" style={{ textAlign: 'center' }}>
+            <h3 style={{ color: summary.overdue_actions ? '#dc3545' : undefined }}>{summary.overdue_actions}</h3>
+            <p>Overdue actions</p>
+          </div>
+        </div>
+      )}
+
+      {summary && summary.recent_activity.hearings.length > 0 && (
+        <div className="card" style={{ marginBottom: '30px' }}>
+          <h3>Recent hearings</h3>
+          {summary.recent_activity.hearings.map(hearing => (
+            <p key={hearing.id}>
+              <strong>{hearing.case_number}</strong> {hearing.case_title} &mdash; {new Date(hearing.hearing_date).toLocaleDateString()}
+              {hearing.next_hearing_date && ` (next: ${new Date(hearing.next_hearing_date).toLocaleDateString()})`}
+            </p>
+          ))}
+        </div>
+      )}
+
       <div style={{ display: 'grid', gridTemplateColumns: 'repeat(auto-fit, minmax(250px, 1fr))', gap: '20px' }}>
         <Link to="/cases" style={{ textDecoration: 'none' }}>
           <div className="card" style={{ cursor: 'pointer', textAlign: 'center', padding: '40px' }}>
@@ -4,9 +4,17 @@ const api = axios.create({
   baseURL: import.meta.env.VITE_API_URL || 'http://localhost:5000/api',
   headers: {
     'Content-Type': 'application/json'
-  }
+  },
+  // 304 means the cached copy for this URL is still current
+  validateStatus: (status) => (status >= 200 && status < 300) || status === 304
 })
 
+// Last response per GET URL, revalidated with If-None-Match
+const ETAG_CACHE_SIZE = 100
+const etagCache = new Map()
+
+const cacheKey = (config) => api.getUri(config)
+
 api.interceptors.request.use(
   (config) => {
     const token = localStorage.getItem('access_token')
@@ -20,6 +28,12 @@ api.interceptors.request.use(
       }
       config.headers.Authorization = `Bearer ${token}`
     }
+    if ((config.method || 'get').toLowerCase() === 'get') {
+      const cached = etagCache.get(cacheKey(config))
+      if (cached) {
+        config.headers['If-None-Match'] = cached.etag
+      }
+    }
     return config
   },
   (error) => {
@@ -29,7 +43,28 @@ api.interceptors.request.use(
 )
 
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    if ((response.config.method || 'get').toLowerCase() !== 'get') {
+      return response
+    }
+    const key = cacheKey(response.config)
+    const cached = etagCache.get(key)
+    if (response.status === 304 && cached) {
+      // Refresh the entry's position so the least recently used one is evicted
+      etagCache.delete(key)
+      etagCache.set(key, cached)
+      return { ...response, status: 200, data: cached.data, headers: { ...cached.headers, etag: cached.etag } }
+    }
+    const etag = response.headers?.etag
+    if (etag) {
+      etagCache.delete(key)
+      etagCache.set(key, { etag, data: response.data, headers: { ...response.headers } })
+      if (etagCache.size > ETAG_CACHE_SIZE) {
+        etagCache.delete(etagCache.keys().next().value)
+      }
+    }
+    return response
+  },
   async (error) => {
     const originalRequest = error.config
 
@@ -92,6 +127,7 @@ api.interceptors.response.use(
         console.error('Token refresh failed after 401:', refreshError)
         localStorage.removeItem('access_token')
         localStorage.removeItem('refresh_token')
+        etagCache.clear()
         return Promise.reject(refreshError)
       }
     }
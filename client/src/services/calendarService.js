@@ -1,8 +1,34 @@
 import api from './api'
 
 export const calendarService = {
-  async getEvents() {
-    const response = await api.get('/calendar')
+  // params: { start, end } limits the listing to a date window and
+  // expands recurring events inside it
+  async getEvents(params = {}) {
+    const response = await api.get('/calendar', { params })
+    return response.data
+  },
+
+  // Pairs of events that clash between start and end (at most 92 days)
+  async getConflicts(start, end) {
+    const response = await api.get('/calendar/conflicts', { params: { start, end } })
+    return response.data
+  },
+
+  // Changes since a previous sync_token (omit it for everything); follow
+  // nextCursor until the page that carries deleted and sync_token
+  async sync(token, cursor) {
+    const response = await api.get('/calendar/sync', { params: { token, cursor } })
+    return { ...response.data, nextCursor: response.headers['x-next-cursor'] || null }
+  },
+
+  // Private ICS subscription URL; replaces any earlier one
+  async createFeed() {
+    const response = await api.post('/calendar/feed')
+    return response.data
+  },
+
+  async revokeFeed() {
+    const response = await api.delete('/calendar/feed')
     return response.data
   },
 
@@ -1,9 +1,16 @@
 import api from './api'
 
 export const caseService = {
-  async getCases() {
-    const response = await api.get('/cases')
-    return response.data
+  // Fetch one page of cases. Pass the returned nextCursor back as
+  // params.cursor to load the following page.
+  async getCases(params = {}) {
+    const response = await api.get('/cases', { params })
+    const total = response.headers['x-total-count']
+    return {
+      cases: response.data,
+      nextCursor: response.headers['x-next-cursor'] || null,
+      total: total !== undefined ? parseInt(total, 10) : null
+    }
   },
 
   async getCase(id) {
@@ -21,6 +28,17 @@ export const caseService = {
     return response.data
   },
 
+  async importCases(file) {
+    const formData = new FormData()
+    formData.append('file', file)
+    const response = await api.post('/cases/import', formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data'
+      }
+    })
+    return response.data
+  },
+
   async deleteCase(id) {
     const response = await api.delete(`/cases/${id}`)
     return response.data
@@ -1,5 +1,7 @@
 import api from './api'
 
+const MAX_CHUNK_RETRIES = 3
+
 export const documentService = {
   async getCaseDocuments(caseId) {
     const response = await api.get(`/documents/case/${caseId}`)
@@ -15,6 +17,52 @@ export const documentService = {
     return response.data
   },
 
+  // Resumable upload: the file is sent in chunks and a failed chunk is
+  // retried from the offset the server last confirmed
+  async uploadDocumentChunked(file, { caseId, title, description }, onProgress) {
+    const started = await api.post('/documents/uploads', {
+      case_id: caseId,
+      title,
+      description,
+      file_name: file.name,
+      file_size: file.size
+    })
+    const { upload_id: uploadId, chunk_size: chunkSize } = started.data
+    let offset = started.data.offset
+    let retries = 0
+
+    while (offset < file.size) {
+      try {
+        const response = await api.put(`/documents/uploads/${uploadId}`, file.slice(offset, offset + chunkSize), {
+          headers: {
+            'Content-Type': 'application/octet-stream',
+            'Upload-Offset': offset
+          }
+        })
+        offset = response.data.offset
+        retries = 0
+        if (onProgress) {
+          onProgress(offset / file.size)
+        }
+      } catch (error) {
+        if (++retries > MAX_CHUNK_RETRIES) {
+          throw error
+        }
+        const status = await api.get(`/documents/uploads/${uploadId}`)
+        offset = status.data.offset
+      }
+    }
+
+    const response = await api.post(`/documents/uploads/${uploadId}/complete`)
+    return response.data
+  },
+
+  // Short-lived URL usable in <a href> or a PDF viewer (no auth header needed)
+  async getDownloadLink(id) {
+    const response = await api.post(`/documents/${id}/link`)
+    return response.data
+  },
+
   async deleteDocument(id) {
     const response = await api.delete(`/documents/${id}`)
     return response.data
@@ -7,6 +7,20 @@ export const hearingUpdateService = {
     return response.data
   },
 
+  // Fetch one page of a case's hearing history, newest first. The first
+  // page also carries the case summary; pass nextCursor back as cursor
+  // to load the following page.
+  getTimeline: async (caseId, cursor = null, limit = 20) => {
+    const response = await api.get('/hearing-updates/timeline', {
+      params: { case_id: caseId, limit, ...(cursor ? { cursor } : {}) }
+    })
+    return {
+      hearingUpdates: response.data.hearing_updates,
+      summary: response.data.summary || null,
+      nextCursor: response.headers['x-next-cursor'] || null
+    }
+  },
+
   // Get all hearing updates across all cases
   getAllHearingUpdates: async () => {
     const response = await api.get('/hearing-updates/all')
@@ -25,6 +39,13 @@ export const hearingUpdateService = {
     return response.data
   },
 
+  // Create many hearing updates in one request. With atomic = false valid
+  // items are saved even if others fail; results are reported per item.
+  createHearingUpdatesBatch: async (updates, atomic = true) => {
+    const response = await api.post('/hearing-updates/batch', { updates, atomic })
+    return response.data
+  },
+
   // Update a hearing update
   updateHearingUpdate: async (id, updateData) => {
     const response = await api.put(`/hearing-updates/${id}`, updateData)
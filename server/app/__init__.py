@@ -7,6 +7,10 @@ def create_app(config_name='default'):
     app.config.from_object(config[config_name])
     app.url_map.strict_slashes = False
 
+    # orjson-backed JSON when available; dates as ISO 8601
+    from app.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
@@ -16,7 +20,8 @@ def create_app(config_name='default'):
         r"/api/*": {
             "origins": ["http://localhost:5173", "http://127.0.0.1:5173"],
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"],
+            "allow_headers": ["Content-Type", "Authorization", "If-None-Match", "Upload-Offset", "Range", "If-Range"],
+            "expose_headers": ["X-Next-Cursor", "X-Total-Count", "ETag", "Content-Range", "Content-Disposition"],
             "supports_credentials": True
         }
     })
@@ -29,6 +34,9 @@ def create_app(config_name='default'):
     from app.routes.documents import documents_bp
     from app.routes.calendar import calendar_bp
     from app.routes.hearing_updates import hearing_updates_bp
+    from app.routes.dashboard import dashboard_bp
+    from app.routes.search import search_bp
+    from app.routes.export import export_bp
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(cases_bp, url_prefix='/api/cases')
@@ -36,6 +44,53 @@ def create_app(config_name='default'):
     app.register_blueprint(documents_bp, url_prefix='/api/documents')
     app.register_blueprint(calendar_bp, url_prefix='/api/calendar')
     app.register_blueprint(hearing_updates_bp, url_prefix='/api/hearing-updates')
+    app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+    app.register_blueprint(search_bp, url_prefix='/api/search')
+    app.register_blueprint(export_bp, url_prefix='/api/export')
+
+    # bcrypt runs on a bounded process pool, off the request threads
+    from app.services.passwords import configure_password_hashing
+    configure_password_hashing(app)
+
+    # Load the token's user once per request, with deactivation checks
+    from app.middleware.user_context import register_user_context
+    register_user_context(app)
+
+    # Keep per-user dashboard counters in step with writes
+    from app.services.counters import register_counter_listeners
+    register_counter_listeners()
+
+    # Number calendar changes for delta sync; uses the version bump above
+    from app.services.calendar_sync import register_sync_listeners
+    register_sync_listeners()
+
+    # Maintain the inverted search index on databases without FULLTEXT
+    from app.services.search import register_search_listeners
+    register_search_listeners()
+
+    # Document file storage: local disk, S3-compatible or Cloudinary
+    from app.services.storage import configure_storage
+    configure_storage(app)
+
+    # Reference-count content-addressed document blobs
+    from app.services.blobs import register_blob_listeners
+    register_blob_listeners()
+
+    # Keep calendar_events.remind_at on the next reminder due
+    from app.services.reminders import register_reminder_listeners
+    register_reminder_listeners()
+
+    # Background job queue (document thumbnails and text extraction)
+    from app.services.jobs import configure_jobs
+    configure_jobs(app)
+
+    # CLI commands
+    from app.commands import register_commands
+    register_commands(app)
+
+    # gzip/brotli for large buffered responses
+    from app.utils.compression import init_compression
+    init_compression(app)
 
     # Error handlers
     from app.middleware.error_handler import register_error_handlers
@@ -54,7 +109,7 @@ def create_app(config_name='default'):
             headers = response.headers
             headers['Access-Control-Allow-Origin'] = request.headers.get('Origin', '*')
             headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-            headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
+            headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, If-None-Match, Upload-Offset, Range, If-Range'
             headers['Access-Control-Allow-Credentials'] = 'true'
             return response
 
@@ -0,0 +1,187 @@
+import click
+
+
+def register_commands(app):
+    @app.cli.command('rebuild-counters')
+    @click.option('--user-id', type=int, default=None, help='Only rebuild this user\'s counters')
+    def rebuild_counters_command(user_id):
+        """Recount dashboard counters from the source tables."""
+        from app.services.counters import rebuild_counters
+        written = rebuild_counters(user_id)
+        click.echo(f'Rebuilt {written} counter rows')
+
+    @app.cli.command('rebuild-search-index')
+    @click.option('--user-id', type=int, default=None, help='Only reindex this user\'s documents')
+    def rebuild_search_index_command(user_id):
+        """Regenerate the search_postings inverted index."""
+        from app.services.search import rebuild_search_index
+        written = rebuild_search_index(user_id)
+        click.echo(f'Wrote {written} search postings')
+
+    @app.cli.command('purge-uploads')
+    def purge_uploads_command():
+        """Discard chunked uploads idle for longer than UPLOAD_SESSION_TTL."""
+        from app.services.uploads import purge_stale_uploads
+        click.echo(f'Discarded {purge_stale_uploads()} stale uploads')
+
+    @app.cli.command('sync-storage')
+    @click.option('--source', type=click.Path(exists=True, file_okay=False), default=None,
+                  help='Local upload folder to copy from (default UPLOAD_FOLDER)')
+    def sync_storage_command(source):
+        """Copy locally stored document files into the configured storage backend."""
+        from app.services.storage import get_storage, upload_local_files
+
+        storage = get_storage()
+        if storage.name == 'local' and not source:
+            raise click.ClickException('STORAGE_BACKEND is local; set it to the target backend first')
+        copied, skipped = upload_local_files(storage, source or app.config['UPLOAD_FOLDER'])
+        click.echo(f'Copied {copied} files to {storage.name} storage ({skipped} already there)')
+
+    @app.cli.command('gc-storage')
+    @click.option('--grace-hours', type=float, default=None,
+                  help='Keep orphans modified more recently than this (default STORAGE_GC_GRACE_PERIOD)')
+    @click.option('--dry-run', is_flag=True, help='Report orphaned files without deleting them')
+    def gc_storage_command(grace_hours, dry_run):
+        """Delete stored files that no document, blob or upload refers to any more."""
+        from app.services.storage import StorageError
+        from app.services.storage_gc import collect_garbage
+
+        grace_period = grace_hours * 3600 if grace_hours is not None else None
+        try:
+            report = collect_garbage(grace_period, dry_run=dry_run)
+        except StorageError as e:
+            raise click.ClickException(str(e))
+        for name, stats in report.items():
+            if 'skipped' in stats:
+                click.echo(f"{name}: skipped, {stats['skipped']}")
+                continue
+            line = (f"{name}: scanned {stats['scanned']}, orphaned {stats['orphaned']} "
+                    f"({stats['recent']} within the grace period), "
+                    f"{'would delete' if dry_run else 'deleted'} "
+                    f"{stats['orphaned'] - stats['recent'] if dry_run else stats['deleted']}")
+            if not dry_run:
+                line += f", freed {stats['bytes_freed']} bytes"
+            if stats.get('missing'):
+                line += f"; {stats['missing']} referenced files are missing"
+            click.echo(line)
+
+    @app.cli.command('run-jobs')
+    @click.option('--once', is_flag=True, help='Exit when no job is due instead of waiting for more')
+    @click.option('--poll-interval', type=float, default=None, help='Seconds between polls when idle')
+    def run_jobs_command(once, poll_interval):
+        """Process background jobs (thumbnails, text extraction) until interrupted."""
+        from app.services.jobs import work
+        click.echo('Processing jobs' + (' until the queue is empty' if once else '; Ctrl+C to stop'))
+        try:
+            work(app, poll_interval=poll_interval, once=once)
+        except KeyboardInterrupt:
+            pass
+
+    @app.cli.command('run-reminders')
+    @click.option('--once', is_flag=True, help='Fire the reminders that are due now and exit')
+    def run_reminders_command(once):
+        """Fire event reminders as they come due until interrupted; deliveries run on the job queue."""
+        from app.services.reminder_sinks import SinkError, configured_sinks
+        from app.services.reminders import run_scheduler
+
+        try:
+            sinks = configured_sinks(app.config)
+        except SinkError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"Sending reminders via {', '.join(sinks) or 'no sinks'}" + ('' if once else '; Ctrl+C to stop'))
+        try:
+            run_scheduler(app, once=once)
+        except KeyboardInterrupt:
+            pass
+
+    @app.cli.command('rebuild-reminders')
+    def rebuild_reminders_command():
+        """Recompute every event's next reminder time (after upgrading or changing EVENT_TIMEZONE)."""
+        from app.services.reminders import rebuild_reminders
+        click.echo(f'Scheduled reminders for {rebuild_reminders()} events')
+
+    @app.cli.command('purge-calendar-tombstones')
+    def purge_calendar_tombstones_command():
+        """Drop deleted-event tombstones older than CALENDAR_TOMBSTONE_TTL."""
+        from app.services.calendar_sync import purge_tombstones
+        click.echo(f'Removed {purge_tombstones()} tombstones')
+
+    @app.cli.command('process-documents')
+    @click.option('--all', 'everything', is_flag=True, help='Reprocess documents that are already done')
+    def process_documents_command(everything):
+        """Queue thumbnail and text extraction for documents uploaded before the job queue."""
+        from app.extensions import db
+        from app.models.document import Document
+        from app.services.previews import enqueue_processing
+
+        query = Document.query
+        if not everything:
+            query = query.filter(db.or_(Document.processing_status.is_(None),
+                                        Document.processing_status != 'done'))
+        queued = 0
+        for document in query.yield_per(500):
+            enqueue_processing(document)
+            queued += 1
+        db.session.commit()
+        click.echo(f'Queued {queued} documents')
+
+    @app.cli.command('snapshot-cause-lists')
+    @click.option('--date', 'start', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+                  help='First day to build (default tomorrow)')
+    @click.option('--days', type=click.IntRange(1, 31), default=1, help='Number of days to build')
+    def snapshot_cause_lists_command(start, days):
+        """Precompute cause lists so the first request of the morning is served from a snapshot."""
+        from datetime import timedelta
+        from app.services.cause_list import cause_list_today, snapshot_cause_lists
+
+        start = start.date() if start else cause_list_today() + timedelta(days=1)
+        end = start + timedelta(days=days - 1)
+        users = snapshot_cause_lists(start, end)
+        click.echo(f'Built cause lists from {start} to {end} for {users} users')
+
+    @app.cli.command('set-user-active')
+    @click.argument('email')
+    @click.option('--active/--inactive', default=True, help='Reactivate or deactivate the account')
+    def set_user_active_command(email, active):
+        """Activate or deactivate a user; running servers notice within USER_CACHE_TTL seconds."""
+        from app.extensions import db
+        from app.models.user import User
+
+        user = User.query.filter_by(email=email).first()
+        if not user:
+            raise click.ClickException(f'No user with email {email}')
+        user.is_active = active
+        db.session.commit()
+        click.echo(f"{email} is now {'active' if active else 'inactive'}")
+
+    @app.cli.command('import-cases')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--user-email', required=True, help='Advocate who will own the imported cases')
+    @click.option('--chunk-size', type=int, default=None, help='Rows validated and inserted per batch')
+    def import_cases_command(path, user_email, chunk_size):
+        """Bulk-import cases and hearing history from a CSV or .xlsx file."""
+        import time
+        from app.models.user import User
+        from app.services.importer import (IMPORT_CHUNK_SIZE, CaseImporter, ImportFormatError, read_csv_rows,
+                                           read_excel_rows)
+
+        user = User.query.filter_by(email=user_email).first()
+        if not user:
+            raise click.ClickException(f'No user with email {user_email}')
+
+        started = time.perf_counter()
+        # The readers are generators, so a bad file surfaces inside run()
+        try:
+            with open(path, 'rb') as stream:
+                rows = read_excel_rows(stream) if path.lower().endswith('.xlsx') else read_csv_rows(stream)
+                report = CaseImporter(user.id, chunk_size or IMPORT_CHUNK_SIZE).run(rows)
+        except ImportFormatError as e:
+            raise click.ClickException(str(e))
+        elapsed = time.perf_counter() - started
+
+        for error in report['errors']:
+            click.echo(f"row {error['row']}: {error['error']}", err=True)
+        click.echo(f"Imported {report['cases_imported']} cases and {report['hearings_imported']} hearing updates "
+                   f"from {report['rows_processed']} rows in {elapsed:.2f}s "
+                   f"({report['rows_processed'] / elapsed if elapsed else 0:.0f} rows/sec), "
+                   f"{report['error_count']} errors")
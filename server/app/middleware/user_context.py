@@ -0,0 +1,26 @@
+from flask import jsonify
+from app.extensions import jwt
+
+
+def register_user_context(app):
+    """Resolve the token's user once per request, through the user cache.
+
+    flask_jwt_extended calls the lookup on every @jwt_required() request
+    and keeps the result for the rest of the request as current_user, so
+    handlers and the is_active check share one cached read.
+    """
+    from app.services.user_cache import configure_user_cache, load_user, register_user_cache_listeners
+
+    configure_user_cache(app)
+    register_user_cache_listeners()
+
+    @jwt.user_lookup_loader
+    def lookup_user(jwt_header, jwt_data):
+        user = load_user(int(jwt_data[app.config['JWT_IDENTITY_CLAIM']]))
+        if user is None or user.is_active is False:
+            return None
+        return user
+
+    @jwt.user_lookup_error_loader
+    def user_lookup_error(jwt_header, jwt_data):
+        return jsonify({'error': 'Account is deactivated or no longer exists'}), 401
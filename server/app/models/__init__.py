@@ -3,5 +3,14 @@ from app.models.client import Client
 from app.models.case import Case
 from app.models.document import Document
 from app.models.calendar_event import CalendarEvent
+from app.models.user_counter import UserCounter
+from app.models.search_posting import SearchPosting
+from app.models.blob import Blob
+from app.models.upload_session import UploadSession
+from app.models.job import Job
+from app.models.cause_list_snapshot import CauseListSnapshot
+from app.models.reminder_delivery import ReminderDelivery
+from app.models.calendar_tombstone import CalendarTombstone
 
-__all__ = ['User', 'Client', 'Case', 'Document', 'CalendarEvent']
+__all__ = ['User', 'Client', 'Case', 'Document', 'CalendarEvent', 'UserCounter', 'SearchPosting', 'Blob',
+           'UploadSession', 'Job', 'CauseListSnapshot', 'ReminderDelivery', 'CalendarTombstone']
@@ -0,0 +1,19 @@
+from app.extensions import db
+from datetime import datetime
+
+class Blob(db.Model):
+    """A stored file, addressed by the SHA-256 of its contents.
+
+    Documents reference blobs by hash, so identical files uploaded to
+    several cases are stored once. ref_count is the number of documents
+    pointing at the blob; rows are changed only through app.services.blobs.
+    """
+    __tablename__ = 'blobs'
+
+    sha256 = db.Column(db.String(64), primary_key=True)
+    size = db.Column(db.BigInteger, nullable=False)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Blob {self.sha256[:12]} refs={self.ref_count}>'
@@ -3,6 +3,14 @@ from datetime import datetime
 
 class CalendarEvent(db.Model):
     __tablename__ = 'calendar_events'
+    __table_args__ = (
+        db.Index('ix_calendar_events_user_id_event_date', 'user_id', 'event_date'),
+        db.Index('ix_calendar_events_user_id_recurrence', 'user_id', 'recurrence'),
+        db.Index('ix_calendar_events_user_id_is_completed_event_date', 'user_id', 'is_completed', 'event_date'),
+        db.Index('ix_calendar_events_remind_at', 'remind_at'),
+        db.Index('ix_calendar_events_updated_at', 'updated_at'),
+        db.Index('ix_calendar_events_user_id_sync_seq', 'user_id', 'sync_seq'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -12,8 +20,22 @@ class CalendarEvent(db.Model):
     event_type = db.Column(db.String(50))  # Hearing, Meeting, Deadline, etc.
     event_date = db.Column(db.DateTime, nullable=False)
     location = db.Column(db.String(200))
+    # Minutes; null means all day for an event at midnight, an hour otherwise
+    # (see app.services.conflicts)
+    duration = db.Column(db.Integer)
     reminder_time = db.Column(db.Integer)  # minutes before event
+    # When the next reminder is due (next occurrence minus reminder_time);
+    # kept by app.services.reminders, null when nothing is left to remind
+    remind_at = db.Column(db.DateTime)
     is_completed = db.Column(db.Boolean, default=False)
+
+    # Recurrence rule; occurrences are expanded on read, never stored
+    recurrence = db.Column(db.String(20))  # daily, weekly, monthly, yearly
+    recurrence_interval = db.Column(db.Integer, default=1)  # every N periods
+    recurrence_until = db.Column(db.DateTime)  # last possible occurrence, open-ended if null
+    # User's sync sequence number at the last change, for delta sync; set by
+    # app.services.calendar_sync, 0 for rows unchanged since it was added
+    sync_seq = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
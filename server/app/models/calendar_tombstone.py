@@ -0,0 +1,26 @@
+from app.extensions import db
+from datetime import datetime
+
+class CalendarTombstone(db.Model):
+    """Marks a deleted calendar event for sync clients.
+
+    `seq` is the user's sync sequence number at deletion (see
+    app.services.calendar_sync). Clients syncing from an earlier token are
+    told to drop event_id. Tombstones are purged after
+    CALENDAR_TOMBSTONE_TTL, which is also how long a sync token stays valid.
+    """
+    __tablename__ = 'calendar_tombstones'
+    __table_args__ = (
+        db.Index('ix_calendar_tombstones_user_id_seq', 'user_id', 'seq'),
+        db.Index('ix_calendar_tombstones_deleted_at', 'deleted_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    # No foreign key: the event row is gone
+    event_id = db.Column(db.Integer, nullable=False)
+    seq = db.Column(db.BigInteger, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CalendarTombstone {self.event_id} {self.seq}>'
@@ -3,6 +3,12 @@ from datetime import datetime
 
 class Case(db.Model):
     __tablename__ = 'cases'
+    __table_args__ = (
+        db.Index('ix_cases_user_id_status_created_at', 'user_id', 'status', 'created_at'),
+        db.Index('ix_cases_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ft_cases_text', 'case_number', 'title', 'client_name', 'opposite_party', 'otherside_counsel',
+                 'court_name', 'description', 'remarks', 'notes', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -0,0 +1,22 @@
+from app.extensions import db
+from datetime import datetime
+
+class CauseListSnapshot(db.Model):
+    """A user's generated cause list for one day.
+
+    `entries` holds the day's rows exactly as the cause-list endpoint
+    returns them. `versions` records the user's hearing_updates and cases
+    version counters at generation time; a snapshot whose versions no
+    longer match is stale and is rebuilt on the next read. Rows are
+    changed only through app.services.cause_list.
+    """
+    __tablename__ = 'cause_list_snapshots'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    list_date = db.Column(db.Date, primary_key=True)
+    versions = db.Column(db.String(64), nullable=False)
+    entries = db.Column(db.JSON, nullable=False)
+    generated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CauseListSnapshot {self.user_id} {self.list_date}>'
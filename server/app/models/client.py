@@ -3,6 +3,10 @@ from datetime import datetime
 
 class Client(db.Model):
     __tablename__ = 'clients'
+    __table_args__ = (
+        db.Index('ft_clients_text', 'name', 'email', 'phone', 'address', 'notes',
+                 mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
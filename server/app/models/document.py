@@ -1,18 +1,34 @@
 from app.extensions import db
 from datetime import datetime
+from sqlalchemy.dialects import mysql
 
 class Document(db.Model):
     __tablename__ = 'documents'
+    __table_args__ = (
+        db.Index('ix_documents_case_id', 'case_id'),
+        db.Index('ix_documents_sha256', 'sha256'),
+        db.Index('ix_documents_user_id', 'user_id'),
+        db.Index('ft_documents_text', 'title', 'file_name', 'description', 'extracted_text',
+                 mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     case_id = db.Column(db.Integer, db.ForeignKey('cases.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)  # owner of the case, for search
     title = db.Column(db.String(200), nullable=False)
     file_name = db.Column(db.String(255), nullable=False)
     file_url = db.Column(db.String(500), nullable=False)
     file_type = db.Column(db.String(50))
     file_size = db.Column(db.Integer)  # in bytes
+    sha256 = db.Column(db.String(64), db.ForeignKey('blobs.sha256'))  # content-addressed blob, NULL for legacy files
     description = db.Column(db.Text)
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Filled in by the document.process background job (app.services.previews)
+    processing_status = db.Column(db.String(20), default='pending')  # pending, done, failed
+    has_thumbnail = db.Column(db.Boolean, nullable=False, default=False)
+    # Deferred: only search and the job read it, listings never load it
+    extracted_text = db.deferred(db.Column(db.Text().with_variant(mysql.MEDIUMTEXT(), 'mysql')))
+
     def __repr__(self):
         return f'<Document {self.title}>'
@@ -3,6 +3,13 @@ from datetime import datetime
 
 class HearingUpdate(db.Model):
     __tablename__ = 'hearing_updates'
+    __table_args__ = (
+        db.Index('ix_hearing_updates_user_id_hearing_date', 'user_id', 'hearing_date'),
+        db.Index('ix_hearing_updates_case_id_hearing_date', 'case_id', 'hearing_date'),
+        db.Index('ix_hearing_updates_user_id_next_hearing_date', 'user_id', 'next_hearing_date'),
+        db.Index('ft_hearing_updates_text', 'action_taken', 'court_order', 'action_to_be_taken',
+                 mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     case_id = db.Column(db.Integer, db.ForeignKey('cases.id', ondelete='CASCADE'), nullable=False)
@@ -29,16 +36,5 @@ class HearingUpdate(db.Model):
         return f'<HearingUpdate {self.id} - Case {self.case_id} - {self.hearing_date}>'
 
     def to_dict(self):
-        return {
-            'id': self.id,
-            'case_id': self.case_id,
-            'user_id': self.user_id,
-            'hearing_date': self.hearing_date.isoformat() if self.hearing_date else None,
-            'action_taken': self.action_taken,
-            'court_order': self.court_order,
-            'next_hearing_date': self.next_hearing_date.isoformat() if self.next_hearing_date else None,
-            'action_to_be_taken': self.action_to_be_taken,
-            'calendar_event_id': self.calendar_event_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        from app.schemas.resources import hearing_update_serializer
+        return hearing_update_serializer.dump(self)
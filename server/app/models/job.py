@@ -0,0 +1,31 @@
+from app.extensions import db
+from datetime import datetime
+
+class Job(db.Model):
+    """A unit of background work; the table is the queue.
+
+    Workers claim `queued` rows whose run_at has passed, mark them
+    `running` and delete them once the handler succeeds. Failed attempts
+    go back to `queued` with a later run_at until max_attempts is reached,
+    then stay as `failed` for inspection. Rows are changed only through
+    app.services.jobs.
+    """
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_status_run_at', 'status', 'run_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(64))
+    locked_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<Job {self.id} {self.kind} {self.status}>'
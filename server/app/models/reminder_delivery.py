@@ -0,0 +1,31 @@
+from app.extensions import db
+from datetime import datetime
+
+class ReminderDelivery(db.Model):
+    """One reminder for one event occurrence through one sink (log, email, webhook).
+
+    The row is written in the same transaction that moves the event's
+    remind_at past the occurrence, and (event_id, occurrence_at, sink) is
+    unique, so a restarted or second scheduler cannot fire it again.
+    Status: pending, sending, sent, failed, or interrupted when a worker
+    died mid-send and the reminder may or may not have gone out.
+    """
+    __tablename__ = 'reminder_deliveries'
+    __table_args__ = (
+        db.UniqueConstraint('event_id', 'occurrence_at', 'sink', name='uq_reminder_deliveries_event_occurrence_sink'),
+        db.Index('ix_reminder_deliveries_user_id_created_at', 'user_id', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('calendar_events.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    occurrence_at = db.Column(db.DateTime, nullable=False)
+    sink = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<ReminderDelivery {self.event_id} {self.occurrence_at} {self.sink} {self.status}>'
@@ -0,0 +1,21 @@
+from app.extensions import db
+
+class SearchPosting(db.Model):
+    """Inverted index entry used by /api/search when MySQL FULLTEXT is unavailable.
+
+    One row per (user, term, document) with the term frequency across the
+    document's searchable fields.
+    """
+    __tablename__ = 'search_postings'
+    __table_args__ = (
+        db.Index('ix_search_postings_doc_type_doc_id', 'doc_type', 'doc_id'),
+    )
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    term = db.Column(db.String(64), primary_key=True)
+    doc_type = db.Column(db.String(20), primary_key=True)  # case, client, hearing, document
+    doc_id = db.Column(db.Integer, primary_key=True)
+    tf = db.Column(db.Integer, nullable=False, default=1)
+
+    def __repr__(self):
+        return f'<SearchPosting {self.term} {self.doc_type}:{self.doc_id}>'
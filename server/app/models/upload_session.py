@@ -0,0 +1,38 @@
+from app.extensions import db
+from datetime import datetime
+
+class UploadSession(db.Model):
+    """A resumable document upload in progress.
+
+    Chunks are appended to a part file under UPLOAD_FOLDER/tmp; `received`
+    is the number of bytes safely written so far, which is where the next
+    chunk must start.
+    """
+    __tablename__ = 'upload_sessions'
+    __table_args__ = (
+        db.Index('ix_upload_sessions_updated_at', 'updated_at'),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    case_id = db.Column(db.Integer, db.ForeignKey('cases.id', ondelete='CASCADE'), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    file_name = db.Column(db.String(255), nullable=False)
+    file_size = db.Column(db.BigInteger, nullable=False)
+    received = db.Column(db.BigInteger, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'upload_id': self.id,
+            'case_id': self.case_id,
+            'title': self.title,
+            'file_name': self.file_name,
+            'file_size': self.file_size,
+            'offset': self.received
+        }
+
+    def __repr__(self):
+        return f'<UploadSession {self.id} {self.received}/{self.file_size}>'
@@ -12,6 +12,8 @@ class User(db.Model):
     phone = db.Column(db.String(20))
     address = db.Column(db.Text)
     is_active = db.Column(db.Boolean, default=True)
+    # SHA-256 of the secret in the user's calendar feed URL; null when no feed is published
+    calendar_feed_token = db.Column(db.String(64), unique=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -0,0 +1,18 @@
+from app.extensions import db
+
+class UserCounter(db.Model):
+    """Per-user aggregate counts kept in step with case, hearing and event writes.
+
+    Names are 'cases', 'cases:<status>', 'hearing_updates', 'events',
+    'events:open', 'documents', 'storage_bytes' (sum of document sizes,
+    for quotas) and 'version:<collection>' write counters used for ETags.
+    Rows are changed only through app.services.counters.
+    """
+    __tablename__ = 'user_counters'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    name = db.Column(db.String(80), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<UserCounter {self.user_id} {self.name}={self.value}>'
@@ -1,10 +1,19 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity
-from app.extensions import db, bcrypt
+from flask_jwt_extended import create_access_token, create_refresh_token, current_user, jwt_required, get_jwt_identity
+from app.extensions import db
 from app.models.user import User
+from app.services.passwords import PasswordHasherBusy, passwords
 
 auth_bp = Blueprint('auth', __name__)
 
+
+@auth_bp.errorhandler(PasswordHasherBusy)
+def password_hasher_busy(error):
+    response = jsonify({'error': 'Server busy, please try again shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     data = request.get_json()
@@ -15,7 +24,7 @@ def register():
     if User.query.filter_by(email=data['email']).first():
         return jsonify({'error': 'Email already registered'}), 400
 
-    hashed_password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+    hashed_password = passwords.hash(data['password'])
 
     new_user = User(
         email=data['email'],
@@ -47,12 +56,17 @@ def login():
 
     user = User.query.filter_by(email=data['email']).first()
 
-    if not user or not bcrypt.check_password_hash(user.password_hash, data['password']):
+    if not user or not passwords.check(user.password_hash, data['password']):
         return jsonify({'error': 'Invalid credentials'}), 401
 
     if not user.is_active:
         return jsonify({'error': 'Account is deactivated'}), 403
 
+    # Upgrade hashes made with an older cost factor while we have the password
+    if passwords.needs_rehash(user.password_hash):
+        user.password_hash = passwords.hash(data['password'])
+        db.session.commit()
+
     access_token = create_access_token(identity=str(user.id))
     refresh_token = create_refresh_token(identity=str(user.id))
 
@@ -70,11 +84,8 @@ def login():
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def get_current_user():
-    user_id = int(get_jwt_identity())
-    user = User.query.get(user_id)
-
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
+    # Loaded (and checked for is_active) by the JWT user lookup, usually from cache
+    user = current_user
 
     return jsonify({
         'id': user.id,
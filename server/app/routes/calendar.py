@@ -1,53 +1,202 @@
-from flask import Blueprint, request, jsonify
+import hashlib
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
 from app.extensions import db
 from app.models.calendar_event import CalendarEvent
 from app.models.case import Case
+from app.models.user import User
+from app.schemas.resources import EVENT_LIST_FIELDS, event_serializer
+from app.services.calendar_sync import (SyncTokenError, current_sync_seq, deleted_since, feed_owner,
+                                        issue_feed_token, last_modified, make_sync_token, read_sync_token)
+from app.services.conflicts import MAX_CONFLICT_RANGE_DAYS, MAX_EVENT_DURATION, conflicts_in_range, event_conflicts
+from app.services.ics import calendar_feed
+from app.services.recurrence import RECURRENCE_RULES, expand_occurrences
+from app.services.user_cache import load_user
+from app.utils.compression import ENCODING_ETAG_SUFFIXES
+from app.utils.etag import conditional
+from app.utils.pagination import CursorError, keyset_page, parse_limit
+from app.utils.streaming import chunked
 
 calendar_bp = Blueprint('calendar', __name__)
 
+# Longest ?start=/?end= window a listing expands recurring events over
+MAX_EVENT_WINDOW_DAYS = 366
+SYNC_PAGE_SIZE = 500
+MAX_SYNC_PAGE_SIZE = 1000
+
+def parse_window_bound(value):
+    """Accept either YYYY-MM-DD or a full ISO datetime for ?start= / ?end="""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+
+def parse_event_date(value):
+    """Parse event_date; a value with a UTC offset is converted to EVENT_TIMEZONE wall-clock time"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(ZoneInfo(current_app.config['EVENT_TIMEZONE'])).replace(tzinfo=None)
+    return parsed
+
+def parse_reminder_time(value):
+    """Minutes before the event, or None for no reminder; raises ValueError"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        raise ValueError
+    minutes = int(value)
+    if minutes < 0:
+        raise ValueError
+    return minutes
+
+def parse_duration(value):
+    """Length in minutes, or None for the default; raises ValueError"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool):
+        raise ValueError
+    minutes = int(value)
+    if not 0 < minutes <= MAX_EVENT_DURATION:
+        raise ValueError
+    return minutes
+
+def parse_recurrence(data, start, until=None):
+    """Validate recurrence fields from a request body.
+
+    start is the event's start date and until the end date it already has
+    (on update); a series may not end on a day before it starts.
+    Returns (fields, error) where fields holds only the keys present in data.
+    """
+    fields = {}
+    if 'recurrence' in data:
+        rule = data['recurrence'] or None
+        if rule is not None and rule not in RECURRENCE_RULES:
+            return None, f"Invalid recurrence. Use one of: {', '.join(RECURRENCE_RULES)}"
+        fields['recurrence'] = rule
+    if 'recurrence_interval' in data:
+        try:
+            interval = int(data['recurrence_interval'] or 1)
+        except (TypeError, ValueError):
+            return None, 'recurrence_interval must be a positive integer'
+        if interval < 1:
+            return None, 'recurrence_interval must be a positive integer'
+        fields['recurrence_interval'] = interval
+    if 'recurrence_until' in data:
+        if data['recurrence_until']:
+            try:
+                fields['recurrence_until'] = parse_window_bound(data['recurrence_until'])
+            except ValueError:
+                return None, 'Invalid recurrence_until format'
+        else:
+            fields['recurrence_until'] = None
+    until = fields.get('recurrence_until', until)
+    if until and until.date() < start.date():
+        return None, 'recurrence_until must not be before event_date'
+    return fields, None
+
+def event_summary(event, occurrence=None):
+    item = event_serializer.dump(event, EVENT_LIST_FIELDS)
+    if occurrence is not None:
+        item['event_date'] = occurrence.isoformat()
+    item['case'] = {
+        'id': event.case.id,
+        'case_number': event.case.case_number,
+        'title': event.case.title
+    } if event.case else None
+    return item
+
 @calendar_bp.route('/', methods=['GET'])
 @jwt_required()
+@conditional('events', 'cases')
 def get_events():
+    """List events, optionally limited to a [start, end) window.
+
+    Inside a window, recurring events are expanded into one entry per
+    occurrence; without a window each event is returned once.
+    """
     user_id = int(get_jwt_identity())
-    events = CalendarEvent.query.filter_by(user_id=user_id).order_by(CalendarEvent.event_date).all()
-
-    return jsonify([{
-        'id': event.id,
-        'title': event.title,
-        'description': event.description,
-        'event_type': event.event_type,
-        'event_date': event.event_date.isoformat(),
-        'location': event.location,
-        'is_completed': event.is_completed,
-        'case': {
-            'id': event.case.id,
-            'case_number': event.case.case_number,
-            'title': event.case.title
-        } if event.case else None
-    } for event in events]), 200
+    start = request.args.get('start')
+    end = request.args.get('end')
+
+    # Load the case summary in the same SELECT instead of one lazy load per event
+    query = CalendarEvent.query.filter_by(user_id=user_id).options(
+        joinedload(CalendarEvent.case).load_only(Case.id, Case.case_number, Case.title)
+    )
+
+    if not start and not end:
+        events = query.order_by(CalendarEvent.event_date).all()
+        return jsonify([event_summary(event) for event in events]), 200
+
+    if not start or not end:
+        return jsonify({'error': 'Both start and end are required'}), 400
+    try:
+        window_start = parse_window_bound(start)
+        window_end = parse_window_bound(end)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format'}), 400
+    if window_end <= window_start:
+        return jsonify({'error': 'end must be after start'}), 400
+    if (window_end - window_start).days > MAX_EVENT_WINDOW_DAYS:
+        return jsonify({'error': f'At most {MAX_EVENT_WINDOW_DAYS} days per request'}), 400
+
+    # One-off events: range scan on (user_id, event_date)
+    single_events = query.filter(
+        CalendarEvent.recurrence.is_(None),
+        CalendarEvent.event_date >= window_start,
+        CalendarEvent.event_date < window_end
+    ).all()
+    result = [(event.event_date, event_summary(event)) for event in single_events]
+
+    # Recurring series that may have an occurrence inside the window
+    series = query.filter(
+        CalendarEvent.recurrence.isnot(None),
+        CalendarEvent.event_date < window_end,
+        or_(CalendarEvent.recurrence_until.is_(None), CalendarEvent.recurrence_until >= window_start)
+    ).all()
+    for event in series:
+        for occurrence in expand_occurrences(event.event_date, event.recurrence, event.recurrence_interval,
+                                             event.recurrence_until, window_start, window_end):
+            result.append((occurrence, event_summary(event, occurrence)))
+
+    result.sort(key=lambda item: item[0])
+    return jsonify([item for _, item in result]), 200
+
+@calendar_bp.route('/conflicts', methods=['GET'])
+@jwt_required()
+@conditional('events')
+def get_conflicts():
+    """Every pair of the user's open events that clash in [start, end), found by a sweep-line"""
+    user_id = int(get_jwt_identity())
+    start = request.args.get('start')
+    end = request.args.get('end')
+    if not start or not end:
+        return jsonify({'error': 'Both start and end are required'}), 400
+    try:
+        window_start = parse_window_bound(start)
+        window_end = parse_window_bound(end)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format'}), 400
+    if window_end <= window_start:
+        return jsonify({'error': 'end must be after start'}), 400
+    if (window_end - window_start).days > MAX_CONFLICT_RANGE_DAYS:
+        return jsonify({'error': f'At most {MAX_CONFLICT_RANGE_DAYS} days per request'}), 400
+
+    return jsonify(conflicts_in_range(user_id, window_start, window_end)), 200
 
 @calendar_bp.route('/<int:event_id>', methods=['GET'])
 @jwt_required()
+@conditional('events')
 def get_event(event_id):
     user_id = int(get_jwt_identity())
-    event = CalendarEvent.query.filter_by(id=event_id, user_id=user_id).first()
+    event = db.session.query(*event_serializer.columns()).filter(
+        CalendarEvent.id == event_id, CalendarEvent.user_id == user_id
+    ).first()
 
     if not event:
         return jsonify({'error': 'Event not found'}), 404
 
-    return jsonify({
-        'id': event.id,
-        'title': event.title,
-        'description': event.description,
-        'event_type': event.event_type,
-        'event_date': event.event_date.isoformat(),
-        'location': event.location,
-        'reminder_time': event.reminder_time,
-        'is_completed': event.is_completed,
-        'case_id': event.case_id
-    }), 200
+    return jsonify(event_serializer.dump(event)), 200
 
 @calendar_bp.route('/', methods=['POST'])
 @jwt_required()
@@ -65,9 +214,21 @@ def create_event():
             return jsonify({'error': 'Case not found'}), 404
 
     try:
-        event_date = datetime.fromisoformat(data['event_date'].replace('Z', '+00:00'))
+        event_date = parse_event_date(data['event_date'])
     except ValueError:
         return jsonify({'error': 'Invalid date format'}), 400
+    try:
+        reminder_time = parse_reminder_time(data.get('reminder_time'))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'reminder_time must be a non-negative number of minutes'}), 400
+    try:
+        duration = parse_duration(data.get('duration'))
+    except (TypeError, ValueError):
+        return jsonify({'error': f'duration must be between 1 and {MAX_EVENT_DURATION} minutes'}), 400
+
+    recurrence, error = parse_recurrence(data, event_date)
+    if error:
+        return jsonify({'error': error}), 400
 
     new_event = CalendarEvent(
         user_id=user_id,
@@ -76,20 +237,26 @@ def create_event():
         description=data.get('description'),
         event_type=data.get('event_type'),
         event_date=event_date,
+        duration=duration,
         location=data.get('location'),
-        reminder_time=data.get('reminder_time')
+        reminder_time=reminder_time,
+        **recurrence
     )
 
     db.session.add(new_event)
+    db.session.flush()
+    conflicts = event_conflicts(new_event)
+    event = {
+        'id': new_event.id,
+        'title': new_event.title,
+        'event_date': new_event.event_date.isoformat()
+    }
     db.session.commit()
 
     return jsonify({
         'message': 'Event created successfully',
-        'event': {
-            'id': new_event.id,
-            'title': new_event.title,
-            'event_date': new_event.event_date.isoformat()
-        }
+        'event': event,
+        'conflicts': conflicts
     }), 201
 
 @calendar_bp.route('/<int:event_id>', methods=['PUT'])
@@ -111,17 +278,35 @@ def update_event(event_id):
         event.event_type = data['event_type']
     if data.get('event_date'):
         try:
-            event.event_date = datetime.fromisoformat(data['event_date'].replace('Z', '+00:00'))
+            event.event_date = parse_event_date(data['event_date'])
         except ValueError:
             return jsonify({'error': 'Invalid date format'}), 400
+    if 'reminder_time' in data:
+        try:
+            event.reminder_time = parse_reminder_time(data['reminder_time'])
+        except (TypeError, ValueError):
+            return jsonify({'error': 'reminder_time must be a non-negative number of minutes'}), 400
+    if 'duration' in data:
+        try:
+            event.duration = parse_duration(data['duration'])
+        except (TypeError, ValueError):
+            return jsonify({'error': f'duration must be between 1 and {MAX_EVENT_DURATION} minutes'}), 400
     if data.get('location'):
         event.location = data['location']
     if 'is_completed' in data:
         event.is_completed = data['is_completed']
 
+    recurrence, error = parse_recurrence(data, event.event_date, event.recurrence_until)
+    if error:
+        return jsonify({'error': error}), 400
+    for field, value in recurrence.items():
+        setattr(event, field, value)
+
+    db.session.flush()
+    conflicts = event_conflicts(event)
     db.session.commit()
 
-    return jsonify({'message': 'Event updated successfully'}), 200
+    return jsonify({'message': 'Event updated successfully', 'conflicts': conflicts}), 200
 
 @calendar_bp.route('/<int:event_id>', methods=['DELETE'])
 @jwt_required()
@@ -136,3 +321,116 @@ def delete_event(event_id):
     db.session.commit()
 
     return jsonify({'message': 'Event deleted successfully'}), 200
+
+
+@calendar_bp.route('/sync', methods=['GET'])
+@jwt_required()
+def sync_events():
+    """Events changed since a sync token, and the ids of events deleted since.
+
+    Without ?token= every event is returned. Rows are paged in change order
+    with the cursor in X-Next-Cursor (pass the same token with it). The
+    last page carries `deleted` and the `sync_token` to send next time.
+    """
+    user_id = int(get_jwt_identity())
+    since = -1
+    if request.args.get('token'):
+        try:
+            since = read_sync_token(request.args['token'])
+        except SyncTokenError as e:
+            return jsonify({'error': str(e)}), e.status
+    limit = parse_limit(request.args.get('limit'), SYNC_PAGE_SIZE, MAX_SYNC_PAGE_SIZE)
+
+    # Read before the rows: every change numbered up to it has committed,
+    # so the rows below include them (and perhaps a few later ones)
+    seq = current_sync_seq(user_id)
+    query = db.session.query(*event_serializer.columns(extra=('sync_seq',))).filter(
+        CalendarEvent.user_id == user_id, CalendarEvent.sync_seq > since
+    )
+    try:
+        rows, next_cursor = keyset_page(query, CalendarEvent.sync_seq, CalendarEvent.id,
+                                        request.args.get('cursor'), limit, descending=False)
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
+
+    body = {'events': event_serializer.dump_many(rows)}
+    if next_cursor:
+        response = jsonify(body)
+        response.headers['X-Next-Cursor'] = next_cursor
+        return response, 200
+    # A full sync also lists recent deletions; ids the client never had can be ignored
+    body['deleted'] = deleted_since(user_id, since)
+    body['sync_token'] = make_sync_token(seq)
+    return jsonify(body), 200
+
+@calendar_bp.route('/feed', methods=['POST'])
+@jwt_required()
+def create_feed():
+    """Publish the calendar at a secret URL for calendar apps; replaces any earlier URL"""
+    user = db.session.get(User, int(get_jwt_identity()))
+    token = issue_feed_token(user)
+    db.session.commit()
+    return jsonify({
+        'message': 'Calendar feed created. The URL is shown only once.',
+        'url': url_for('calendar.calendar_feed_ics', token=token, _external=True)
+    }), 201
+
+@calendar_bp.route('/feed', methods=['DELETE'])
+@jwt_required()
+def delete_feed():
+    user = db.session.get(User, int(get_jwt_identity()))
+    user.calendar_feed_token = None
+    db.session.commit()
+    return jsonify({'message': 'Calendar feed revoked'}), 200
+
+@calendar_bp.route('/feed/<token>.ics', methods=['GET'])
+def calendar_feed_ics(token):
+    """The user's calendar as iCalendar, for subscription from phone and desktop calendar apps.
+
+    Authenticated by the token in the URL. The ETag is the user's events
+    version, so a poll with If-None-Match costs two indexed reads and no
+    rows. The body is streamed, gzipped on the fly when the client accepts
+    it.
+    """
+    user_id = feed_owner(token)
+    if user_id is None:
+        return jsonify({'error': 'Calendar feed not found'}), 404
+
+    user = load_user(user_id)
+    name = f'Advocate Diary - {user.full_name}' if user.full_name else 'Advocate Diary'
+    variant = hashlib.blake2b('|'.join((name, current_app.config['EVENT_TIMEZONE'],
+                                        str(current_app.config['CALENDAR_FEED_REFRESH']))).encode('utf-8'),
+                              digest_size=6).hexdigest()
+    etag = f'ics-{user_id}-{current_sync_seq(user_id)}-{variant}'
+    coding = 'gzip' if request.accept_encodings['gzip'] else None
+    if coding:
+        etag += ENCODING_ETAG_SUFFIXES[coding]
+
+    not_modified = False
+    modified = None
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains(etag)
+    else:
+        modified = last_modified(user_id)
+        since = request.if_modified_since
+        not_modified = bool(since and modified and
+                            modified.replace(microsecond=0, tzinfo=timezone.utc) <= since)
+
+    if not_modified:
+        response = Response(status=304)
+    else:
+        response = Response(stream_with_context(chunked(calendar_feed(user_id, name), compress=bool(coding))),
+                            mimetype='text/calendar')
+        response.headers['Content-Disposition'] = 'inline; filename="advocate-diary.ics"'
+        response.headers['X-Accel-Buffering'] = 'no'
+        if coding:
+            response.headers['Content-Encoding'] = coding
+        if modified is None:
+            modified = last_modified(user_id)
+        if modified:
+            response.last_modified = modified.replace(tzinfo=timezone.utc)
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
@@ -3,65 +3,96 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models.case import Case
 from app.models.client import Client
+from app.schemas.resources import CASE_LIST_FIELDS, CASE_SUMMARY_FIELDS, case_serializer
+from app.services.importer import CaseImporter, ImportFormatError, read_csv_rows, read_excel_rows
+from app.utils.etag import conditional
+from app.utils.pagination import CursorError, keyset_page, parse_bool, parse_limit
 from datetime import datetime
 
 cases_bp = Blueprint('cases', __name__)
 
+# Sort keys accepted by ?sort=; prefix with '-' for descending order
+CASE_SORT_COLUMNS = {
+    'created_at': Case.created_at,
+    'case_number': Case.case_number,
+    'title': Case.title,
+}
+
 @cases_bp.route('/', methods=['GET'])
 @jwt_required()
+@conditional('cases')
 def get_cases():
+    """List the user's cases one keyset page at a time.
+
+    The next page cursor is returned in the X-Next-Cursor header and the
+    total number of matching cases in X-Total-Count (skip with ?count=false).
+    """
     user_id = int(get_jwt_identity())
-    cases = Case.query.filter_by(user_id=user_id).all()
-
-    return jsonify([{
-        'id': case.id,
-        'case_number': case.case_number,
-        'title': case.title,
-        'case_type': case.case_type,
-        'court_name': case.court_name,
-        'status': case.status,
-        'filing_date': case.filing_date.isoformat() if case.filing_date else None,
-        'client_name': case.client_name,
-        'client_address': case.client_address,
-        'client_phone': case.client_phone,
-        'opposite_party': case.opposite_party,
-        'otherside_counsel': case.otherside_counsel,
-        'party_type': case.party_type,
-        'description': case.description,
-        'remarks': case.remarks,
-        'notes': case.notes,
-        'created_at': case.created_at.isoformat()
-    } for case in cases]), 200
+    args = request.args
+
+    default_fields = CASE_SUMMARY_FIELDS if args.get('view') == 'summary' else CASE_LIST_FIELDS
+    try:
+        fields = case_serializer.parse_fields(args.get('fields'), default_fields)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    sort = args.get('sort', '-created_at')
+    descending = sort.startswith('-')
+    sort_column = CASE_SORT_COLUMNS.get(sort.lstrip('-'))
+    if sort_column is None:
+        return jsonify({'error': f"Invalid sort key. Use one of: {', '.join(CASE_SORT_COLUMNS)}"}), 400
+
+    # Select only the requested columns; rows are serialized without ORM instances
+    query = db.session.query(*case_serializer.columns(fields, extra=('id', sort_column.key))).filter(
+        Case.user_id == user_id
+    )
+
+    if args.get('status'):
+        query = query.filter(Case.status == args['status'])
+    if args.get('case_type'):
+        query = query.filter(Case.case_type == args['case_type'])
+    if args.get('court_name'):
+        query = query.filter(Case.court_name == args['court_name'])
+    try:
+        if args.get('filed_from'):
+            query = query.filter(Case.filing_date >= datetime.strptime(args['filed_from'], '%Y-%m-%d').date())
+        if args.get('filed_to'):
+            query = query.filter(Case.filing_date <= datetime.strptime(args['filed_to'], '%Y-%m-%d').date())
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+    total = query.order_by(None).count() if parse_bool(args.get('count')) else None
+
+    try:
+        cases, next_cursor = keyset_page(
+            query, sort_column, Case.id,
+            cursor=args.get('cursor'),
+            limit=parse_limit(args.get('limit')),
+            descending=descending
+        )
+    except CursorError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    result = case_serializer.dump_many(cases, fields)
+
+    response = jsonify(result)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    if total is not None:
+        response.headers['X-Total-Count'] = str(total)
+    return response, 200
 
 @cases_bp.route('/<int:case_id>', methods=['GET'])
 @jwt_required()
+@conditional('cases')
 def get_case(case_id):
     user_id = int(get_jwt_identity())
-    case = Case.query.filter_by(id=case_id, user_id=user_id).first()
+    case = db.session.query(*case_serializer.columns()).filter(Case.id == case_id, Case.user_id == user_id).first()
 
     if not case:
         return jsonify({'error': 'Case not found'}), 404
 
-    return jsonify({
-        'id': case.id,
-        'case_number': case.case_number,
-        'title': case.title,
-        'case_type': case.case_type,
-        'court_name': case.court_name,
-        'filing_date': case.filing_date.isoformat() if case.filing_date else None,
-        'status': case.status,
-        'client_name': case.client_name,
-        'client_address': case.client_address,
-        'client_phone': case.client_phone,
-        'opposite_party': case.opposite_party,
-        'otherside_counsel': case.otherside_counsel,
-        'party_type': case.party_type,
-        'description': case.description,
-        'remarks': case.remarks,
-        'notes': case.notes,
-        'created_at': case.created_at.isoformat(),
-        'updated_at': case.updated_at.isoformat()
-    }), 200
+    return jsonify(case_serializer.dump(case)), 200
 
 @cases_bp.route('/', methods=['POST'])
 @jwt_required()
@@ -138,6 +169,30 @@ def create_case():
         db.session.rollback()
         return jsonify({'error': f'Failed to create case: {str(e)}'}), 500
 
+@cases_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_cases():
+    """Bulk-import cases and hearing history from an uploaded CSV or .xlsx file"""
+    user_id = int(get_jwt_identity())
+
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file provided'}), 400
+
+    file = request.files['file']
+    extension = file.filename.rsplit('.', 1)[-1].lower() if '.' in file.filename else ''
+    if extension not in ('csv', 'xlsx'):
+        return jsonify({'error': 'Upload a .csv or .xlsx file'}), 400
+
+    try:
+        rows = read_csv_rows(file.stream) if extension == 'csv' else read_excel_rows(file.stream)
+        report = CaseImporter(user_id).run(rows)
+    except (ImportFormatError, UnicodeDecodeError) as e:
+        db.session.rollback()
+        return jsonify({'error': f'Could not read file: {str(e)}'}), 400
+
+    status_code = 201 if report['cases_imported'] or report['hearings_imported'] else 400
+    return jsonify(dict(report, message=f"Imported {report['cases_imported']} cases")), status_code
+
 @cases_bp.route('/<int:case_id>', methods=['PUT'])
 @jwt_required()
 def update_case(case_id):
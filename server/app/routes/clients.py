@@ -2,42 +2,38 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models.client import Client
+from app.schemas.resources import CLIENT_LIST_FIELDS, client_serializer
+from app.utils.etag import conditional
 
 clients_bp = Blueprint('clients', __name__)
 
 @clients_bp.route('/', methods=['GET'])
 @jwt_required()
+@conditional('clients')
 def get_clients():
     user_id = int(get_jwt_identity())
-    clients = Client.query.filter_by(user_id=user_id).all()
+    try:
+        fields = client_serializer.parse_fields(request.args.get('fields'), CLIENT_LIST_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-    return jsonify([{
-        'id': client.id,
-        'name': client.name,
-        'email': client.email,
-        'phone': client.phone,
-        'created_at': client.created_at.isoformat()
-    } for client in clients]), 200
+    clients = db.session.query(*client_serializer.columns(fields)).filter(Client.user_id == user_id).all()
+
+    return jsonify(client_serializer.dump_many(clients, fields)), 200
 
 @clients_bp.route('/<int:client_id>', methods=['GET'])
 @jwt_required()
+@conditional('clients')
 def get_client(client_id):
     user_id = int(get_jwt_identity())
-    client = Client.query.filter_by(id=client_id, user_id=user_id).first()
+    client = db.session.query(*client_serializer.columns()).filter(
+        Client.id == client_id, Client.user_id == user_id
+    ).first()
 
     if not client:
         return jsonify({'error': 'Client not found'}), 404
 
-    return jsonify({
-        'id': client.id,
-        'name': client.name,
-        'email': client.email,
-        'phone': client.phone,
-        'address': client.address,
-        'notes': client.notes,
-        'created_at': client.created_at.isoformat(),
-        'updated_at': client.updated_at.isoformat()
-    }), 200
+    return jsonify(client_serializer.dump(client)), 200
 
 @clients_bp.route('/', methods=['POST'])
 @jwt_required()
@@ -0,0 +1,114 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models.case import Case
+from app.models.calendar_event import CalendarEvent
+from app.models.hearing_update import HearingUpdate
+from app.services.cause_list import cause_list_today
+from app.services.counters import get_counters
+from app.services.recurrence import expand_occurrences
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+RECENT_ACTIVITY_LIMIT = 5
+
+@dashboard_bp.route('/summary', methods=['GET'])
+@jwt_required()
+def get_summary():
+    """Dashboard numbers from the user_counters aggregates plus small indexed range counts"""
+    user_id = int(get_jwt_identity())
+    counters = get_counters(user_id)
+
+    # event_date is wall-clock time in EVENT_TIMEZONE, so "today" is too
+    today = datetime.combine(cause_list_today(), datetime.min.time())
+    tomorrow = today + timedelta(days=1)
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=7)
+
+    def hearings_between(start, end):
+        return db.session.query(db.func.count(CalendarEvent.id)).filter(
+            CalendarEvent.user_id == user_id,
+            CalendarEvent.recurrence.is_(None),
+            CalendarEvent.event_date >= start,
+            CalendarEvent.event_date < end,
+            CalendarEvent.event_type == 'Hearing'
+        ).scalar()
+
+    # Recurring hearings count once per occurrence, expanded as GET /api/calendar does
+    recurring_today = recurring_this_week = 0
+    series = db.session.query(
+        CalendarEvent.event_date, CalendarEvent.recurrence, CalendarEvent.recurrence_interval,
+        CalendarEvent.recurrence_until
+    ).filter(
+        CalendarEvent.user_id == user_id,
+        CalendarEvent.recurrence.isnot(None),
+        CalendarEvent.event_type == 'Hearing',
+        CalendarEvent.event_date < week_end,
+        db.or_(CalendarEvent.recurrence_until.is_(None), CalendarEvent.recurrence_until >= week_start)
+    )
+    for event in series:
+        for occurrence in expand_occurrences(event.event_date, event.recurrence, event.recurrence_interval,
+                                             event.recurrence_until, week_start, week_end):
+            recurring_this_week += 1
+            recurring_today += today <= occurrence < tomorrow
+
+    # Open one-off events in the past, via (user_id, is_completed, event_date).
+    # A recurring series has occurrences still to come, so its start date
+    # being past does not make it overdue
+    overdue_actions = db.session.query(db.func.count(CalendarEvent.id)).filter(
+        CalendarEvent.user_id == user_id,
+        db.or_(CalendarEvent.is_completed.is_(False), CalendarEvent.is_completed.is_(None)),
+        CalendarEvent.recurrence.is_(None),
+        CalendarEvent.event_date < today
+    ).scalar()
+
+    recent_cases = db.session.query(Case.id, Case.case_number, Case.title, Case.status, Case.created_at).filter(
+        Case.user_id == user_id
+    ).order_by(Case.created_at.desc()).limit(RECENT_ACTIVITY_LIMIT).all()
+
+    recent_hearings = db.session.query(
+        HearingUpdate.id, HearingUpdate.case_id, HearingUpdate.hearing_date,
+        HearingUpdate.next_hearing_date, Case.case_number, Case.title
+    ).join(Case, HearingUpdate.case_id == Case.id).filter(
+        HearingUpdate.user_id == user_id
+    ).order_by(HearingUpdate.hearing_date.desc()).limit(RECENT_ACTIVITY_LIMIT).all()
+
+    return jsonify({
+        'cases': {
+            'total': counters.get('cases', 0),
+            'by_status': {
+                name.split(':', 1)[1]: value
+                for name, value in counters.items() if name.startswith('cases:') and value
+            }
+        },
+        'hearing_updates': counters.get('hearing_updates', 0),
+        'events': {
+            'total': counters.get('events', 0),
+            'open': counters.get('events:open', 0)
+        },
+        'documents': {
+            'total': counters.get('documents', 0),
+            'storage_bytes': counters.get('storage_bytes', 0)
+        },
+        'hearings_today': hearings_between(today, tomorrow) + recurring_today,
+        'hearings_this_week': hearings_between(week_start, week_end) + recurring_this_week,
+        'overdue_actions': overdue_actions,
+        'recent_activity': {
+            'cases': [{
+                'id': case.id,
+                'case_number': case.case_number,
+                'title': case.title,
+                'status': case.status,
+                'created_at': case.created_at.isoformat() if case.created_at else None
+            } for case in recent_cases],
+            'hearings': [{
+                'id': hearing.id,
+                'case_id': hearing.case_id,
+                'case_number': hearing.case_number,
+                'case_title': hearing.title,
+                'hearing_date': hearing.hearing_date.isoformat(),
+                'next_hearing_date': hearing.next_hearing_date.isoformat() if hearing.next_hearing_date else None
+            } for hearing in recent_hearings]
+        }
+    }), 200
@@ -1,19 +1,26 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
 import os
 from app.extensions import db
 from app.models.document import Document
 from app.models.case import Case
+from app.models.upload_session import UploadSession
+from app.schemas.resources import document_serializer
+from app.services.blobs import BlobTooLarge, ingest_stream
+from app.services.counters import get_counters
+from app.services.downloads import (make_download_token, presigned_document_url, read_download_token, send_document,
+                                    send_thumbnail)
+from app.services.uploads import (UploadError, allowed_file, append_chunk, complete_upload, create_document,
+                                  discard_upload, start_upload, storage_usage)
+from app.services.user_cache import load_user
+from app.utils.etag import conditional
 
 documents_bp = Blueprint('documents', __name__)
 
-def allowed_file(filename):
-    ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png', 'txt'}
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
 @documents_bp.route('/case/<int:case_id>', methods=['GET'])
 @jwt_required()
+@conditional('documents')
 def get_case_documents(case_id):
     user_id = int(get_jwt_identity())
     case = Case.query.filter_by(id=case_id, user_id=user_id).first()
@@ -21,22 +28,19 @@ def get_case_documents(case_id):
     if not case:
         return jsonify({'error': 'Case not found'}), 404
 
-    documents = Document.query.filter_by(case_id=case_id).all()
+    try:
+        fields = document_serializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    documents = db.session.query(*document_serializer.columns(fields)).filter(Document.case_id == case_id).all()
 
-    return jsonify([{
-        'id': doc.id,
-        'title': doc.title,
-        'file_name': doc.file_name,
-        'file_url': doc.file_url,
-        'file_type': doc.file_type,
-        'file_size': doc.file_size,
-        'description': doc.description,
-        'uploaded_at': doc.uploaded_at.isoformat()
-    } for doc in documents]), 200
+    return jsonify(document_serializer.dump_many(documents, fields)), 200
 
 @documents_bp.route('/upload', methods=['POST'])
 @jwt_required()
 def upload_document():
+    """Single-request multipart upload, for small files"""
     user_id = int(get_jwt_identity())
 
     if 'file' not in request.files:
@@ -58,42 +62,214 @@ def upload_document():
     if file.filename == '':
         return jsonify({'error': 'No file selected'}), 400
 
-    if not allowed_file(file.filename):
+    filename = secure_filename(file.filename)
+    if not allowed_file(filename):
         return jsonify({'error': 'File type not allowed'}), 400
 
-    filename = secure_filename(file.filename)
-    upload_folder = 'uploads'
-    os.makedirs(upload_folder, exist_ok=True)
-
-    file_path = os.path.join(upload_folder, filename)
-    file.save(file_path)
-
-    # In production, upload to Cloudinary or S3
-    file_url = f'/uploads/{filename}'  # Temporary local path
-
-    new_document = Document(
-        case_id=case_id,
-        title=title,
-        file_name=filename,
-        file_url=file_url,
-        file_type=filename.rsplit('.', 1)[1].lower(),
-        file_size=os.path.getsize(file_path),
-        description=description
-    )
-
-    db.session.add(new_document)
-    db.session.commit()
+    # Hash while copying to a private temp file; the blob is stored under its hash
+    try:
+        temp_path, sha256, size = ingest_stream(file.stream, current_app.config['DOCUMENT_MAX_SIZE'])
+    except BlobTooLarge as e:
+        return jsonify({'error': str(e)}), 413
+
+    try:
+        new_document = create_document(user_id, case.id, title, description, filename, temp_path, sha256, size)
+        db.session.commit()
+    except UploadError as e:
+        db.session.rollback()
+        os.remove(temp_path)
+        return jsonify(dict({'error': str(e)}, **e.extra)), e.status
+    except Exception as e:
+        db.session.rollback()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return jsonify({'error': f'Failed to save document: {str(e)}'}), 500
 
     return jsonify({
         'message': 'Document uploaded successfully',
-        'document': {
-            'id': new_document.id,
-            'title': new_document.title,
-            'file_name': new_document.file_name,
-            'file_url': new_document.file_url
-        }
+        'document': document_serializer.dump(new_document)
     }), 201
 
+@documents_bp.route('/uploads', methods=['POST'])
+@jwt_required()
+def start_chunked_upload():
+    """Open a resumable upload; chunks are then PUT to /uploads/<upload_id>"""
+    user_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+
+    if not data.get('case_id') or not data.get('title') or not data.get('file_name'):
+        return jsonify({'error': 'case_id, title and file_name are required'}), 400
+
+    case = Case.query.filter_by(id=data['case_id'], user_id=user_id).first()
+    if not case:
+        return jsonify({'error': 'Case not found'}), 404
+
+    try:
+        upload = start_upload(user_id, case.id, data['title'], data.get('description'),
+                              data['file_name'], data.get('file_size'))
+        db.session.commit()
+    except UploadError as e:
+        db.session.rollback()
+        return jsonify(dict({'error': str(e)}, **e.extra)), e.status
+
+    return jsonify(dict(upload.to_dict(), chunk_size=current_app.config['UPLOAD_CHUNK_SIZE'])), 201
+
+def get_upload_session(upload_id, user_id, lock=False):
+    query = UploadSession.query.filter_by(id=upload_id, user_id=user_id)
+    if lock:
+        # Serialize chunks of the same upload across threads and workers
+        query = query.with_for_update()
+    return query.first()
+
+@documents_bp.route('/uploads/<upload_id>', methods=['GET'])
+@jwt_required()
+def get_chunked_upload(upload_id):
+    """Where to resume: the offset the next chunk must start at"""
+    upload = get_upload_session(upload_id, int(get_jwt_identity()))
+    if not upload:
+        return jsonify({'error': 'Upload not found'}), 404
+    return jsonify(upload.to_dict()), 200
+
+@documents_bp.route('/uploads/<upload_id>', methods=['PUT'])
+@jwt_required()
+def put_upload_chunk(upload_id):
+    """Append the raw request body at the Upload-Offset header"""
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+    except ValueError:
+        return jsonify({'error': 'Upload-Offset header is required'}), 400
+
+    upload = get_upload_session(upload_id, int(get_jwt_identity()), lock=True)
+    if not upload:
+        return jsonify({'error': 'Upload not found'}), 404
+
+    try:
+        append_chunk(upload, offset, request.stream)
+        db.session.commit()
+    except UploadError as e:
+        db.session.rollback()
+        return jsonify(dict({'error': str(e)}, **e.extra)), e.status
+
+    return jsonify(upload.to_dict()), 200
+
+@documents_bp.route('/uploads/<upload_id>/complete', methods=['POST'])
+@jwt_required()
+def complete_chunked_upload(upload_id):
+    """Verify the checksum (if given) and create the document"""
+    upload = get_upload_session(upload_id, int(get_jwt_identity()), lock=True)
+    if not upload:
+        return jsonify({'error': 'Upload not found'}), 404
+
+    data = request.get_json(silent=True) or {}
+    try:
+        document = complete_upload(upload, data.get('sha256'))
+        db.session.commit()
+    except UploadError as e:
+        # A checksum mismatch discards the upload; keep that
+        db.session.commit()
+        return jsonify(dict({'error': str(e)}, **e.extra)), e.status
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to save document: {str(e)}'}), 500
+
+    return jsonify({
+        'message': 'Document uploaded successfully',
+        'document': document_serializer.dump(document)
+    }), 201
+
+@documents_bp.route('/uploads/<upload_id>', methods=['DELETE'])
+@jwt_required()
+def abort_chunked_upload(upload_id):
+    upload = get_upload_session(upload_id, int(get_jwt_identity()), lock=True)
+    if not upload:
+        return jsonify({'error': 'Upload not found'}), 404
+    discard_upload(upload)
+    db.session.commit()
+    return jsonify({'message': 'Upload discarded'}), 200
+
+@documents_bp.route('/usage', methods=['GET'])
+@jwt_required()
+def get_storage_usage():
+    """Bytes used by the user's documents, from the storage_bytes counter"""
+    user_id = int(get_jwt_identity())
+    used, quota = storage_usage(user_id)
+    return jsonify({
+        'used_bytes': used,
+        'quota_bytes': quota,
+        'remaining_bytes': None if quota is None else max(quota - used, 0),
+        'documents': get_counters(user_id).get('documents', 0)
+    }), 200
+
+def get_owned_document(document_id, user_id):
+    return Document.query.filter_by(id=document_id, user_id=user_id).first()
+
+def get_reader_id(document_id):
+    """User id from the bearer token or, for plain links, from ?token=; None if neither is valid"""
+    identity = get_jwt_identity()
+    if identity is not None:
+        return int(identity)
+    user_id = read_download_token(request.args.get('token', ''), document_id)
+    user = load_user(user_id) if user_id is not None else None
+    if user is None or user.is_active is False:
+        return None
+    return user_id
+
+@documents_bp.route('/<int:document_id>/download', methods=['GET'])
+@jwt_required(optional=True)
+def download_document(document_id):
+    """Serve a document after checking case ownership; supports Range requests.
+
+    Authenticate with the usual bearer token, or with ?token= from
+    POST /<id>/link for plain links that cannot send headers.
+    """
+    user_id = get_reader_id(document_id)
+    if user_id is None:
+        return jsonify({'error': 'Missing or expired download token'}), 401
+
+    document = get_owned_document(document_id, user_id)
+    if not document:
+        return jsonify({'error': 'Document not found'}), 404
+
+    response = send_document(document, as_attachment=request.args.get('inline') not in ('1', 'true'))
+    if response is None:
+        return jsonify({'error': 'File is missing from storage'}), 410
+    return response
+
+@documents_bp.route('/<int:document_id>/thumbnail', methods=['GET'])
+@jwt_required(optional=True)
+def get_document_thumbnail(document_id):
+    """JPEG preview rendered by the background job; same authentication as /download"""
+    user_id = get_reader_id(document_id)
+    if user_id is None:
+        return jsonify({'error': 'Missing or expired download token'}), 401
+
+    document = get_owned_document(document_id, user_id)
+    if not document:
+        return jsonify({'error': 'Document not found'}), 404
+    if not document.has_thumbnail:
+        return jsonify({'error': 'No thumbnail', 'processing_status': document.processing_status}), 404
+
+    response = send_thumbnail(document)
+    if response is None:
+        return jsonify({'error': 'Thumbnail is missing from storage'}), 410
+    return response
+
+@documents_bp.route('/<int:document_id>/link', methods=['POST'])
+@jwt_required()
+def create_download_link(document_id):
+    """Short-lived download URL for <a href>, <iframe> or a PDF viewer"""
+    user_id = int(get_jwt_identity())
+    document = get_owned_document(document_id, user_id)
+    if not document:
+        return jsonify({'error': 'Document not found'}), 404
+
+    # Remote storage: a presigned URL straight to the file; otherwise a tokenized API URL
+    url = presigned_document_url(document, as_attachment=request.args.get('inline') not in ('1', 'true'))
+    if not url:
+        token = make_download_token(document.id, user_id)
+        url = f'{request.script_root}/api/documents/{document.id}/download?token={token}'
+    return jsonify({'url': url, 'expires_in': current_app.config['DOWNLOAD_TOKEN_TTL']}), 200
+
 @documents_bp.route('/<int:document_id>', methods=['DELETE'])
 @jwt_required()
 def delete_document(document_id):
@@ -108,9 +284,7 @@ def delete_document(document_id):
     if not case:
         return jsonify({'error': 'Unauthorized'}), 403
 
-    # Delete file from storage
-    # In production, delete from Cloudinary or S3
-
+    # The blob's reference count drops with the row; the file goes when unreferenced
     db.session.delete(document)
     db.session.commit()
 
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.extensions import db
+from app.models.case import Case
+from app.models.calendar_event import CalendarEvent
+from app.models.hearing_update import HearingUpdate
+from app.utils.streaming import chunked
+
+export_bp = Blueprint('export', __name__)
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+
+def _columns(model):
+    return [column for column in model.__table__.columns]
+
+
+def _export_queries(user_id):
+    """Column-tuple queries per record type, so no ORM instances are built"""
+    hearing_columns = _columns(HearingUpdate)
+    return {
+        'cases': (
+            [column.key for column in _columns(Case)],
+            db.session.query(*_columns(Case)).filter(Case.user_id == user_id).order_by(Case.id)
+        ),
+        'hearings': (
+            [column.key for column in hearing_columns] + ['case_number'],
+            db.session.query(*hearing_columns, Case.case_number).join(
+                Case, HearingUpdate.case_id == Case.id
+            ).filter(HearingUpdate.user_id == user_id).order_by(HearingUpdate.id)
+        ),
+        'events': (
+            [column.key for column in _columns(CalendarEvent)],
+            db.session.query(*_columns(CalendarEvent)).filter(
+                CalendarEvent.user_id == user_id
+            ).order_by(CalendarEvent.id)
+        ),
+    }
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _stream_rows(query):
+    # stream_results makes PyMySQL use an unbuffered server-side cursor
+    return query.execution_options(stream_results=True).yield_per(EXPORT_BATCH_SIZE)
+
+
+def _ndjson_lines(queries):
+    for record_type, (names, query) in queries.items():
+        singular = record_type.rstrip('s')
+        for row in _stream_rows(query):
+            record = {'type': singular}
+            record.update(zip(names, map(_plain, row)))
+            yield json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def _csv_lines(names, query):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for row in _stream_rows(query):
+        writer.writerow([_plain(value) for value in row])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+@export_bp.route('/', methods=['GET'])
+@jwt_required()
+def export_diary():
+    """Stream the user's cases, hearing history and calendar as NDJSON or CSV.
+
+    NDJSON exports every record type, one tagged object per line. CSV holds
+    a single record type chosen with ?type=cases|hearings|events.
+    ?gzip=1 compresses the stream as it is produced.
+    """
+    user_id = int(get_jwt_identity())
+    export_format = request.args.get('format', 'ndjson')
+    compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+    queries = _export_queries(user_id)
+
+    if export_format == 'ndjson':
+        requested = request.args.get('type')
+        if requested:
+            if requested not in queries:
+                return jsonify({'error': f"Invalid type. Use one of: {', '.join(queries)}"}), 400
+            queries = {requested: queries[requested]}
+        lines = _ndjson_lines(queries)
+        mimetype, filename = 'application/x-ndjson', 'advocate-diary.ndjson'
+    elif export_format == 'csv':
+        requested = request.args.get('type')
+        if requested not in queries:
+            return jsonify({'error': f"CSV export needs type: one of {', '.join(queries)}"}), 400
+        lines = _csv_lines(*queries[requested])
+        mimetype, filename = 'text/csv', f'advocate-diary-{requested}.csv'
+    else:
+        return jsonify({'error': 'Invalid format. Use ndjson or csv'}), 400
+
+    if compress:
+        mimetype, filename = 'application/gzip', filename + '.gz'
+
+    response = Response(stream_with_context(chunked(lines, compress)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
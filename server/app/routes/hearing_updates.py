@@ -1,34 +1,82 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, g, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models.hearing_update import HearingUpdate
 from app.models.case import Case
 from app.models.calendar_event import CalendarEvent
-from datetime import datetime
+from app.schemas.resources import hearing_update_serializer
+from app.services.cause_list import (MAX_CAUSE_LIST_DAYS, cause_list_csv, cause_list_pdf, cause_list_today,
+                                     group_by_court, load_cause_list)
+from app.services.calendar_sync import record_changes
+from app.services.conflicts import conflicts_for_events, event_conflicts
+from app.services.counters import apply_counter_deltas, version_counter
+from app.services.hearing_events import build_hearing_event, hearing_event_row
+from app.services.search import index_documents
+from app.services.timeline import TIMELINE_PAGE_SIZE, case_timeline
+from app.services.user_cache import load_user
+from app.utils.bulk import bulk_insert
+from app.utils.etag import conditional
+from app.utils.pagination import CursorError, parse_limit
+from datetime import datetime, timedelta
 
 hearing_updates_bp = Blueprint('hearing_updates', __name__)
 
+MAX_BATCH_SIZE = 200
+
+
+def parse_hearing_item(data):
+    """Validate one hearing update payload; returns (fields, error)"""
+    if not isinstance(data, dict):
+        return None, 'Each update must be an object'
+    if not data or not data.get('case_id') or not data.get('hearing_date'):
+        return None, 'case_id and hearing_date are required'
+    try:
+        case_id = int(data['case_id'])
+    except (TypeError, ValueError):
+        return None, 'case_id must be an integer'
+    try:
+        hearing_date = datetime.strptime(data['hearing_date'], '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None, 'Invalid hearing_date format. Use YYYY-MM-DD'
+    next_hearing_date = None
+    if data.get('next_hearing_date'):
+        try:
+            next_hearing_date = datetime.strptime(data['next_hearing_date'], '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            return None, 'Invalid next_hearing_date format. Use YYYY-MM-DD'
+    return {
+        'case_id': case_id,
+        'hearing_date': hearing_date,
+        'action_taken': data.get('action_taken'),
+        'court_order': data.get('court_order'),
+        'next_hearing_date': next_hearing_date,
+        'action_to_be_taken': data.get('action_to_be_taken')
+    }, None
+
 @hearing_updates_bp.route('/all', methods=['GET'])
 @jwt_required()
+@conditional('hearing_updates', 'cases')
 def get_all_hearing_updates():
     """Get all hearing updates across all cases for the authenticated user"""
     user_id = int(get_jwt_identity())
 
-    # Query with join to get case details
-    hearing_updates = db.session.query(HearingUpdate, Case).join(
+    # Column-tuple query with join to get case details
+    hearing_updates = db.session.query(
+        *hearing_update_serializer.columns(),
+        Case.case_number, Case.title.label('case_title'), Case.client_name, Case.court_name
+    ).join(
         Case, HearingUpdate.case_id == Case.id
     ).filter(
         HearingUpdate.user_id == user_id
     ).order_by(HearingUpdate.hearing_date.desc()).all()
 
-    # Transform to include case details
     result = []
-    for hearing, case in hearing_updates:
-        hearing_dict = hearing.to_dict()
-        hearing_dict['case_number'] = case.case_number
-        hearing_dict['case_title'] = case.title
-        hearing_dict['client_name'] = case.client_name
-        hearing_dict['court_name'] = case.court_name
+    for row in hearing_updates:
+        hearing_dict = hearing_update_serializer.dump(row)
+        hearing_dict['case_number'] = row.case_number
+        hearing_dict['case_title'] = row.case_title
+        hearing_dict['client_name'] = row.client_name
+        hearing_dict['court_name'] = row.court_name
         result.append(hearing_dict)
 
     return jsonify(result), 200
@@ -36,6 +84,7 @@ def get_all_hearing_updates():
 
 @hearing_updates_bp.route('/', methods=['GET'])
 @jwt_required()
+@conditional('hearing_updates')
 def get_hearing_updates():
     """Get all hearing updates for a specific case"""
     user_id = int(get_jwt_identity())
@@ -49,17 +98,125 @@ def get_hearing_updates():
     if not case:
         return jsonify({'error': 'Case not found or access denied'}), 404
 
+    try:
+        fields = hearing_update_serializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     # Get all hearing updates for this case, ordered by hearing_date DESC
-    hearing_updates = HearingUpdate.query.filter_by(
-        case_id=case_id,
-        user_id=user_id
+    hearing_updates = db.session.query(*hearing_update_serializer.columns(fields)).filter(
+        HearingUpdate.case_id == case_id,
+        HearingUpdate.user_id == user_id
     ).order_by(HearingUpdate.hearing_date.desc()).all()
 
-    return jsonify([update.to_dict() for update in hearing_updates]), 200
+    return jsonify(hearing_update_serializer.dump_many(hearing_updates, fields)), 200
+
+
+@hearing_updates_bp.route('/timeline', methods=['GET'])
+@jwt_required()
+@conditional('hearing_updates')
+def get_hearing_timeline():
+    """A case's hearing history one keyset page at a time, newest first.
+
+    The first page also returns the case summary; the next page cursor is
+    in the X-Next-Cursor header.
+    """
+    user_id = int(get_jwt_identity())
+    case_id = request.args.get('case_id', type=int)
+    if not case_id:
+        return jsonify({'error': 'case_id parameter is required'}), 400
+
+    try:
+        fields = hearing_update_serializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    cursor = request.args.get('cursor')
+    try:
+        rows, next_cursor, summary = case_timeline(case_id, user_id, fields, cursor,
+                                                   parse_limit(request.args.get('limit'), TIMELINE_PAGE_SIZE))
+    except CursorError:
+        return jsonify({'error': 'Invalid cursor'}), 400
+
+    # Only an empty first page needs to tell "no hearings" from "no such case"
+    if not rows and not cursor and not Case.query.filter_by(id=case_id, user_id=user_id).count():
+        return jsonify({'error': 'Case not found or access denied'}), 404
+
+    body = {'hearing_updates': hearing_update_serializer.dump_many(rows, fields)}
+    if summary is not None:
+        body['summary'] = summary
+    response = jsonify(body)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response, 200
+
+
+def _default_cause_list_day():
+    """The day a cause-list request without dates is for, fixed once so the ETag and the list agree"""
+    if request.args.get('date') or request.args.get('from') or request.args.get('to'):
+        return ''
+    g.cause_list_day = cause_list_today()
+    return g.cause_list_day.isoformat()
+
+
+@hearing_updates_bp.route('/cause-list', methods=['GET'])
+@jwt_required()
+@conditional('hearing_updates', 'cases', variant=_default_cause_list_day)
+def get_cause_list():
+    """Matters listed for a day (?date=, default today) or ?from=&to= (inclusive), grouped by court.
+
+    "Today" is the date in EVENT_TIMEZONE, and is part of the ETag.
+    ?format=csv or ?format=pdf gives a printable list. Each day is served
+    from a snapshot that is rebuilt whenever a hearing or case changes.
+    """
+    user_id = int(get_jwt_identity())
+    try:
+        if request.args.get('from') or request.args.get('to'):
+            start = datetime.strptime(request.args.get('from', ''), '%Y-%m-%d').date()
+            end = datetime.strptime(request.args.get('to', ''), '%Y-%m-%d').date()
+        elif request.args.get('date'):
+            start = end = datetime.strptime(request.args['date'], '%Y-%m-%d').date()
+        else:
+            start = end = g.cause_list_day
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD for date, or for both from and to'}), 400
+    if end < start:
+        return jsonify({'error': 'to must not be before from'}), 400
+    if end - start >= timedelta(days=MAX_CAUSE_LIST_DAYS):
+        return jsonify({'error': f'A cause list covers at most {MAX_CAUSE_LIST_DAYS} days'}), 400
+
+    export_format = request.args.get('format', 'json')
+    if export_format not in ('json', 'csv', 'pdf'):
+        return jsonify({'error': 'Invalid format. Use json, csv or pdf'}), 400
+
+    days = load_cause_list(user_id, start, end)
+    filename = f"cause-list-{start.isoformat()}{'' if start == end else '-to-' + end.isoformat()}"
+
+    if export_format == 'csv':
+        response = Response(cause_list_csv(days), mimetype='text/csv')
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+        return response
+    if export_format == 'pdf':
+        user = load_user(user_id)
+        response = Response(cause_list_pdf(days, user.full_name if user else None), mimetype='application/pdf')
+        response.headers['Content-Disposition'] = f'inline; filename="{filename}.pdf"'
+        return response
+
+    return jsonify({
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'total': sum(len(entries) for entries in days.values()),
+        'days': [{
+            'date': day.isoformat(),
+            'total': len(entries),
+            'courts': group_by_court(entries)
+        } for day, entries in days.items()]
+    }), 200
 
 
 @hearing_updates_bp.route('/<int:id>', methods=['GET'])
 @jwt_required()
+@conditional('hearing_updates')
 def get_hearing_update(id):
     """Get a single hearing update"""
     user_id = int(get_jwt_identity())
@@ -116,30 +273,127 @@ def create_hearing_update():
     db.session.flush()  # Get the hearing_update.id
 
     # Auto-create calendar event if next_hearing_date is provided
+    conflicts = []
     if next_hearing_date:
-        calendar_event = CalendarEvent(
-            user_id=user_id,
-            case_id=data['case_id'],
-            title=f"Hearing: {case.title}",
-            description=f"Next hearing for case {case.case_number}\n\nAction to be taken: {data.get('action_to_be_taken', 'N/A')}",
-            event_type='Hearing',
-            event_date=datetime.combine(next_hearing_date, datetime.min.time()),
-            location=case.court_name
-        )
+        calendar_event = build_hearing_event(case, user_id, next_hearing_date, data.get('action_to_be_taken', 'N/A'))
         db.session.add(calendar_event)
         db.session.flush()  # Get the calendar_event.id
 
         # Link the calendar event to the hearing update
         hearing_update.calendar_event_id = calendar_event.id
+        # Other engagements (say, a hearing in another court) on that day
+        conflicts = event_conflicts(calendar_event)
 
     db.session.commit()
 
     return jsonify({
         'message': 'Hearing update created successfully',
-        'hearing_update': hearing_update.to_dict()
+        'hearing_update': hearing_update.to_dict(),
+        'conflicts': conflicts
     }), 201
 
 
+@hearing_updates_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def create_hearing_updates_batch():
+    """Create many hearing updates (and their calendar events) in one transaction.
+
+    With "atomic": true (the default) any invalid item rejects the whole
+    batch; with "atomic": false valid items are saved and invalid ones are
+    reported. Either way results are returned per item, in request order.
+    """
+    user_id = int(get_jwt_identity())
+    data = request.get_json()
+
+    if not isinstance(data, dict) or not isinstance(data.get('updates'), list) or not data['updates']:
+        return jsonify({'error': 'updates must be a non-empty list'}), 400
+    if len(data['updates']) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_BATCH_SIZE} updates per batch'}), 400
+    atomic = data.get('atomic', True)
+    if not isinstance(atomic, bool):
+        return jsonify({'error': 'atomic must be true or false'}), 400
+
+    parsed = [parse_hearing_item(item) for item in data['updates']]
+
+    # Verify ownership of every referenced case with a single query
+    case_ids = {fields['case_id'] for fields, error in parsed if not error}
+    cases = {case.id: case for case in Case.query.filter(
+        Case.id.in_(case_ids), Case.user_id == user_id
+    ).all()} if case_ids else {}
+
+    results = []
+    for fields, error in parsed:
+        if not error and fields['case_id'] not in cases:
+            error = 'Case not found or access denied'
+        results.append({'error': error} if error else {'fields': fields})
+
+    failed = sum(1 for result in results if 'error' in result)
+    if failed and atomic:
+        return jsonify({
+            'error': f'{failed} of {len(results)} updates are invalid; nothing was saved',
+            'results': [{'index': index, 'status': 'error', 'error': result['error']}
+                        for index, result in enumerate(results) if 'error' in result]
+        }), 400
+
+    now = datetime.utcnow()
+    valid = [result for result in results if 'error' not in result]
+
+    try:
+        # Bulk-insert the auto-created calendar events first so their ids can be linked
+        with_event = [result for result in valid if result['fields']['next_hearing_date']]
+        event_rows = [hearing_event_row(cases[result['fields']['case_id']], user_id,
+                                        result['fields']['next_hearing_date'],
+                                        result['fields']['action_to_be_taken'], now)
+                      for result in with_event]
+        for result, event_id in zip(with_event, bulk_insert(CalendarEvent, event_rows)):
+            result['calendar_event_id'] = event_id
+
+        hearing_rows = [dict(result['fields'], user_id=user_id, calendar_event_id=result.get('calendar_event_id'),
+                             created_at=now, updated_at=now) for result in valid]
+        created = []
+        for result, row, hearing_id in zip(valid, hearing_rows, bulk_insert(HearingUpdate, hearing_rows)):
+            result['hearing_update'] = HearingUpdate(id=hearing_id, **row)
+            created.append(result['hearing_update'])
+
+        # Bulk INSERTs bypass the ORM listeners, so update counters and search here
+        apply_counter_deltas(db.session.connection(), {
+            (user_id, 'hearing_updates'): len(created),
+            (user_id, 'events'): len(event_rows),
+            (user_id, 'events:open'): len(event_rows),
+            (user_id, version_counter('hearing_updates')): 1 if created else 0,
+            (user_id, version_counter('events')): 1 if event_rows else 0
+        })
+        record_changes(db.session.connection(), [(user_id, result['calendar_event_id']) for result in with_event])
+        index_documents('hearing', created)
+
+        conflicts = {}
+        if with_event:
+            dates = [row['event_date'] for row in event_rows]
+            conflicts = conflicts_for_events(user_id, [result['calendar_event_id'] for result in with_event],
+                                             min(dates), max(dates) + timedelta(days=1))
+
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': f'Failed to save hearing updates: {str(e)}'}), 500
+
+    response = []
+    for index, result in enumerate(results):
+        if 'error' in result:
+            response.append({'index': index, 'status': 'error', 'error': result['error']})
+        else:
+            response.append({'index': index, 'status': 'created',
+                             'hearing_update': result['hearing_update'].to_dict(),
+                             'conflicts': conflicts.get(result.get('calendar_event_id'), [])})
+
+    return jsonify({
+        'message': f'{len(created)} hearing updates created',
+        'created': len(created),
+        'failed': failed,
+        'results': response
+    }), 201 if created else 400
+
+
 @hearing_updates_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()
 def update_hearing_update(id):
@@ -170,6 +424,7 @@ def update_hearing_update(id):
         hearing_update.action_to_be_taken = data['action_to_be_taken']
 
     # Handle next_hearing_date changes
+    calendar_event = None
     if 'next_hearing_date' in data:
         if data['next_hearing_date']:
             # Parse new next_hearing_date
@@ -210,13 +465,19 @@ def update_hearing_update(id):
                 calendar_event = CalendarEvent.query.get(hearing_update.calendar_event_id)
                 if calendar_event:
                     db.session.delete(calendar_event)
+                    calendar_event = None
                 hearing_update.calendar_event_id = None
 
+    conflicts = []
+    if calendar_event is not None:
+        db.session.flush()
+        conflicts = event_conflicts(calendar_event)
     db.session.commit()
 
     return jsonify({
         'message': 'Hearing update updated successfully',
-        'hearing_update': hearing_update.to_dict()
+        'hearing_update': hearing_update.to_dict(),
+        'conflicts': conflicts
     }), 200
 
 
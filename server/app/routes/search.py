@@ -0,0 +1,40 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.search import SEARCH_DOCUMENTS, search
+from app.utils.pagination import parse_limit
+
+search_bp = Blueprint('search', __name__)
+
+MAX_SEARCH_PAGE_SIZE = 50
+
+@search_bp.route('/', methods=['GET'])
+@jwt_required()
+def search_diary():
+    """Ranked, highlighted search across cases, clients and hearing updates"""
+    user_id = int(get_jwt_identity())
+    query = (request.args.get('q') or '').strip()
+
+    if not query:
+        return jsonify({'error': 'q parameter is required'}), 400
+
+    doc_types = None
+    if request.args.get('types'):
+        doc_types = [doc_type.strip() for doc_type in request.args['types'].split(',')]
+        unknown = [doc_type for doc_type in doc_types if doc_type not in SEARCH_DOCUMENTS]
+        if unknown:
+            return jsonify({'error': f"Invalid types. Use any of: {', '.join(SEARCH_DOCUMENTS)}"}), 400
+
+    per_page = parse_limit(request.args.get('per_page'), default=20, maximum=MAX_SEARCH_PAGE_SIZE)
+    try:
+        page = max(1, int(request.args.get('page', 1)))
+    except ValueError:
+        return jsonify({'error': 'page must be a positive integer'}), 400
+
+    results, total = search(user_id, query, doc_types, offset=(page - 1) * per_page, limit=per_page)
+
+    return jsonify({
+        'results': results,
+        'total': total,
+        'page': page,
+        'per_page': per_page
+    }), 200
@@ -1 +1,4 @@
 # Schemas package
+from app.schemas.serializer import ModelSerializer
+
+__all__ = ['ModelSerializer']
@@ -0,0 +1,39 @@
+from app.models.case import Case
+from app.models.client import Client
+from app.models.calendar_event import CalendarEvent
+from app.models.document import Document
+from app.models.hearing_update import HearingUpdate
+from app.schemas.serializer import ModelSerializer
+
+case_serializer = ModelSerializer(Case, (
+    'id', 'case_number', 'title', 'case_type', 'court_name', 'status', 'filing_date',
+    'client_name', 'client_address', 'client_phone', 'opposite_party', 'otherside_counsel',
+    'party_type', 'description', 'remarks', 'notes', 'created_at', 'updated_at'
+))
+# Fields returned by GET /api/cases when no ?fields= is given
+CASE_LIST_FIELDS = tuple(name for name in case_serializer.fields if name != 'updated_at')
+# ?view=summary leaves out the long text columns
+CASE_SUMMARY_FIELDS = tuple(name for name in CASE_LIST_FIELDS
+                            if name not in ('client_address', 'description', 'remarks', 'notes'))
+
+client_serializer = ModelSerializer(Client, (
+    'id', 'name', 'email', 'phone', 'address', 'notes', 'created_at', 'updated_at'
+))
+CLIENT_LIST_FIELDS = ('id', 'name', 'email', 'phone', 'created_at')
+
+event_serializer = ModelSerializer(CalendarEvent, (
+    'id', 'title', 'description', 'event_type', 'event_date', 'duration', 'location', 'reminder_time',
+    'is_completed', 'recurrence', 'recurrence_interval', 'recurrence_until', 'case_id'
+))
+EVENT_LIST_FIELDS = ('id', 'title', 'description', 'event_type', 'event_date', 'duration', 'location',
+                     'is_completed', 'recurrence')
+
+document_serializer = ModelSerializer(Document, (
+    'id', 'title', 'file_name', 'file_url', 'file_type', 'file_size', 'sha256', 'description', 'uploaded_at',
+    'processing_status', 'has_thumbnail'
+))
+
+hearing_update_serializer = ModelSerializer(HearingUpdate, (
+    'id', 'case_id', 'user_id', 'hearing_date', 'action_taken', 'court_order', 'next_hearing_date',
+    'action_to_be_taken', 'calendar_event_id', 'created_at', 'updated_at'
+))
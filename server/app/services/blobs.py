@@ -0,0 +1,148 @@
+import hashlib
+import os
+import tempfile
+from collections import Counter
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models.blob import Blob
+from app.models.document import Document
+from app.services.storage import get_storage
+
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+class BlobTooLarge(ValueError):
+    """Raised when a stream is longer than the caller allowed"""
+
+
+def blob_key(sha256):
+    """blobs/ab/cd/abcd... - two levels of 256 shards keep directories small"""
+    return f'blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def thumbnail_key(sha256):
+    """Preview image of a blob; derived files share the blob's lifetime"""
+    return f'thumbnails/{sha256[:2]}/{sha256[2:4]}/{sha256}.jpg'
+
+
+def temp_dir():
+    """Local scratch space; on the same filesystem as local storage, so saves are atomic renames"""
+    path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'tmp')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def copy_stream(source, target, hasher, limit=None):
+    """Copy source to target in fixed-size blocks, feeding hasher (if any); returns bytes copied"""
+    copied = 0
+    while True:
+        block = source.read(COPY_BUFFER_SIZE)
+        if not block:
+            return copied
+        copied += len(block)
+        if limit is not None and copied > limit:
+            raise BlobTooLarge(f'File is larger than {limit} bytes')
+        if hasher is not None:
+            hasher.update(block)
+        target.write(block)
+
+
+def ingest_stream(stream, max_size=None):
+    """Stream an upload to a temp file while hashing it; returns (temp_path, sha256, size)"""
+    hasher = hashlib.sha256()
+    handle, temp_path = tempfile.mkstemp(dir=temp_dir(), suffix='.part')
+    try:
+        with os.fdopen(handle, 'wb') as target:
+            size = copy_stream(stream, target, hasher, max_size)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path, hasher.hexdigest(), size
+
+
+def acquire_blob(sha256, size):
+    """Add a reference to a blob, creating its row if needed; True if it is new"""
+    table = Blob.__table__
+    increment = table.update().where(table.c.sha256 == sha256).values(ref_count=table.c.ref_count + 1)
+    if db.session.execute(increment).rowcount:
+        return False
+    try:
+        with db.session.begin_nested():
+            db.session.execute(table.insert().values(sha256=sha256, size=size, ref_count=1,
+                                                     created_at=datetime.utcnow()))
+        return True
+    except IntegrityError:
+        # Another upload of the same content created it first
+        db.session.execute(increment)
+        return False
+
+
+def store_blob(temp_path, sha256, size):
+    """Reference the blob for a fully written temp file and move the file into storage.
+
+    The row is claimed before the file is placed, so a concurrent release
+    that removed the row (and is about to delete the file) is always
+    followed by this upload writing the file again. Call inside the
+    transaction that creates the document; if it rolls back, the placed
+    file is left for the orphan sweep. With a remote driver the upload
+    runs while the blob row is locked, which only delays concurrent
+    uploads of the same content.
+    """
+    created = acquire_blob(sha256, size)
+    storage = get_storage()
+    if created or not storage.exists(blob_key(sha256)):
+        storage.save(blob_key(sha256), temp_path)
+    else:
+        os.remove(temp_path)
+
+
+# --- Reference counting -----------------------------------------------------
+
+def _after_flush(session, flush_context):
+    released = Counter(obj.sha256 for obj in session.deleted if isinstance(obj, Document) and obj.sha256)
+    if not released:
+        return
+
+    table = Blob.__table__
+    connection = session.connection()
+    for sha256, count in sorted(released.items()):
+        connection.execute(table.update().where(table.c.sha256 == sha256)
+                           .values(ref_count=table.c.ref_count - count))
+    dead = [sha256 for sha256, in connection.execute(
+        db.select(table.c.sha256).where(table.c.sha256.in_(released), table.c.ref_count <= 0)
+    )]
+    if dead:
+        connection.execute(table.delete().where(table.c.sha256.in_(dead), table.c.ref_count <= 0))
+        session.info.setdefault('released_blobs', set()).update(dead)
+
+
+def _after_commit(session):
+    dead = session.info.pop('released_blobs', None)
+    if not dead:
+        return
+    # The session cannot run SQL here; check on a fresh connection that no
+    # upload re-created the blob since, then delete the files
+    table = Blob.__table__
+    with db.engine.connect() as connection:
+        revived = {sha256 for sha256, in connection.execute(
+            db.select(table.c.sha256).where(table.c.sha256.in_(dead))
+        )}
+    storage = get_storage()
+    for sha256 in dead - revived:
+        storage.delete(blob_key(sha256))
+        storage.delete(thumbnail_key(sha256))
+
+
+def _after_rollback(session):
+    session.info.pop('released_blobs', None)
+
+
+def register_blob_listeners():
+    """Drop blob references when documents are deleted, directly or by cascade"""
+    for name, listener in (('after_flush', _after_flush), ('after_commit', _after_commit),
+                           ('after_rollback', _after_rollback)):
+        if not event.contains(db.session, name, listener):
+            event.listen(db.session, name, listener)
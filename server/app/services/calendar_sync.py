@@ -0,0 +1,161 @@
+import hashlib
+import secrets
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event, func
+from sqlalchemy.orm.attributes import set_committed_value
+from app.extensions import db
+from app.models.calendar_event import CalendarEvent
+from app.models.calendar_tombstone import CalendarTombstone
+from app.models.user import User
+from app.models.user_counter import UserCounter
+from app.services.counters import version_counter
+
+EVENTS_VERSION = version_counter('events')
+
+
+class SyncTokenError(ValueError):
+    """Raised for a sync token that is malformed (400) or older than the kept tombstones (410)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _current_seq(connection, user_ids):
+    table = UserCounter.__table__
+    return dict(connection.execute(
+        db.select(table.c.user_id, table.c.value).where(table.c.user_id.in_(user_ids),
+                                                        table.c.name == EVENTS_VERSION)
+    ).all())
+
+
+def record_changes(connection, changed, deleted=()):
+    """Stamp changed events and write tombstones for deleted ones.
+
+    changed and deleted are (user_id, event_id) pairs. Each user's
+    version:events counter, already bumped and row-locked by this
+    transaction, becomes the sequence number. Writers to one user's
+    calendar therefore take sequence numbers in commit order, so a client
+    holding token N has seen every change numbered up to N.
+    """
+    user_ids = {user_id for user_id, _ in changed} | {user_id for user_id, _ in deleted}
+    if not user_ids:
+        return {}
+    seqs = _current_seq(connection, user_ids)
+
+    by_user = {}
+    for user_id, event_id in changed:
+        by_user.setdefault(user_id, []).append(event_id)
+    table = CalendarEvent.__table__
+    for user_id, event_ids in by_user.items():
+        # updated_at kept as-is: stamping is bookkeeping, not an edit
+        connection.execute(table.update().where(table.c.id.in_(event_ids)).values(
+            sync_seq=seqs.get(user_id, 0), updated_at=table.c.updated_at))
+
+    if deleted:
+        now = datetime.utcnow()
+        connection.execute(CalendarTombstone.__table__.insert(), [
+            {'user_id': user_id, 'event_id': event_id, 'seq': seqs.get(user_id, 0), 'deleted_at': now}
+            for user_id, event_id in deleted
+        ])
+    return seqs
+
+
+def _after_flush(session, flush_context):
+    gone_users = {obj.id for obj in session.deleted if isinstance(obj, User)}
+    changed = [obj for obj in session.new | session.dirty
+               if isinstance(obj, CalendarEvent) and obj not in session.deleted
+               and (obj in session.new or session.is_modified(obj, include_collections=False))]
+    deleted = [(obj.user_id, obj.id) for obj in session.deleted
+               if isinstance(obj, CalendarEvent) and obj.user_id not in gone_users]
+    if changed or deleted:
+        seqs = record_changes(session.connection(), [(obj.user_id, obj.id) for obj in changed], deleted)
+        for obj in changed:
+            set_committed_value(obj, 'sync_seq', seqs.get(obj.user_id, 0))
+
+
+def register_sync_listeners():
+    """Stamp event changes with sync sequence numbers; must follow register_counter_listeners,
+    whose version bump supplies the number"""
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
+
+
+def make_sync_token(seq):
+    return f'{seq}.{int(time.time())}'
+
+
+def read_sync_token(token):
+    """Return the sequence number in a sync token.
+
+    Tokens carry their issue time. One older than CALENDAR_TOMBSTONE_TTL
+    may predate purged tombstones, so it cannot give a complete delta.
+    """
+    try:
+        seq, issued = (int(part) for part in token.split('.'))
+    except (AttributeError, ValueError):
+        raise SyncTokenError('Invalid sync token')
+    if seq < 0 or time.time() - issued > current_app.config['CALENDAR_TOMBSTONE_TTL']:
+        raise SyncTokenError('Sync token expired; sync again without one', status=410)
+    return seq
+
+
+def current_sync_seq(user_id):
+    return _current_seq(db.session.connection(), [user_id]).get(user_id, 0)
+
+
+def deleted_since(user_id, seq):
+    return [event_id for event_id, in db.session.query(CalendarTombstone.event_id).filter(
+        CalendarTombstone.user_id == user_id, CalendarTombstone.seq > seq
+    ).order_by(CalendarTombstone.seq, CalendarTombstone.id)]
+
+
+def last_modified(user_id):
+    """Time of the user's latest calendar change (edit or delete), or None"""
+    latest = db.session.query(CalendarEvent.sync_seq, CalendarEvent.updated_at).filter(
+        CalendarEvent.user_id == user_id
+    ).order_by(CalendarEvent.sync_seq.desc(), CalendarEvent.id.desc()).first()
+    modified = latest.updated_at if latest else None
+    if latest and not latest.sync_seq:
+        # Nothing changed since sync numbers were introduced
+        modified = db.session.query(func.max(CalendarEvent.updated_at)).filter(
+            CalendarEvent.user_id == user_id).scalar()
+    deleted = db.session.query(CalendarTombstone.deleted_at).filter(
+        CalendarTombstone.user_id == user_id
+    ).order_by(CalendarTombstone.seq.desc(), CalendarTombstone.id.desc()).limit(1).scalar()
+    return max(filter(None, (modified, deleted)), default=None)
+
+
+def purge_tombstones():
+    """Delete tombstones older than CALENDAR_TOMBSTONE_TTL; returns the number removed"""
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['CALENDAR_TOMBSTONE_TTL'])
+    table = CalendarTombstone.__table__
+    removed = db.session.execute(table.delete().where(table.c.deleted_at < cutoff)).rowcount
+    db.session.commit()
+    return removed
+
+
+def _hash_feed_token(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def issue_feed_token(user):
+    """Give the user a new calendar feed token, replacing (and revoking) any earlier one.
+
+    Only its hash is stored, so the token is shown once, in the response.
+    """
+    token = secrets.token_urlsafe(32)
+    user.calendar_feed_token = _hash_feed_token(token)
+    return token
+
+
+def feed_owner(token):
+    """Id of the active user a feed token belongs to, or None"""
+    if not token or len(token) > 128:
+        return None
+    row = db.session.query(User.id, User.is_active).filter(
+        User.calendar_feed_token == _hash_feed_token(token)
+    ).first()
+    return row.id if row and row.is_active else None
@@ -0,0 +1,198 @@
+import csv
+import io
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from flask import current_app
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+from app.extensions import db
+from app.models.case import Case
+from app.models.cause_list_snapshot import CauseListSnapshot
+from app.models.hearing_update import HearingUpdate
+from app.services.counters import get_versions
+from app.utils.pdf import TextPDF
+
+# Longest date range a single cause list may cover
+MAX_CAUSE_LIST_DAYS = 31
+# Writes to these collections can change a cause list
+CAUSE_LIST_COLLECTIONS = ('hearing_updates', 'cases')
+
+CSV_FIELDS = ('date', 'court_name', 'item', 'case_number', 'case_title', 'case_type', 'status', 'party_type',
+              'client_name', 'opposite_party', 'otherside_counsel', 'last_hearing_date', 'court_order',
+              'action_to_be_taken', 'case_id', 'hearing_update_id')
+
+
+def cause_list_today():
+    """Today in EVENT_TIMEZONE, where the courts' day is reckoned"""
+    return datetime.now(ZoneInfo(current_app.config['EVENT_TIMEZONE'])).date()
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def cause_list_query(user_id, start, end):
+    """Matters listed from start to end (inclusive), in docket order.
+
+    A case is listed on the next_hearing_date of its latest hearing update
+    recorded before that date. An update is superseded once the case came
+    up again before the date it set, so rescheduled dates drop out while
+    past lists stay as they were. One query: the range is read from
+    (user_id, next_hearing_date) and each candidate is checked against
+    later updates through (case_id, hearing_date).
+    """
+    later = aliased(HearingUpdate)
+    superseded = db.session.query(later.id).filter(
+        later.case_id == HearingUpdate.case_id,
+        later.hearing_date < HearingUpdate.next_hearing_date,
+        or_(later.hearing_date > HearingUpdate.hearing_date,
+            and_(later.hearing_date == HearingUpdate.hearing_date, later.id > HearingUpdate.id))
+    ).exists()
+
+    return db.session.query(
+        HearingUpdate.next_hearing_date.label('list_date'), HearingUpdate.id.label('hearing_update_id'),
+        HearingUpdate.case_id, HearingUpdate.hearing_date.label('last_hearing_date'),
+        HearingUpdate.court_order, HearingUpdate.action_to_be_taken,
+        Case.court_name, Case.case_number, Case.title.label('case_title'), Case.case_type, Case.status,
+        Case.party_type, Case.client_name, Case.opposite_party, Case.otherside_counsel
+    ).join(Case, HearingUpdate.case_id == Case.id).filter(
+        HearingUpdate.user_id == user_id,
+        HearingUpdate.next_hearing_date >= start,
+        HearingUpdate.next_hearing_date <= end,
+        ~superseded
+    ).order_by(HearingUpdate.next_hearing_date, Case.court_name, Case.case_number)
+
+
+def build_cause_list(user_id, start, end):
+    """{date: [entry, ...]} for every day from start to end, straight from the hearing tables.
+
+    Entries are numbered per court (`item`) in the order they are returned.
+    """
+    days = {start + timedelta(days=offset): [] for offset in range((end - start).days + 1)}
+    previous_court, item = None, 0
+    for row in cause_list_query(user_id, start, end):
+        entries = days[row.list_date]
+        item = item + 1 if entries and row.court_name == previous_court else 1
+        previous_court = row.court_name
+        entries.append({
+            'item': item,
+            'court_name': row.court_name,
+            'case_id': row.case_id,
+            'case_number': row.case_number,
+            'case_title': row.case_title,
+            'case_type': row.case_type,
+            'status': row.status,
+            'party_type': row.party_type,
+            'client_name': row.client_name,
+            'opposite_party': row.opposite_party,
+            'otherside_counsel': row.otherside_counsel,
+            'hearing_update_id': row.hearing_update_id,
+            'last_hearing_date': _iso(row.last_hearing_date),
+            'court_order': row.court_order,
+            'action_to_be_taken': row.action_to_be_taken,
+        })
+    return days
+
+
+def _save_snapshots(user_id, days, versions):
+    try:
+        CauseListSnapshot.query.filter(
+            CauseListSnapshot.user_id == user_id, CauseListSnapshot.list_date.in_(list(days))
+        ).delete(synchronize_session=False)
+        db.session.add_all([CauseListSnapshot(user_id=user_id, list_date=day, versions=versions, entries=entries)
+                            for day, entries in days.items()])
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request stored the same days first; its rows are as good
+        db.session.rollback()
+
+
+def load_cause_list(user_id, start, end):
+    """Like build_cause_list, but served from current snapshots where possible.
+
+    Days without a current snapshot are rebuilt with a single query over
+    the span they cover, then stored. The versions are read before the
+    rebuild, so a write racing with it leaves the snapshot looking stale,
+    never current.
+    """
+    versions = '.'.join(map(str, get_versions(user_id, CAUSE_LIST_COLLECTIONS)))
+    days = {start + timedelta(days=offset): None for offset in range((end - start).days + 1)}
+    for snapshot in CauseListSnapshot.query.filter(
+        CauseListSnapshot.user_id == user_id,
+        CauseListSnapshot.list_date >= start,
+        CauseListSnapshot.list_date <= end,
+        CauseListSnapshot.versions == versions
+    ):
+        days[snapshot.list_date] = snapshot.entries
+
+    stale = [day for day, entries in days.items() if entries is None]
+    if stale:
+        built = build_cause_list(user_id, min(stale), max(stale))
+        rebuilt = {day: built[day] for day in stale}
+        days.update(rebuilt)
+        _save_snapshots(user_id, rebuilt, versions)
+    return days
+
+
+def snapshot_cause_lists(start, end):
+    """Precompute the cause lists of every user with a hearing in the range; returns the user count"""
+    user_ids = [user_id for user_id, in db.session.query(HearingUpdate.user_id).filter(
+        HearingUpdate.next_hearing_date >= start,
+        HearingUpdate.next_hearing_date <= end
+    ).distinct()]
+    for user_id in user_ids:
+        load_cause_list(user_id, start, end)
+    return len(user_ids)
+
+
+def group_by_court(entries):
+    """[{'court_name', 'entries'}] preserving docket order"""
+    courts = []
+    for entry in entries:
+        if not courts or courts[-1]['court_name'] != entry['court_name']:
+            courts.append({'court_name': entry['court_name'], 'entries': []})
+        courts[-1]['entries'].append(entry)
+    return courts
+
+
+def cause_list_csv(days):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, CSV_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    for day, entries in days.items():
+        for entry in entries:
+            writer.writerow(dict(entry, date=day.isoformat()))
+    return buffer.getvalue()
+
+
+def cause_list_pdf(days, advocate=None):
+    """Printable cause list: one page (or more) per day, matters grouped by court"""
+    first, last = min(days), max(days)
+    span = f'{first:%d %b %Y}' if first == last else f'{first:%d %b %Y} to {last:%d %b %Y}'
+    pdf = TextPDF(f'Cause list {span}', footer=' - '.join(filter(None, ['Cause list', advocate, span])))
+    for day, entries in days.items():
+        pdf.new_page()
+        pdf.heading(f'Cause list - {day:%A, %d %B %Y}', size=13, space_before=0)
+        if advocate:
+            pdf.text(advocate)
+        if not entries:
+            pdf.space()
+            pdf.text('No matters listed.')
+        for court in group_by_court(entries):
+            pdf.heading(court['court_name'] or 'Court not specified', size=11, space_before=10)
+            for entry in court['entries']:
+                pdf.space(4)
+                pdf.text(f"{entry['item']:>3}. {entry['case_number']}  {entry['case_title']}", bold=True)
+                parties = ' v. '.join(filter(None, [entry['client_name'], entry['opposite_party']]))
+                if entry['party_type']:
+                    parties = f"{parties} ({entry['party_type']})" if parties else entry['party_type']
+                if parties:
+                    pdf.text(parties, indent=30)
+                if entry['otherside_counsel']:
+                    pdf.text(f"Opposite counsel: {entry['otherside_counsel']}", indent=30)
+                if entry['court_order']:
+                    pdf.text(f"Order of {entry['last_hearing_date']}: {entry['court_order']}", indent=30)
+                if entry['action_to_be_taken']:
+                    pdf.text(f"To do: {entry['action_to_be_taken']}", indent=30)
+    return pdf.render()
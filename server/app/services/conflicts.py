@@ -0,0 +1,176 @@
+import heapq
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+from sqlalchemy import or_
+from app.extensions import db
+from app.models.calendar_event import CalendarEvent
+from app.services.recurrence import expand_occurrences
+
+# Length of a timed event without a duration; one at midnight without a
+# duration (a hearing date, say) is taken to last the whole day
+DEFAULT_EVENT_DURATION = 60
+# No event may be longer than this (minutes). The bound is what makes the
+# (user_id, event_date) index an interval index: anything overlapping
+# [start, end) starts in [start - MAX_EVENT_DURATION, end)
+MAX_EVENT_DURATION = 24 * 60
+MAX_CONFLICT_RANGE_DAYS = 92
+# How far ahead a recurring event's own occurrences are checked on write
+RECURRING_CONFLICT_HORIZON_DAYS = 90
+
+_EVENT_COLUMNS = (CalendarEvent.id, CalendarEvent.title, CalendarEvent.event_type, CalendarEvent.event_date,
+                  CalendarEvent.duration, CalendarEvent.location, CalendarEvent.case_id, CalendarEvent.recurrence,
+                  CalendarEvent.recurrence_interval, CalendarEvent.recurrence_until)
+
+# One occurrence of an event as a half-open interval; event is a row of _EVENT_COLUMNS
+Occurrence = namedtuple('Occurrence', ['start', 'end', 'event'])
+
+
+def event_end(start, duration):
+    if duration:
+        return start + timedelta(minutes=duration)
+    if start.time() == time.min:
+        return start + timedelta(days=1)
+    return start + timedelta(minutes=DEFAULT_EVENT_DURATION)
+
+
+def _place(location):
+    return (location or '').strip().lower()
+
+
+def clashes(a, b):
+    """Whether two occurrences conflict: they overlap, belong to different
+    events and are not at the same place (hearings in one court the same
+    day are a normal day's list, not a clash)"""
+    if a.event.id == b.event.id or a.start >= b.end or b.start >= a.end:
+        return False
+    place = _place(a.event.location)
+    return not place or place != _place(b.event.location)
+
+
+def load_occurrences(user_id, window_start, window_end, exclude_id=None):
+    """Occurrences of the user's open events that overlap [window_start, window_end).
+
+    One-off events come from a range scan on (user_id, event_date), read
+    back MAX_EVENT_DURATION to catch events that started earlier. Recurring
+    series are few per user and are expanded in the same window.
+    """
+    reach = window_start - timedelta(minutes=MAX_EVENT_DURATION)
+    base = db.session.query(*_EVENT_COLUMNS).filter(
+        CalendarEvent.user_id == user_id,
+        or_(CalendarEvent.is_completed.is_(False), CalendarEvent.is_completed.is_(None))
+    )
+    if exclude_id is not None:
+        base = base.filter(CalendarEvent.id != exclude_id)
+
+    occurrences = []
+    single = base.filter(CalendarEvent.recurrence.is_(None), CalendarEvent.event_date >= reach,
+                         CalendarEvent.event_date < window_end)
+    for event in single:
+        occurrences.append(Occurrence(event.event_date, event_end(event.event_date, event.duration), event))
+
+    series = base.filter(
+        CalendarEvent.recurrence.isnot(None),
+        CalendarEvent.event_date < window_end,
+        or_(CalendarEvent.recurrence_until.is_(None), CalendarEvent.recurrence_until >= reach)
+    )
+    for event in series:
+        for start in expand_occurrences(event.event_date, event.recurrence, event.recurrence_interval,
+                                        event.recurrence_until, reach, window_end):
+            occurrences.append(Occurrence(start, event_end(start, event.duration), event))
+
+    return [occurrence for occurrence in occurrences if occurrence.end > window_start]
+
+
+def sweep_conflicts(occurrences):
+    """Yield every clashing pair (earlier, later) with a sweep over start times.
+
+    Occurrences still running are kept in a heap keyed by end time, and
+    each one that has finished is dropped before the next start. Everything
+    left in the heap overlaps the occurrence being added. The cost is
+    O(n log n) plus the number of overlapping pairs, not O(n^2).
+    """
+    active = []
+    for index, occurrence in enumerate(sorted(occurrences, key=lambda item: (item.start, item.end))):
+        while active and active[0][0] <= occurrence.start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            if clashes(other, occurrence):
+                yield other, occurrence
+        heapq.heappush(active, (occurrence.end, index, occurrence))
+
+
+def conflict_summary(occurrence):
+    event = occurrence.event
+    return {
+        'id': event.id,
+        'title': event.title,
+        'event_type': event.event_type,
+        'event_date': occurrence.start.isoformat(),
+        'end': occurrence.end.isoformat(),
+        'location': event.location,
+        'case_id': event.case_id,
+    }
+
+
+def conflicts_in_range(user_id, start, end):
+    """Every clashing pair of the user's occurrences that overlap inside [start, end), in start order"""
+    pairs = []
+    for first, second in sweep_conflicts(load_occurrences(user_id, start, end)):
+        overlap_start, overlap_end = max(first.start, second.start), min(first.end, second.end)
+        if overlap_start < end and overlap_end > start:
+            pairs.append({
+                'start': overlap_start.isoformat(),
+                'end': overlap_end.isoformat(),
+                'events': [conflict_summary(first), conflict_summary(second)],
+            })
+    return pairs
+
+
+def event_conflicts(event, now=None):
+    """The user's other occurrences that clash with `event`, a flushed CalendarEvent.
+
+    A one-off event is checked against the few rows the interval index
+    returns for its own span. A recurring one is swept over its next
+    RECURRING_CONFLICT_HORIZON_DAYS. Completed events never conflict.
+    """
+    if event.is_completed:
+        return []
+    if not event.recurrence:
+        mine = Occurrence(event.event_date, event_end(event.event_date, event.duration), event)
+        others = load_occurrences(event.user_id, mine.start, mine.end, exclude_id=event.id)
+        return [conflict_summary(other) for other in sorted(others, key=lambda item: item.start)
+                if clashes(mine, other)]
+
+    window_start = max(event.event_date, now or datetime.utcnow())
+    window_end = window_start + timedelta(days=RECURRING_CONFLICT_HORIZON_DAYS)
+    mine = [Occurrence(start, event_end(start, event.duration), event)
+            for start in expand_occurrences(event.event_date, event.recurrence, event.recurrence_interval,
+                                            event.recurrence_until, window_start, window_end)]
+    if not mine:
+        return []
+    others = load_occurrences(event.user_id, mine[0].start, mine[-1].end, exclude_id=event.id)
+    seen = set()
+    conflicts = []
+    for first, second in sweep_conflicts(mine + others):
+        if first.event.id == event.id:
+            other = second
+        elif second.event.id == event.id:
+            other = first
+        else:
+            continue
+        if (other.event.id, other.start) in seen:
+            continue
+        seen.add((other.event.id, other.start))
+        conflicts.append(conflict_summary(other))
+    return conflicts
+
+
+def conflicts_for_events(user_id, event_ids, start, end):
+    """Clashes of several new one-off events in [start, end), by event id, from one sweep"""
+    event_ids = set(event_ids)
+    found = {event_id: [] for event_id in event_ids}
+    for first, second in sweep_conflicts(load_occurrences(user_id, start, end)):
+        for mine, other in ((first, second), (second, first)):
+            if mine.event.id in event_ids:
+                found[mine.event.id].append(conflict_summary(other))
+    return found
@@ -0,0 +1,194 @@
+from collections import defaultdict
+from sqlalchemy import event, func
+from sqlalchemy.orm import attributes
+from app.extensions import db
+from app.models.case import Case
+from app.models.calendar_event import CalendarEvent
+from app.models.client import Client
+from app.models.document import Document
+from app.models.hearing_update import HearingUpdate
+from app.models.user_counter import UserCounter
+
+# Collections whose per-user version is bumped on every write, for ETags
+VERSIONED_MODELS = {
+    Case: 'cases',
+    Client: 'clients',
+    CalendarEvent: 'events',
+    HearingUpdate: 'hearing_updates',
+    Document: 'documents',
+}
+
+
+def status_counter(status):
+    return f'cases:{status or "Unknown"}'
+
+
+def version_counter(collection):
+    return f'version:{collection}'
+
+
+def apply_counter_deltas(connection, deltas):
+    """Add {(user_id, name): delta} to user_counters in the current transaction.
+
+    Uses a single atomic upsert-increment so concurrent writers never lose
+    an update; rows are sorted so every transaction locks them in the same
+    order. Code that bypasses the ORM unit of work (bulk inserts) must call
+    this itself.
+    """
+    rows = [{'user_id': user_id, 'name': name, 'value': delta}
+            for (user_id, name), delta in sorted(deltas.items()) if delta]
+    if not rows:
+        return
+
+    table = UserCounter.__table__
+    if connection.dialect.name == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update(value=table.c.value + stmt.inserted.value)
+    else:
+        if connection.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.name],
+            set_={'value': table.c.value + stmt.excluded.value}
+        )
+    connection.execute(stmt)
+
+
+def _old_value(obj, key):
+    history = attributes.get_history(obj, key)
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, key)
+
+
+def _collect_deltas(session):
+    deltas = defaultdict(int)
+
+    for obj in session.new:
+        if isinstance(obj, Case):
+            deltas[(obj.user_id, 'cases')] += 1
+            deltas[(obj.user_id, status_counter(obj.status))] += 1
+        elif isinstance(obj, HearingUpdate):
+            deltas[(obj.user_id, 'hearing_updates')] += 1
+        elif isinstance(obj, CalendarEvent):
+            deltas[(obj.user_id, 'events')] += 1
+            if not obj.is_completed:
+                deltas[(obj.user_id, 'events:open')] += 1
+        elif isinstance(obj, Document):
+            deltas[(obj.user_id, 'documents')] += 1
+            deltas[(obj.user_id, 'storage_bytes')] += obj.file_size or 0
+
+    for obj in session.deleted:
+        if isinstance(obj, Case):
+            deltas[(obj.user_id, 'cases')] -= 1
+            deltas[(obj.user_id, status_counter(_old_value(obj, 'status')))] -= 1
+        elif isinstance(obj, HearingUpdate):
+            deltas[(obj.user_id, 'hearing_updates')] -= 1
+        elif isinstance(obj, CalendarEvent):
+            deltas[(obj.user_id, 'events')] -= 1
+            if not _old_value(obj, 'is_completed'):
+                deltas[(obj.user_id, 'events:open')] -= 1
+        elif isinstance(obj, Document):
+            deltas[(obj.user_id, 'documents')] -= 1
+            deltas[(obj.user_id, 'storage_bytes')] -= _old_value(obj, 'file_size') or 0
+
+    for obj in session.dirty:
+        if obj in session.deleted:
+            continue
+        if isinstance(obj, Case):
+            history = attributes.get_history(obj, 'status')
+            if history.deleted and history.added and history.deleted[0] != history.added[0]:
+                deltas[(obj.user_id, status_counter(history.deleted[0]))] -= 1
+                deltas[(obj.user_id, status_counter(history.added[0]))] += 1
+        elif isinstance(obj, CalendarEvent):
+            history = attributes.get_history(obj, 'is_completed')
+            if history.added and history.deleted and bool(history.added[0]) != bool(history.deleted[0]):
+                deltas[(obj.user_id, 'events:open')] += -1 if history.added[0] else 1
+
+    _collect_versions(session, deltas)
+    return deltas
+
+
+def _collect_versions(session, deltas):
+    """Bump the version of every collection touched by this flush"""
+    touched = [obj for obj in session.new | session.deleted if type(obj) in VERSIONED_MODELS]
+    touched += [obj for obj in session.dirty if type(obj) in VERSIONED_MODELS and obj not in session.deleted
+                and session.is_modified(obj, include_collections=False)]
+
+    for obj in touched:
+        if obj.user_id is not None:
+            deltas[(obj.user_id, version_counter(VERSIONED_MODELS[type(obj)]))] = 1
+
+
+def get_versions(user_id, collections):
+    """Current version number of each collection, 0 if never written"""
+    names = [version_counter(collection) for collection in collections]
+    rows = dict(db.session.query(UserCounter.name, UserCounter.value).filter(
+        UserCounter.user_id == user_id, UserCounter.name.in_(names)
+    ).all())
+    return [rows.get(name, 0) for name in names]
+
+
+def _after_flush(session, flush_context):
+    deltas = _collect_deltas(session)
+    if any(deltas.values()):
+        apply_counter_deltas(session.connection(), deltas)
+
+
+def register_counter_listeners():
+    """Keep user_counters in step with ORM writes, in the same transaction"""
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
+
+
+def get_counters(user_id):
+    """Return {name: value} for a user"""
+    rows = db.session.query(UserCounter.name, UserCounter.value).filter(UserCounter.user_id == user_id).all()
+    return {name: value for name, value in rows}
+
+
+def rebuild_counters(user_id=None):
+    """Recount every aggregate counter from the source tables, repairing any drift.
+
+    Runs in one transaction; returns the number of counter rows written.
+    """
+    deltas = defaultdict(int)
+
+    def grouped(*columns, model, extra=None):
+        query = db.session.query(*columns, func.count()).select_from(model)
+        if user_id is not None:
+            query = query.filter(model.user_id == user_id)
+        if extra is not None:
+            query = query.filter(extra)
+        return query.group_by(*columns).all()
+
+    for owner, status, count in grouped(Case.user_id, Case.status, model=Case):
+        deltas[(owner, 'cases')] += count
+        deltas[(owner, status_counter(status))] += count
+    for owner, count in grouped(HearingUpdate.user_id, model=HearingUpdate):
+        deltas[(owner, 'hearing_updates')] += count
+    for owner, count in grouped(CalendarEvent.user_id, model=CalendarEvent):
+        deltas[(owner, 'events')] += count
+    open_filter = db.or_(CalendarEvent.is_completed.is_(False), CalendarEvent.is_completed.is_(None))
+    for owner, count in grouped(CalendarEvent.user_id, model=CalendarEvent, extra=open_filter):
+        deltas[(owner, 'events:open')] += count
+
+    query = db.session.query(Document.user_id, func.count(), func.coalesce(func.sum(Document.file_size), 0))
+    if user_id is not None:
+        query = query.filter(Document.user_id == user_id)
+    for owner, count, size in query.group_by(Document.user_id).all():
+        deltas[(owner, 'documents')] += count
+        deltas[(owner, 'storage_bytes')] += int(size)
+
+    # Versions are left alone: resetting them could make a stale ETag match again
+    delete = UserCounter.__table__.delete().where(UserCounter.name.notlike('version:%'))
+    if user_id is not None:
+        delete = delete.where(UserCounter.user_id == user_id)
+    db.session.execute(delete)
+    apply_counter_deltas(db.session.connection(), deltas)
+    db.session.commit()
+    return sum(1 for value in deltas.values() if value)
@@ -0,0 +1,134 @@
+import mimetypes
+import os
+from datetime import datetime, timezone
+from flask import current_app, redirect, send_file
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+from werkzeug.security import safe_join
+from app.services.blobs import blob_key, thumbnail_key
+from app.services.storage import get_storage
+
+TOKEN_SALT = 'document-download'
+
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt=TOKEN_SALT)
+
+
+def make_download_token(document_id, user_id):
+    """Short-lived token that lets a plain link (an <a>, a PDF viewer) fetch one document"""
+    return _serializer().dumps([document_id, user_id])
+
+
+def read_download_token(token, document_id):
+    """Return the user id a token was issued to, or None if it is invalid or expired"""
+    try:
+        token_document_id, user_id = _serializer().loads(
+            token, max_age=current_app.config['DOWNLOAD_TOKEN_TTL']
+        )
+    except (BadSignature, SignatureExpired, ValueError, TypeError):
+        return None
+    return user_id if token_document_id == document_id else None
+
+
+def document_key(document):
+    """Storage key of the document's file, or None if it is unsafe"""
+    if document.sha256:
+        return blob_key(document.sha256)
+    # Files uploaded before content addressing: /uploads/<name>
+    name = document.file_url.rsplit('/', 1)[-1]
+    return name if safe_join(current_app.config['UPLOAD_FOLDER'], name) else None
+
+
+def document_mimetype(document):
+    return mimetypes.guess_type(document.file_name)[0] or 'application/octet-stream'
+
+
+def presigned_document_url(document, as_attachment=True):
+    """Direct URL into remote storage, valid for DOWNLOAD_TOKEN_TTL; None with local storage"""
+    key = document_key(document)
+    if key is None:
+        return None
+    return get_storage().presigned_url(key, document.file_name, document_mimetype(document), as_attachment,
+                                       current_app.config['DOWNLOAD_TOKEN_TTL'])
+
+
+def _redirect(url):
+    response = redirect(url, 302)
+    # The target expires, so no cache may replay the redirect
+    response.cache_control.no_store = True
+    response.cache_control.private = True
+    return response
+
+
+def _local_file(key):
+    path = get_storage().local_path(key) if key else None
+    return path if path and os.path.isfile(path) else None
+
+
+def send_document(document, as_attachment=True):
+    """Build the download response for a document the caller is allowed to read.
+
+    Remote storage drivers answer with a redirect to a presigned URL, so
+    the bytes go straight from S3/Cloudinary to the browser. With local
+    storage, DOCUMENT_SEND_MODE picks who moves the bytes:
+    - 'direct': Flask's send_file with Range, ETag and Last-Modified;
+      gunicorn hands the open file to sendfile(2)
+    - 'x-accel': an empty response with X-Accel-Redirect, and nginx serves
+      the file from its internal location (Range and conditionals included)
+    """
+    url = presigned_document_url(document, as_attachment)
+    if url:
+        return _redirect(url)
+
+    key = document_key(document)
+    path = _local_file(key)
+    if path is None:
+        return None
+
+    mimetype = document_mimetype(document)
+    max_age = current_app.config['DOWNLOAD_MAX_AGE']
+
+    if current_app.config['DOCUMENT_SEND_MODE'] == 'x-accel':
+        response = current_app.response_class(mimetype=mimetype)
+        prefix = current_app.config['X_ACCEL_REDIRECT_PREFIX'].rstrip('/')
+        response.headers['X-Accel-Redirect'] = f'{prefix}/{key}'
+        response.headers.set('Content-Disposition', 'attachment' if as_attachment else 'inline',
+                             filename=document.file_name)
+        response.cache_control.private = True
+        response.cache_control.max_age = max_age
+        return response
+
+    response = send_file(
+        path,
+        mimetype=mimetype,
+        as_attachment=as_attachment,
+        download_name=document.file_name,
+        conditional=True,
+        # Content-addressed files never change, so the hash is a strong validator
+        etag=document.sha256 or True,
+        last_modified=datetime.fromtimestamp(os.path.getmtime(path), timezone.utc),
+        max_age=max_age
+    )
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
+
+
+def send_thumbnail(document):
+    """The document's JPEG preview, cached privately like the document itself"""
+    if not document.sha256:
+        return None
+    key = thumbnail_key(document.sha256)
+    url = get_storage().presigned_url(key, f'{document.file_name.rsplit(".", 1)[0]}.jpg', 'image/jpeg',
+                                      as_attachment=False, expires_in=current_app.config['DOWNLOAD_TOKEN_TTL'])
+    if url:
+        return _redirect(url)
+
+    path = _local_file(key)
+    if path is None:
+        return None
+    response = send_file(path, mimetype='image/jpeg', conditional=True, etag=f'{document.sha256}-thumb',
+                         max_age=current_app.config['DOWNLOAD_MAX_AGE'])
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
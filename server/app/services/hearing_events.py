@@ -0,0 +1,31 @@
+from datetime import datetime
+from app.models.calendar_event import CalendarEvent
+
+
+def build_hearing_event(case, user_id, next_hearing_date, action_to_be_taken):
+    """Calendar event auto-created for a hearing update's next_hearing_date"""
+    return CalendarEvent(
+        user_id=user_id,
+        case_id=case.id,
+        title=f"Hearing: {case.title}",
+        description=f"Next hearing for case {case.case_number}\n\nAction to be taken: {action_to_be_taken or 'N/A'}",
+        event_type='Hearing',
+        event_date=datetime.combine(next_hearing_date, datetime.min.time()),
+        location=case.court_name
+    )
+
+
+def hearing_event_row(case, user_id, next_hearing_date, action_to_be_taken, now):
+    """build_hearing_event as a row for bulk_insert, with the defaults the ORM would fill in.
+
+    Callers inserting these rows must apply the events counters and
+    record_changes() themselves, as the ORM listeners do not run.
+    """
+    event = build_hearing_event(case, user_id, next_hearing_date, action_to_be_taken)
+    return {
+        'user_id': user_id, 'case_id': event.case_id, 'title': event.title,
+        'description': event.description, 'event_type': event.event_type,
+        'event_date': event.event_date, 'location': event.location,
+        'is_completed': False, 'recurrence_interval': 1,
+        'created_at': now, 'updated_at': now
+    }
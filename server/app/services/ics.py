@@ -0,0 +1,147 @@
+from datetime import time, timedelta, timezone
+from zoneinfo import ZoneInfo
+from flask import current_app
+from app.extensions import db
+from app.models.calendar_event import CalendarEvent
+from app.services.conflicts import event_end
+
+PRODID = '-//Advocate Diary//Calendar Feed//EN'
+# Rows fetched per round trip from the server-side cursor
+FEED_BATCH_SIZE = 1000
+
+_RRULE_FREQ = {'daily': 'DAILY', 'weekly': 'WEEKLY', 'monthly': 'MONTHLY', 'yearly': 'YEARLY'}
+
+_FEED_COLUMNS = (CalendarEvent.id, CalendarEvent.title, CalendarEvent.description, CalendarEvent.event_type,
+                 CalendarEvent.event_date, CalendarEvent.duration, CalendarEvent.location,
+                 CalendarEvent.reminder_time, CalendarEvent.recurrence, CalendarEvent.recurrence_interval,
+                 CalendarEvent.recurrence_until, CalendarEvent.sync_seq, CalendarEvent.created_at,
+                 CalendarEvent.updated_at)
+
+
+def escape_text(value):
+    """TEXT value escaping (RFC 5545 section 3.3.11)"""
+    return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n'))
+
+
+def fold(line):
+    """Fold a content line at 75 octets without splitting a UTF-8 sequence; adds CRLF"""
+    data = line.encode('utf-8')
+    if len(data) <= 75:
+        return line + '\r\n'
+    parts = []
+    start, limit = 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Back off continuation bytes (10xxxxxx) so characters stay whole
+        while end < len(data) and data[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode('utf-8'))
+        start, limit = end, 74  # continuation lines start with a space
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _utc(value):
+    return value.strftime('%Y%m%dT%H%M%SZ')
+
+
+class _Clock:
+    """Formats naive EVENT_TIMEZONE wall-clock times as iCalendar DATE-TIMEs.
+
+    UTC is written in the Z form. Other zones use TZID with the IANA name,
+    which calendar apps resolve without an embedded VTIMEZONE. Recurring
+    events then keep their wall-clock time across DST changes.
+    """
+
+    def __init__(self, zone_name):
+        self.zone_name = zone_name
+        self.zone = ZoneInfo(zone_name)
+        self.is_utc = zone_name.upper() in ('UTC', 'ETC/UTC', 'Z')
+
+    def to_utc(self, value):
+        return value.replace(tzinfo=self.zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+    def property(self, name, value):
+        if self.is_utc:
+            return f'{name}:{_utc(value)}'
+        return f'{name};TZID={self.zone_name}:{value.strftime("%Y%m%dT%H%M%S")}'
+
+
+def recurrence_rule(row, all_day, clock):
+    """The RRULE that produces the same occurrences as expand_occurrences.
+
+    The server moves a monthly (or yearly) series started on the 29th-31st
+    to the last day of a shorter month, where a plain RRULE would skip that
+    month. BYMONTHDAY=<day>,-1 with BYSETPOS=1 takes whichever of the day
+    and the month's last day comes first, which is the same date.
+    """
+    rule = f'RRULE:FREQ={_RRULE_FREQ[row.recurrence]};INTERVAL={max(1, row.recurrence_interval or 1)}'
+    day = row.event_date.day
+    if row.recurrence in ('monthly', 'yearly') and day > 28:
+        if row.recurrence == 'yearly':
+            rule += f';BYMONTH={row.event_date.month}'
+        rule += ';BYMONTHDAY=-1' if day == 31 else f';BYMONTHDAY={day},-1;BYSETPOS=1'
+    if row.recurrence_until:
+        if all_day:
+            rule += f';UNTIL={row.recurrence_until:%Y%m%d}'
+        else:
+            rule += f';UNTIL={_utc(clock.to_utc(row.recurrence_until))}'
+    return rule
+
+
+def event_lines(row, clock):
+    """Content lines (unfolded) of one VEVENT"""
+    all_day = not row.duration and row.event_date.time() == time.min
+    stamp = row.updated_at or row.created_at or row.event_date
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:event-{row.id}@advocate-diary',
+        f'DTSTAMP:{_utc(stamp)}',
+        f'LAST-MODIFIED:{_utc(stamp)}',
+        f'SEQUENCE:{row.sync_seq or 0}',
+    ]
+    if all_day:
+        lines += [f'DTSTART;VALUE=DATE:{row.event_date:%Y%m%d}',
+                  f'DTEND;VALUE=DATE:{row.event_date + timedelta(days=1):%Y%m%d}']
+    else:
+        # Same default length as conflict detection
+        lines += [clock.property('DTSTART', row.event_date),
+                  clock.property('DTEND', event_end(row.event_date, row.duration))]
+
+    if row.recurrence in _RRULE_FREQ:
+        lines.append(recurrence_rule(row, all_day, clock))
+
+    lines.append(f'SUMMARY:{escape_text(row.title)}')
+    if row.description:
+        lines.append(f'DESCRIPTION:{escape_text(row.description)}')
+    if row.location:
+        lines.append(f'LOCATION:{escape_text(row.location)}')
+    if row.event_type:
+        lines.append(f'CATEGORIES:{escape_text(row.event_type)}')
+    if row.reminder_time is not None:
+        lines += ['BEGIN:VALARM', 'ACTION:DISPLAY', f'DESCRIPTION:{escape_text(row.title)}',
+                  f'TRIGGER:-PT{row.reminder_time}M', 'END:VALARM']
+    lines.append('END:VEVENT')
+    return lines
+
+
+def calendar_feed(user_id, name):
+    """Yield the user's calendar as folded iCalendar lines, one event at a time.
+
+    Rows come through a server-side cursor in FEED_BATCH_SIZE batches, so
+    memory use does not grow with the number of events.
+    """
+    config = current_app.config
+    clock = _Clock(config['EVENT_TIMEZONE'])
+    refresh = f"PT{max(1, config['CALENDAR_FEED_REFRESH'] // 60)}M"
+    header = ['BEGIN:VCALENDAR', 'VERSION:2.0', f'PRODID:{PRODID}', 'CALSCALE:GREGORIAN', 'METHOD:PUBLISH',
+              f'X-WR-CALNAME:{escape_text(name)}', f'X-WR-TIMEZONE:{clock.zone_name}',
+              f'REFRESH-INTERVAL;VALUE=DURATION:{refresh}', f'X-PUBLISHED-TTL:{refresh}']
+    for line in header:
+        yield fold(line)
+
+    query = db.session.query(*_FEED_COLUMNS).filter(CalendarEvent.user_id == user_id).order_by(CalendarEvent.id)
+    for row in query.execution_options(stream_results=True).yield_per(FEED_BATCH_SIZE):
+        for line in event_lines(row, clock):
+            yield fold(line)
+    yield 'END:VCALENDAR\r\n'
@@ -0,0 +1,236 @@
+import csv
+import io
+from collections import defaultdict
+from datetime import datetime
+from types import SimpleNamespace
+from app.extensions import db
+from app.models.calendar_event import CalendarEvent
+from app.models.case import Case
+from app.models.hearing_update import HearingUpdate
+from app.services.calendar_sync import record_changes
+from app.services.counters import apply_counter_deltas, status_counter, version_counter
+from app.services.hearing_events import hearing_event_row
+from app.services.search import index_documents
+from app.utils.bulk import bulk_insert
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+CASE_FIELDS = ('case_number', 'title', 'case_type', 'court_name', 'filing_date', 'status',
+               'client_name', 'client_address', 'client_phone', 'opposite_party',
+               'otherside_counsel', 'party_type', 'description', 'remarks', 'notes')
+HEARING_FIELDS = ('hearing_date', 'action_taken', 'court_order', 'next_hearing_date', 'action_to_be_taken')
+
+
+class ImportFormatError(ValueError):
+    """Raised when an uploaded file cannot be read as a case sheet"""
+
+
+def _normalize_header(name):
+    return (name or '').strip().lower().replace(' ', '_')
+
+
+def _clean(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    value = str(value).strip()
+    return value or None
+
+
+def _parse_date(value, field):
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value[:10], '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f'Invalid {field} format. Use YYYY-MM-DD')
+
+
+def read_csv_rows(stream):
+    """Yield dicts from a binary CSV stream without reading it all into memory"""
+    reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    header = next(reader, None)
+    if not header:
+        raise ImportFormatError('File is empty')
+    names = [_normalize_header(name) for name in header]
+    for values in reader:
+        yield dict(zip(names, values))
+
+
+def read_excel_rows(stream):
+    """Yield dicts from the first sheet of an .xlsx workbook (needs openpyxl)"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFormatError('Excel import requires the openpyxl package; upload a CSV instead')
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    rows = workbook.active.iter_rows(values_only=True)
+    header = next(rows, None)
+    if not header:
+        raise ImportFormatError('File is empty')
+    names = [_normalize_header(str(name) if name is not None else '') for name in header]
+    for values in rows:
+        yield dict(zip(names, values))
+
+
+def _validate(row):
+    """Return (case_fields, hearing_fields) for one sheet row or raise ValueError"""
+    values = {key: _clean(row.get(key)) for key in CASE_FIELDS + HEARING_FIELDS}
+    if not values['case_number']:
+        raise ValueError('Case number is required')
+
+    case_fields = {key: values[key] for key in CASE_FIELDS}
+    case_fields['filing_date'] = _parse_date(case_fields['filing_date'], 'filing_date')
+    case_fields['status'] = case_fields['status'] or 'Active'
+
+    hearing_fields = None
+    if any(values[key] for key in HEARING_FIELDS):
+        hearing_fields = {key: values[key] for key in HEARING_FIELDS}
+        if not hearing_fields['hearing_date']:
+            raise ValueError('hearing_date is required when hearing details are given')
+        hearing_fields['hearing_date'] = _parse_date(hearing_fields['hearing_date'], 'hearing_date')
+        hearing_fields['next_hearing_date'] = _parse_date(hearing_fields['next_hearing_date'], 'next_hearing_date')
+    return case_fields, hearing_fields
+
+
+class CaseImporter:
+    """Bulk-load cases and their hearing history for one user.
+
+    Rows are validated and written a chunk at a time: one set-based
+    SELECT resolves every case_number in the chunk, then cases, hearing
+    updates and the calendar events of their next hearing dates go in as
+    bulk INSERTs and the chunk is committed. Several rows may share a
+    case_number; the first creates the case and every row with hearing
+    columns adds a hearing update to it.
+    """
+
+    def __init__(self, user_id, chunk_size=IMPORT_CHUNK_SIZE):
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.cases_imported = 0
+        self.hearings_imported = 0
+        self.rows_processed = 0
+        self.errors = []
+        self.error_count = 0
+
+    def error(self, row_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'error': message})
+
+    def run(self, rows):
+        chunk = []
+        # Row 1 is the header, so data starts on row 2 like in a spreadsheet
+        for row_number, row in enumerate(rows, start=2):
+            if not any(value not in (None, '') for value in row.values()):
+                continue
+            chunk.append((row_number, row))
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+        return self.report()
+
+    def report(self):
+        return {
+            'rows_processed': self.rows_processed,
+            'cases_imported': self.cases_imported,
+            'hearings_imported': self.hearings_imported,
+            'error_count': self.error_count,
+            'errors': sorted(self.errors, key=lambda error: error['row'])
+        }
+
+    def _import_chunk(self, chunk):
+        self.rows_processed += len(chunk)
+        parsed = []
+        for row_number, row in chunk:
+            try:
+                parsed.append((row_number,) + _validate(row))
+            except ValueError as e:
+                self.error(row_number, str(e))
+
+        numbers = {case_fields['case_number'] for _, case_fields, _ in parsed}
+        existing = {}
+        if numbers:
+            existing = {case.case_number: case for case in db.session.query(
+                Case.id, Case.case_number, Case.user_id, Case.title, Case.court_name
+            ).filter(Case.case_number.in_(numbers)).all()}
+
+        new_cases, hearings, accepted = {}, [], []
+        for row_number, case_fields, hearing_fields in parsed:
+            number = case_fields['case_number']
+            if number in existing and existing[number].user_id != self.user_id:
+                self.error(row_number, 'Case number already exists')
+                continue
+            known = number in existing or number in new_cases
+            if known and not hearing_fields:
+                self.error(row_number, 'Case number already exists')
+                continue
+            if not known:
+                if not case_fields['title']:
+                    self.error(row_number, 'Case title is required')
+                    continue
+                new_cases[number] = dict(case_fields, user_id=self.user_id)
+            if hearing_fields:
+                hearings.append((number, hearing_fields))
+            accepted.append(row_number)
+
+        try:
+            now = datetime.utcnow()
+            if new_cases:
+                db.session.execute(db.insert(Case), [
+                    dict(fields, created_at=now, updated_at=now) for fields in new_cases.values()
+                ])
+                for case_id, number in db.session.query(Case.id, Case.case_number).filter(
+                    Case.case_number.in_(list(new_cases))
+                ).all():
+                    existing[number] = SimpleNamespace(id=case_id, **new_cases[number])
+
+            # Calendar events for next hearing dates first, so hearings can link to them
+            with_event = [(number, fields) for number, fields in hearings if fields['next_hearing_date']]
+            event_rows = [hearing_event_row(existing[number], self.user_id, fields['next_hearing_date'],
+                                            fields['action_to_be_taken'], now) for number, fields in with_event]
+            event_ids = bulk_insert(CalendarEvent, event_rows)
+
+            linked = iter(event_ids)
+            hearing_rows = [dict(fields, case_id=existing[number].id, user_id=self.user_id,
+                                 calendar_event_id=next(linked) if fields['next_hearing_date'] else None,
+                                 created_at=now, updated_at=now)
+                            for number, fields in hearings]
+            hearing_ids = bulk_insert(HearingUpdate, hearing_rows)
+
+            self._sync_side_tables(new_cases, existing, hearing_rows, hearing_ids, event_ids)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            # Rows already rejected above keep just their own error
+            for row_number in accepted:
+                self.error(row_number, f'Chunk failed: {str(e)}')
+            return
+
+        self.cases_imported += len(new_cases)
+        self.hearings_imported += len(hearing_rows)
+
+    def _sync_side_tables(self, new_cases, existing, hearing_rows, hearing_ids, event_ids):
+        """Bulk INSERTs bypass the ORM listeners, so update counters, sync numbers and search here"""
+        deltas = defaultdict(int)
+        deltas[(self.user_id, 'cases')] += len(new_cases)
+        for fields in new_cases.values():
+            deltas[(self.user_id, status_counter(fields['status']))] += 1
+        deltas[(self.user_id, 'hearing_updates')] += len(hearing_rows)
+        deltas[(self.user_id, 'events')] += len(event_ids)
+        deltas[(self.user_id, 'events:open')] += len(event_ids)
+        deltas[(self.user_id, version_counter('cases'))] += 1 if new_cases else 0
+        deltas[(self.user_id, version_counter('hearing_updates'))] += 1 if hearing_rows else 0
+        deltas[(self.user_id, version_counter('events'))] += 1 if event_ids else 0
+        apply_counter_deltas(db.session.connection(), deltas)
+        # After the version:events bump, which supplies the sync number
+        record_changes(db.session.connection(), [(self.user_id, event_id) for event_id in event_ids])
+
+        index_documents('case', [SimpleNamespace(id=existing[number].id, **fields)
+                                 for number, fields in new_cases.items()])
+        index_documents('hearing', [SimpleNamespace(id=hearing_id, **row)
+                                    for hearing_id, row in zip(hearing_ids, hearing_rows)])
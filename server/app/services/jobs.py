@@ -0,0 +1,205 @@
+import logging
+import os
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event
+from app.extensions import db
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+# kind -> (handler(payload), on_failure(payload, error) or None)
+_handlers = {}
+
+# Set after a commit that enqueued work, so an in-process worker starts at once
+_wakeup = threading.Event()
+_worker_lock = threading.Lock()
+_worker_thread = None
+
+
+def register_job_handler(kind, handler, on_failure=None):
+    """Run handler(payload) for jobs of this kind.
+
+    Handlers run inside an app context and must be idempotent: a job can
+    run again after a crash between the handler's writes and its commit.
+    on_failure(payload, error) is called once the job has used up its
+    attempts.
+    """
+    _handlers[kind] = (handler, on_failure)
+
+
+def enqueue(kind, payload, delay=0, max_attempts=None):
+    """Add a job to the current transaction; it becomes visible on commit"""
+    job = Job(kind=kind, payload=payload, status='queued', attempts=0,
+              max_attempts=max_attempts or current_app.config['JOB_MAX_ATTEMPTS'],
+              run_at=datetime.utcnow() + timedelta(seconds=delay))
+    db.session.add(job)
+    db.session.info['jobs_enqueued'] = True
+    return job
+
+
+def retry_delay(attempts):
+    """Exponential backoff: JOB_RETRY_DELAY, then twice that, ... capped at an hour"""
+    return min(current_app.config['JOB_RETRY_DELAY'] * 2 ** (attempts - 1), 3600)
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+
+
+def claim_next(worker):
+    """Mark the next due job as running for this worker and commit; None if idle.
+
+    MySQL skips rows other workers hold locked; everywhere else the
+    conditional UPDATE decides which worker wins a job.
+    """
+    now = datetime.utcnow()
+    job_id = db.session.execute(
+        db.select(Job.id).where(Job.status == 'queued', Job.run_at <= now)
+        .order_by(Job.run_at, Job.id).limit(1).with_for_update(skip_locked=True)
+    ).scalar()
+    if job_id is None:
+        db.session.rollback()
+        return None
+
+    table = Job.__table__
+    claimed = db.session.execute(
+        table.update().where(table.c.id == job_id, table.c.status == 'queued')
+        .values(status='running', locked_by=worker, locked_at=now, attempts=table.c.attempts + 1)
+    ).rowcount
+    db.session.commit()
+    return db.session.get(Job, job_id) if claimed else claim_next(worker)
+
+
+def _record_failure(job_id, error):
+    db.session.rollback()
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return
+    job.last_error = error
+    job.locked_by = job.locked_at = None
+    if job.attempts < job.max_attempts:
+        job.status = 'queued'
+        job.run_at = datetime.utcnow() + timedelta(seconds=retry_delay(job.attempts))
+        db.session.commit()
+        return
+
+    job.status = 'failed'
+    on_failure = _handlers.get(job.kind, (None, None))[1]
+    if on_failure:
+        try:
+            on_failure(job.payload, error)
+        except Exception:
+            logger.exception('on_failure hook of job %s (%s) raised', job.id, job.kind)
+    db.session.commit()
+    logger.error('Job %s (%s) failed after %s attempts: %s', job.id, job.kind, job.attempts,
+                 error.strip().splitlines()[-1] if error.strip() else error)
+
+
+def run_next(worker=None):
+    """Claim and run one job; returns it, or None if nothing was due"""
+    job = claim_next(worker or worker_name())
+    if job is None:
+        return None
+
+    job_id, kind, payload = job.id, job.kind, job.payload
+    handler = _handlers.get(kind, (None, None))[0]
+    try:
+        if handler is None:
+            raise LookupError(f'No handler registered for job kind {kind!r}')
+        handler(payload)
+        db.session.execute(Job.__table__.delete().where(Job.__table__.c.id == job_id))
+        db.session.commit()
+    except Exception:
+        _record_failure(job_id, traceback.format_exc())
+    return job
+
+
+def requeue_stale():
+    """Hand back jobs whose worker died mid-run (running for longer than JOB_TIMEOUT)"""
+    table = Job.__table__
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['JOB_TIMEOUT'])
+    stale = (table.c.status == 'running') & (table.c.locked_at < cutoff)
+    released = db.session.execute(
+        table.update().where(stale).values(
+            status=db.case((table.c.attempts < table.c.max_attempts, 'queued'), else_='failed'),
+            locked_by=None, locked_at=None, last_error='Worker stopped before the job finished'
+        )
+    ).rowcount
+    db.session.commit()
+    return released
+
+
+def work(app, stop=None, poll_interval=None, once=False):
+    """Run jobs until `stop` is set (or, with once, until none are due)"""
+    stop = stop or threading.Event()
+    poll_interval = poll_interval or app.config['JOB_POLL_INTERVAL']
+    worker = worker_name()
+    with app.app_context():
+        requeue_stale()
+    idle_since_sweep = 0.0
+    while not stop.is_set():
+        try:
+            with app.app_context():
+                job = run_next(worker)
+                if job is None and idle_since_sweep >= app.config['JOB_TIMEOUT']:
+                    requeue_stale()
+                    idle_since_sweep = 0.0
+        except Exception:
+            # Database unavailable and the like; keep the worker alive
+            logger.exception('Job worker iteration failed')
+            job = None
+        if job is not None:
+            continue
+        if once:
+            return
+        _wakeup.wait(poll_interval)
+        _wakeup.clear()
+        idle_since_sweep += poll_interval
+
+
+def _start_worker_thread(app):
+    global _worker_thread
+    with _worker_lock:
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _worker_thread = threading.Thread(target=work, args=(app,), name='job-worker', daemon=True)
+            _worker_thread.start()
+
+
+def _after_commit(session):
+    if session.info.pop('jobs_enqueued', False):
+        _wakeup.set()
+
+
+def _after_rollback(session):
+    session.info.pop('jobs_enqueued', None)
+
+
+def register_job_listeners():
+    """Wake this process's worker as soon as a commit enqueues work"""
+    for name, listener in (('after_commit', _after_commit), ('after_rollback', _after_rollback)):
+        if not event.contains(db.session, name, listener):
+            event.listen(db.session, name, listener)
+
+
+def configure_jobs(app):
+    """Register the job handlers and, with JOB_RUNNER=thread, a worker per web process.
+
+    The in-process worker starts with the first request, so CLI commands
+    (migrations, imports) never run jobs. JOB_RUNNER=worker leaves the
+    queue to `flask run-jobs` processes.
+    """
+    # Importing the modules registers their handlers
+    from app.services import previews, reminders  # noqa: F401
+
+    register_job_listeners()
+    if app.config['JOB_RUNNER'] != 'thread':
+        return
+
+    @app.before_request
+    def ensure_job_worker():
+        if _worker_thread is None or not _worker_thread.is_alive():
+            _start_worker_thread(app)
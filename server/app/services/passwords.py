@@ -0,0 +1,140 @@
+import atexit
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt as _bcrypt
+
+# bcrypt only looks at the first 72 bytes; older versions truncated silently
+# and bcrypt >= 5 raises instead, so truncate here to keep existing hashes valid
+MAX_PASSWORD_BYTES = 72
+COST_RE = re.compile(r'^\$2[abxy]?\$(\d\d)\$')
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the hashing pool already has its maximum of queued jobs"""
+
+
+def _encode(password):
+    return password.encode('utf-8')[:MAX_PASSWORD_BYTES]
+
+
+# Run inside the pool workers: keep them free of app and database imports
+
+def _hash(password, rounds):
+    return _bcrypt.hashpw(_encode(password), _bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(password_hash, password):
+    try:
+        return _bcrypt.checkpw(_encode(password), password_hash.encode('utf-8'))
+    except ValueError:
+        # Malformed stored hash
+        return False
+
+
+class PasswordHasher:
+    """Hash and verify passwords on a small dedicated process pool.
+
+    bcrypt is deliberately slow, so running it on request threads lets a
+    login spike starve every other endpoint. Jobs go to at most `workers`
+    processes; once `max_pending` jobs are queued or running, new calls
+    fail fast with PasswordHasherBusy instead of piling up. A job that
+    outlives `timeout` keeps its place until it ends, and a pool broken by
+    a dead worker is replaced, both with PasswordHasherBusy. workers=0
+    hashes inline on the calling thread.
+
+    Workers are started with 'spawn' (the only method on Windows, and safe
+    in threaded servers), so scripts that hash passwords need the usual
+    `if __name__ == '__main__':` guard.
+    """
+
+    def __init__(self, rounds=12, workers=2, max_pending=64, timeout=10):
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.configure(rounds, workers, max_pending, timeout)
+
+    def configure(self, rounds, workers, max_pending, timeout):
+        self.shutdown()
+        self.rounds = rounds
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def _executor(self):
+        # Pools do not survive fork (e.g. gunicorn preload); start one per process
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+                self._pid = os.getpid()
+            return self._pool
+
+    def _discard(self, pool):
+        # A worker died (e.g. the OOM killer) and the pool refuses new jobs; the next call starts a fresh one
+        with self._lock:
+            if self._pool is pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def _run(self, func, *args):
+        if not self.workers:
+            return func(*args)
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordHasherBusy('Too many password operations in progress')
+        pool = self._executor()
+        try:
+            future = pool.submit(func, *args)
+        except BrokenProcessPool:
+            slots.release()
+            self._discard(pool)
+            raise PasswordHasherBusy('Password hashing pool restarted')
+        except BaseException:
+            slots.release()
+            raise
+        # The slot is held until the job finishes, not just while someone
+        # waits for it: a timed-out job still occupies a worker
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise PasswordHasherBusy('Password hashing timed out')
+        except BrokenProcessPool:
+            self._discard(pool)
+            raise PasswordHasherBusy('Password hashing pool restarted')
+
+    def hash(self, password):
+        return self._run(_hash, password, self.rounds)
+
+    def check(self, password_hash, password):
+        if not password_hash:
+            return False
+        return self._run(_check, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when the stored hash was made with a different cost factor"""
+        match = COST_RE.match(password_hash or '')
+        return match is None or int(match.group(1)) != self.rounds
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid():
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+passwords = PasswordHasher()
+atexit.register(passwords.shutdown)
+
+
+def configure_password_hashing(app):
+    passwords.configure(
+        rounds=app.config['BCRYPT_LOG_ROUNDS'],
+        workers=app.config['PASSWORD_HASH_WORKERS'],
+        max_pending=app.config['PASSWORD_HASH_MAX_PENDING'],
+        timeout=app.config['PASSWORD_HASH_TIMEOUT']
+    )
@@ -0,0 +1,180 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import zipfile
+from xml.etree import ElementTree
+from flask import current_app
+from app.extensions import db
+from app.models.document import Document
+from app.services.blobs import temp_dir, thumbnail_key
+from app.services.downloads import document_key
+from app.services.storage import get_storage
+from app.services.jobs import enqueue, register_job_handler
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - optional dependency
+    Image = None
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - optional dependency
+    PdfReader = None
+
+PROCESS_JOB = 'document.process'
+IMAGE_TYPES = {'jpg', 'jpeg', 'png'}
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+TOOL_TIMEOUT = 120
+
+
+def enqueue_processing(document):
+    """Queue thumbnail and text extraction for a flushed document (caller commits)"""
+    document.processing_status = 'pending'
+    return enqueue(PROCESS_JOB, {'document_id': document.id})
+
+
+# --- Text extraction --------------------------------------------------------
+
+def _read_text_file(path, limit):
+    with open(path, 'rb') as source:
+        # Up to 4 bytes per character in UTF-8
+        return source.read(limit * 4).decode('utf-8', errors='replace')
+
+
+def _read_docx(path, limit):
+    paragraphs, length = [], 0
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as xml:
+        for _, element in ElementTree.iterparse(xml):
+            if element.tag != f'{WORD_NAMESPACE}p':
+                continue
+            text = ''.join(node.text or '' for node in element.iter(f'{WORD_NAMESPACE}t'))
+            element.clear()
+            if text:
+                paragraphs.append(text)
+                length += len(text) + 1
+                if length >= limit:
+                    break
+    return '\n'.join(paragraphs)
+
+
+def _read_pdf(path, limit):
+    if PdfReader is not None:
+        pages, length = [], 0
+        for page in PdfReader(path).pages:
+            text = page.extract_text() or ''
+            pages.append(text)
+            length += len(text)
+            if length >= limit:
+                break
+        return '\n'.join(pages)
+    if shutil.which('pdftotext'):
+        result = subprocess.run(['pdftotext', '-q', '-enc', 'UTF-8', path, '-'],
+                                capture_output=True, timeout=TOOL_TIMEOUT, check=True)
+        return result.stdout.decode('utf-8', errors='replace')
+    return None
+
+
+def extract_text(path, file_type):
+    """Plain text of a stored file, capped at DOCUMENT_TEXT_MAX_CHARS; None if unsupported"""
+    limit = current_app.config['DOCUMENT_TEXT_MAX_CHARS']
+    readers = {'txt': _read_text_file, 'docx': _read_docx, 'pdf': _read_pdf}
+    reader = readers.get(file_type)
+    text = reader(path, limit) if reader else None
+    if text is None:
+        return None
+    # Collapse the whitespace runs PDF extraction produces; NULs break MySQL TEXT
+    text = '\n'.join(' '.join(line.split()) for line in text.replace('\x00', '').splitlines())
+    return '\n'.join(line for line in text.split('\n') if line)[:limit] or None
+
+
+# --- Thumbnails -------------------------------------------------------------
+
+def _image_thumbnail(path, target, size):
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((size, size))
+        image.convert('RGB').save(target, 'JPEG', quality=80, optimize=True)
+
+
+def _pdf_thumbnail(path, target, size):
+    # pdftoppm appends the extension itself
+    subprocess.run(['pdftoppm', '-q', '-f', '1', '-l', '1', '-singlefile', '-jpeg',
+                    '-scale-to', str(size), path, target[:-len('.jpg')]],
+                   capture_output=True, timeout=TOOL_TIMEOUT, check=True)
+
+
+def make_thumbnail(path, file_type, sha256):
+    """Store the blob's thumbnail if none exists yet; True if one is available"""
+    if file_type in IMAGE_TYPES and Image is not None:
+        render = _image_thumbnail
+    elif file_type == 'pdf' and shutil.which('pdftoppm'):
+        render = _pdf_thumbnail
+    else:
+        return False
+    storage = get_storage()
+    if storage.exists(thumbnail_key(sha256)):
+        return True
+
+    handle, temp_path = tempfile.mkstemp(dir=temp_dir(), suffix='.jpg')
+    os.close(handle)
+    try:
+        render(path, temp_path, current_app.config['THUMBNAIL_SIZE'])
+        storage.save(thumbnail_key(sha256), temp_path, 'image/jpeg')
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return True
+
+
+# --- Job handler ------------------------------------------------------------
+
+def process_document(payload):
+    """Extract text and render a thumbnail for one document.
+
+    Anything unsupported degrades to "nothing extracted" rather than an
+    error: text comes from .txt, .docx (stdlib XML) and .pdf (pypdf or
+    poppler's pdftotext), thumbnails from images (Pillow) and the first
+    PDF page (pdftoppm). Scans and legacy .doc files get no text; there
+    is no OCR. Errors raised here are retried by the job queue.
+    """
+    document = db.session.get(Document, payload['document_id'])
+    if document is None:
+        return  # deleted before the job ran
+
+    # Identical content was processed before: reuse its results
+    twin = None
+    if document.sha256:
+        twin = Document.query.options(db.undefer(Document.extracted_text)).filter(
+            Document.sha256 == document.sha256,
+            Document.id != document.id,
+            Document.processing_status == 'done'
+        ).first()
+    if twin is not None:
+        document.extracted_text = twin.extracted_text
+        document.has_thumbnail = twin.has_thumbnail
+        document.processing_status = 'done'
+        return
+
+    key = document_key(document)
+    try:
+        if key is None:
+            raise FileNotFoundError(document.file_url)
+        # Remote drivers download a temporary copy
+        with get_storage().local_file(key) as path:
+            document.extracted_text = extract_text(path, document.file_type)
+            if document.sha256:
+                document.has_thumbnail = make_thumbnail(path, document.file_type, document.sha256)
+    except FileNotFoundError:
+        document.processing_status = 'failed'
+        return
+    document.processing_status = 'done'
+
+
+def mark_processing_failed(payload, error):
+    document = db.session.get(Document, payload['document_id'])
+    if document is not None:
+        document.processing_status = 'failed'
+
+
+register_job_handler(PROCESS_JOB, process_document, on_failure=mark_processing_failed)
@@ -0,0 +1,51 @@
+import calendar
+from datetime import timedelta
+
+RECURRENCE_RULES = ('daily', 'weekly', 'monthly', 'yearly')
+
+
+def _add_months(value, months):
+    """Shift a datetime by whole months, clamping to the end of short months"""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def expand_occurrences(dtstart, rule, interval, until, window_start, window_end):
+    """Yield the datetimes of a recurring event that fall in [window_start, window_end).
+
+    The first occurrence inside the window is computed arithmetically, so the
+    cost depends on the number of occurrences in the window, not on how long
+    the series has been running. Every occurrence in the window is yielded,
+    so callers bound the window (or stop early) themselves.
+    """
+    if rule not in RECURRENCE_RULES:
+        return
+    interval = max(1, interval or 1)
+    end = min(window_end, until + timedelta(microseconds=1)) if until else window_end
+
+    if rule in ('daily', 'weekly'):
+        step = timedelta(days=interval * (7 if rule == 'weekly' else 1))
+        skip = 0
+        if window_start > dtstart:
+            skip = -(-(window_start - dtstart) // step)  # ceiling division
+        current = dtstart + step * skip
+        while current < end:
+            yield current
+            current += step
+        return
+
+    months = interval * (12 if rule == 'yearly' else 1)
+    k = 0
+    if window_start > dtstart:
+        elapsed = (window_start.year - dtstart.year) * 12 + window_start.month - dtstart.month
+        k = max(0, elapsed // months - 1)
+    while True:
+        current = _add_months(dtstart, k * months)
+        if current >= end:
+            break
+        if current >= window_start:
+            yield current
+        k += 1
@@ -0,0 +1,135 @@
+import hashlib
+import hmac
+import json
+import logging
+import smtplib
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from email.message import EmailMessage
+
+logger = logging.getLogger(__name__)
+
+# Everything a sink needs to word a reminder; event_date is the occurrence,
+# as wall-clock time in `timezone` (EVENT_TIMEZONE)
+Reminder = namedtuple('Reminder', [
+    'delivery_id', 'event_id', 'user_id', 'email', 'full_name', 'title', 'description', 'event_type',
+    'event_date', 'location', 'minutes_before', 'timezone'
+])
+
+
+class SinkError(RuntimeError):
+    """Raised for a misconfigured sink"""
+
+
+def reminder_subject(reminder):
+    return f'Reminder: {reminder.title} at {reminder.event_date:%d %b %Y %H:%M}'
+
+
+def reminder_text(reminder):
+    lines = [f'{reminder.title}', f'When: {reminder.event_date:%A, %d %B %Y at %H:%M} ({reminder.timezone})']
+    if reminder.location:
+        lines.append(f'Where: {reminder.location}')
+    if reminder.description:
+        lines += ['', reminder.description]
+    return '\n'.join(lines) + '\n'
+
+
+class ReminderSink(ABC):
+    """Delivers reminders somewhere. send() raises to have the job queue retry it"""
+    name = None
+
+    def __init__(self, config):
+        self.config = config
+
+    @abstractmethod
+    def send(self, reminder):
+        """Deliver one Reminder"""
+
+
+class LogSink(ReminderSink):
+    """Writes reminders to the application log; useful in development"""
+    name = 'log'
+
+    def send(self, reminder):
+        logger.info('Reminder for user %s (%s): %s', reminder.user_id, reminder.email, reminder_subject(reminder))
+
+
+class EmailSink(ReminderSink):
+    """Mails the event owner through MAIL_SERVER (any SMTP server, or a local stand-in such as Mailpit)"""
+    name = 'email'
+
+    def __init__(self, config):
+        super().__init__(config)
+        if not config.get('MAIL_SERVER'):
+            raise SinkError('The email reminder sink needs MAIL_SERVER')
+
+    def send(self, reminder):
+        if not reminder.email:
+            return
+        config = self.config
+        message = EmailMessage()
+        message['Subject'] = reminder_subject(reminder)
+        message['From'] = config['MAIL_DEFAULT_SENDER'] or config['MAIL_USERNAME'] or 'reminders@localhost'
+        message['To'] = reminder.email
+        message.set_content(reminder_text(reminder))
+        with smtplib.SMTP(config['MAIL_SERVER'], config['MAIL_PORT'], timeout=config['REMINDER_SEND_TIMEOUT']) as smtp:
+            if config['MAIL_USE_TLS']:
+                smtp.starttls()
+            if config['MAIL_USERNAME']:
+                smtp.login(config['MAIL_USERNAME'], config['MAIL_PASSWORD'])
+            smtp.send_message(message)
+
+
+class WebhookSink(ReminderSink):
+    """POSTs the reminder as JSON to REMINDER_WEBHOOK_URL.
+
+    With REMINDER_WEBHOOK_SECRET set, the body is signed in
+    X-Reminder-Signature: sha256=<hex HMAC>. The delivery id is sent in
+    X-Reminder-Id, so a receiver can drop a repeat.
+    """
+    name = 'webhook'
+
+    def __init__(self, config):
+        super().__init__(config)
+        if not config.get('REMINDER_WEBHOOK_URL'):
+            raise SinkError('The webhook reminder sink needs REMINDER_WEBHOOK_URL')
+
+    def send(self, reminder):
+        body = json.dumps(dict(reminder._asdict(), event_date=reminder.event_date.isoformat(),
+                               subject=reminder_subject(reminder))).encode('utf-8')
+        request = urllib.request.Request(self.config['REMINDER_WEBHOOK_URL'], data=body, method='POST', headers={
+            'Content-Type': 'application/json',
+            'X-Reminder-Id': str(reminder.delivery_id),
+        })
+        secret = self.config['REMINDER_WEBHOOK_SECRET']
+        if secret:
+            digest = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+            request.add_header('X-Reminder-Signature', f'sha256={digest}')
+        # Non-2xx answers raise HTTPError
+        with urllib.request.urlopen(request, timeout=self.config['REMINDER_SEND_TIMEOUT']):
+            pass
+
+
+_sinks = {sink.name: sink for sink in (LogSink, EmailSink, WebhookSink)}
+
+
+def register_sink(sink_class):
+    """Make a ReminderSink subclass available to REMINDER_SINKS under its name"""
+    _sinks[sink_class.name] = sink_class
+    return sink_class
+
+
+def configured_sinks(config):
+    """Names listed in REMINDER_SINKS, checked against the registered sinks"""
+    names = [name.strip() for name in config['REMINDER_SINKS'].split(',') if name.strip()]
+    unknown = [name for name in names if name not in _sinks]
+    if unknown:
+        raise SinkError(f"Unknown reminder sink {unknown[0]!r}; use {', '.join(sorted(_sinks))}")
+    return names
+
+
+def create_sink(name, config):
+    if name not in _sinks:
+        raise SinkError(f'Unknown reminder sink {name!r}')
+    return _sinks[name](config)
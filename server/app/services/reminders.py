@@ -0,0 +1,308 @@
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from flask import current_app
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import attributes
+from app.extensions import db
+from app.models.calendar_event import CalendarEvent
+from app.models.reminder_delivery import ReminderDelivery
+from app.services.jobs import enqueue, register_job_handler
+from app.services.recurrence import expand_occurrences
+from app.services.reminder_sinks import Reminder, configured_sinks, create_sink
+from app.services.user_cache import load_user
+
+logger = logging.getLogger(__name__)
+
+DELIVER_JOB = 'reminder.deliver'
+# Changing any of these moves the next reminder
+SCHEDULE_FIELDS = ('event_date', 'reminder_time', 'is_completed', 'recurrence', 'recurrence_interval',
+                   'recurrence_until')
+
+
+def _to_utc(value):
+    """event_date values are naive wall-clock times in EVENT_TIMEZONE; remind_at is naive UTC"""
+    zone = ZoneInfo(current_app.config['EVENT_TIMEZONE'])
+    return value.replace(tzinfo=zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _from_utc(value):
+    zone = ZoneInfo(current_app.config['EVENT_TIMEZONE'])
+    return value.replace(tzinfo=timezone.utc).astimezone(zone).replace(tzinfo=None)
+
+
+def next_occurrence(event, after):
+    """The event's first occurrence (in event time) later than `after`, or None"""
+    if not event.recurrence:
+        return event.event_date if event.event_date > after else None
+    return next(expand_occurrences(event.event_date, event.recurrence, event.recurrence_interval,
+                                   event.recurrence_until, after + timedelta(microseconds=1), datetime.max), None)
+
+
+def next_remind_at(event, after):
+    """UTC time the reminder for the first occurrence after `after` (event time) is due, or None.
+
+    A reminder already in the past (an event added 10 minutes before it
+    starts with a 30 minute reminder) is due at once.
+    """
+    if event.reminder_time is None or event.is_completed:
+        return None
+    occurrence = next_occurrence(event, after)
+    if occurrence is None:
+        return None
+    return _to_utc(occurrence - timedelta(minutes=event.reminder_time))
+
+
+def _event_now():
+    return _from_utc(datetime.utcnow())
+
+
+def _before_flush(session, flush_context, instances):
+    now = None
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, CalendarEvent) or obj in session.deleted:
+            continue
+        if obj in session.new or any(attributes.get_history(obj, field).has_changes() for field in SCHEDULE_FIELDS):
+            now = now or _event_now()
+            obj.remind_at = next_remind_at(obj, now)
+
+
+def register_reminder_listeners():
+    """Recompute remind_at whenever an event's schedule or reminder changes through the ORM"""
+    if not sa_event.contains(db.session, 'before_flush', _before_flush):
+        sa_event.listen(db.session, 'before_flush', _before_flush)
+
+
+def rebuild_reminders():
+    """Recompute remind_at for every event with a reminder; returns the number scheduled"""
+    now = _event_now()
+    table = CalendarEvent.__table__
+    scheduled = 0
+    events = CalendarEvent.query.filter(CalendarEvent.reminder_time.isnot(None)).order_by(CalendarEvent.id)
+    for event in events.yield_per(1000):
+        remind_at = next_remind_at(event, now)
+        scheduled += remind_at is not None
+        # Core UPDATE: recomputing is not an edit, so updated_at and ETags stay put
+        db.session.execute(table.update().where(table.c.id == event.id).values(
+            remind_at=remind_at, updated_at=table.c.updated_at))
+    db.session.execute(table.update().where(table.c.reminder_time.is_(None), table.c.remind_at.isnot(None))
+                       .values(remind_at=None, updated_at=table.c.updated_at))
+    db.session.commit()
+    return scheduled
+
+
+def fire_reminder(event_id, remind_at, sinks):
+    """Turn one due reminder into deliveries and move the event's remind_at on.
+
+    The event row is locked and must still have this remind_at, so an
+    edit or another scheduler that got there first makes this a no-op.
+    Deliveries and their jobs are written in the same transaction as the
+    new remind_at. Returns the new remind_at, or None.
+    """
+    event = db.session.execute(
+        db.select(CalendarEvent).where(CalendarEvent.id == event_id, CalendarEvent.remind_at == remind_at)
+        .with_for_update()
+    ).scalar()
+    if event is None:
+        db.session.rollback()
+        return None
+
+    # remind_at was derived from this occurrence, so it can be recovered exactly
+    occurrence = _from_utc(remind_at) + timedelta(minutes=event.reminder_time)
+    late = datetime.utcnow() - _to_utc(occurrence)
+    if late > timedelta(seconds=current_app.config['REMINDER_MAX_DELAY']):
+        logger.info('Skipping reminder for event %s at %s: the event started %s ago', event.id, occurrence, late)
+    else:
+        sent = {sink for sink, in db.session.query(ReminderDelivery.sink).filter_by(
+            event_id=event.id, occurrence_at=occurrence)}
+        deliveries = [ReminderDelivery(event_id=event.id, user_id=event.user_id, occurrence_at=occurrence,
+                                       sink=sink, status='pending', attempts=0)
+                      for sink in sinks if sink not in sent]
+        db.session.add_all(deliveries)
+        db.session.flush()
+        for delivery in deliveries:
+            enqueue(DELIVER_JOB, {'delivery_id': delivery.id})
+
+    next_at = next_remind_at(event, occurrence)
+    table = CalendarEvent.__table__
+    db.session.execute(table.update().where(table.c.id == event.id).values(
+        remind_at=next_at, updated_at=table.c.updated_at))
+    db.session.commit()
+    return next_at
+
+
+def deliver_reminder(payload):
+    """Send one recorded reminder through its sink (job handler).
+
+    The delivery is marked `sending` and committed before the sink is
+    called. If a worker dies mid-send, the retried job finds `sending` and
+    gives up as `interrupted` instead of risking a duplicate. A sink that
+    raises puts it back to `pending` for the job queue's retry.
+    """
+    delivery = db.session.get(ReminderDelivery, payload['delivery_id'])
+    if delivery is None or delivery.status in ('sent', 'interrupted', 'failed'):
+        return
+    if delivery.status == 'sending':
+        delivery.status = 'interrupted'
+        return
+
+    event = db.session.get(CalendarEvent, delivery.event_id)
+    if event is None:
+        return
+    user = load_user(delivery.user_id)
+    reminder = Reminder(
+        delivery_id=delivery.id, event_id=event.id, user_id=delivery.user_id,
+        email=user.email if user else None, full_name=user.full_name if user else None,
+        title=event.title, description=event.description, event_type=event.event_type,
+        event_date=delivery.occurrence_at, location=event.location, minutes_before=event.reminder_time,
+        timezone=current_app.config['EVENT_TIMEZONE']
+    )
+    sink = create_sink(delivery.sink, current_app.config)
+
+    delivery.status = 'sending'
+    delivery.attempts += 1
+    db.session.commit()
+    try:
+        sink.send(reminder)
+    except Exception as e:
+        delivery.status = 'pending'
+        delivery.last_error = str(e)
+        db.session.commit()
+        raise
+    delivery.status = 'sent'
+    delivery.sent_at = datetime.utcnow()
+
+
+def mark_delivery_failed(payload, error):
+    delivery = db.session.get(ReminderDelivery, payload['delivery_id'])
+    if delivery is not None and delivery.status == 'pending':
+        delivery.status = 'failed'
+
+
+register_job_handler(DELIVER_JOB, deliver_reminder, on_failure=mark_delivery_failed)
+
+
+class ReminderScheduler:
+    """Min-heap of upcoming reminders for the `flask run-reminders` process.
+
+    Only reminders due within `lookahead` are held. The window is read
+    from the remind_at index and extended as time passes. Between
+    extensions, events edited since the last poll come from the updated_at
+    index, so picking up changes costs a scan of recent edits, not a
+    reload. Heap entries are never updated in place: fire_reminder
+    re-checks each against its row, so entries for edited or deleted
+    events fall away when they come up.
+    """
+
+    def __init__(self, lookahead, poll_interval, change_margin, batch_size=1000):
+        self.lookahead = timedelta(seconds=lookahead)
+        self.poll_interval = poll_interval
+        self.change_margin = timedelta(seconds=change_margin)
+        self.batch_size = batch_size
+        self.heap = []
+        self.queued = set()
+        # Every remind_at up to here is on the heap or already handled
+        self.loaded_until = None
+        self.changed_since = None
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, remind_at, event_id):
+        entry = (remind_at, event_id)
+        if remind_at <= self.loaded_until and entry not in self.queued:
+            heapq.heappush(self.heap, entry)
+            self.queued.add(entry)
+
+    def _load(self, query):
+        rows = db.session.execute(query.execution_options(yield_per=self.batch_size))
+        for event_id, remind_at in rows:
+            self.push(remind_at, event_id)
+        db.session.rollback()
+
+    def extend_window(self, now):
+        """Load reminders that became due within the lookahead since the last call"""
+        until = now + self.lookahead
+        query = db.select(CalendarEvent.id, CalendarEvent.remind_at).where(
+            CalendarEvent.remind_at.isnot(None), CalendarEvent.remind_at <= until
+        ).order_by(CalendarEvent.remind_at)
+        if self.loaded_until is not None:
+            query = query.where(CalendarEvent.remind_at > self.loaded_until)
+        if self.changed_since is None:
+            self.changed_since = now
+        self.loaded_until = until
+        self._load(query)
+
+    def poll_changes(self, now):
+        """Queue reminders of events edited since the last poll.
+
+        Reads from changed_since minus change_margin, so a transaction
+        that committed late, or a web host whose clock runs behind, is
+        still seen; entries read twice are ignored.
+        """
+        since = self.changed_since - self.change_margin
+        self.changed_since = now
+        self._load(db.select(CalendarEvent.id, CalendarEvent.remind_at).where(
+            CalendarEvent.updated_at >= since,
+            CalendarEvent.remind_at.isnot(None),
+            CalendarEvent.remind_at <= self.loaded_until
+        ))
+
+    def fire_due(self, now, sinks):
+        """Fire every reminder due by now; returns how many produced deliveries or moved on"""
+        fired = 0
+        while self.heap and self.heap[0][0] <= now:
+            entry = heapq.heappop(self.heap)
+            self.queued.discard(entry)
+            remind_at, event_id = entry
+            try:
+                next_at = fire_reminder(event_id, remind_at, sinks)
+            except Exception:
+                db.session.rollback()
+                logger.exception('Reminder for event %s at %s failed; retrying on the next poll', event_id, remind_at)
+                # Pushed back as-is; the window reload does not re-read it
+                heapq.heappush(self.heap, entry)
+                self.queued.add(entry)
+                break
+            if next_at is not None:
+                self.push(next_at, event_id)
+            fired += 1
+        return fired
+
+    def seconds_until_next(self, now):
+        if not self.heap:
+            return self.poll_interval
+        return max(0.0, min(self.poll_interval, (self.heap[0][0] - now).total_seconds()))
+
+
+def run_scheduler(app, stop=None, once=False):
+    """Fire reminders as they come due until `stop` is set (or, with once, after one pass)"""
+    stop = stop or threading.Event()
+    config = app.config
+    sinks = configured_sinks(config)
+    scheduler = ReminderScheduler(config['REMINDER_LOOKAHEAD'], config['REMINDER_POLL_INTERVAL'],
+                                  config['REMINDER_CHANGE_MARGIN'])
+    next_extend = 0.0
+    while not stop.is_set():
+        try:
+            with app.app_context():
+                now = datetime.utcnow()
+                if time.monotonic() >= next_extend:
+                    scheduler.extend_window(now)
+                    # Re-extend well before the window runs out
+                    next_extend = time.monotonic() + scheduler.lookahead.total_seconds() / 2
+                else:
+                    scheduler.poll_changes(now)
+                scheduler.fire_due(datetime.utcnow(), sinks)
+                wait = scheduler.seconds_until_next(datetime.utcnow())
+        except Exception:
+            # Database unavailable and the like; keep the scheduler alive
+            logger.exception('Reminder scheduler iteration failed')
+            wait = config['REMINDER_POLL_INTERVAL']
+        if once:
+            return scheduler
+        stop.wait(wait)
+    return scheduler
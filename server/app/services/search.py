@@ -0,0 +1,292 @@
+import math
+import re
+from collections import Counter
+from html import escape
+from flask import current_app, has_app_context
+from sqlalchemy import and_, event, func, literal, text
+from sqlalchemy.orm import attributes, undefer
+from app.extensions import db
+from app.models.case import Case
+from app.models.client import Client
+from app.models.document import Document
+from app.models.hearing_update import HearingUpdate
+from app.models.search_posting import SearchPosting
+from app.services.counters import get_counters
+
+# Searchable documents: type -> (model, text fields)
+SEARCH_DOCUMENTS = {
+    'case': (Case, ('case_number', 'title', 'client_name', 'opposite_party', 'otherside_counsel',
+                    'court_name', 'description', 'remarks', 'notes')),
+    'client': (Client, ('name', 'email', 'phone', 'address', 'notes')),
+    'hearing': (HearingUpdate, ('action_taken', 'court_order', 'action_to_be_taken')),
+    # extracted_text is filled in by the document.process job after upload
+    'document': (Document, ('title', 'file_name', 'description', 'extracted_text')),
+}
+MODEL_DOC_TYPES = {model: doc_type for doc_type, (model, _) in SEARCH_DOCUMENTS.items()}
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TERM_LENGTH = 64
+MAX_QUERY_TERMS = 10
+SNIPPET_RADIUS = 60
+
+
+def tokenize(value):
+    """Lowercased word tokens of a text value"""
+    if not value:
+        return []
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN_RE.findall(str(value).lower())]
+
+
+def search_backend(bind=None):
+    """'fulltext' on MySQL, otherwise the inverted index ('inverted')"""
+    backend = current_app.config.get('SEARCH_BACKEND', 'auto') if has_app_context() else 'auto'
+    if backend != 'auto':
+        return backend
+    dialect = (bind or db.engine).dialect.name
+    return 'fulltext' if dialect == 'mysql' else 'inverted'
+
+
+# --- Inverted index maintenance ---------------------------------------------
+
+def _postings_for(doc_type, obj):
+    fields = SEARCH_DOCUMENTS[doc_type][1]
+    terms = Counter()
+    for field in fields:
+        terms.update(tokenize(getattr(obj, field)))
+    return [{'user_id': obj.user_id, 'term': term, 'doc_type': doc_type, 'doc_id': obj.id, 'tf': tf}
+            for term, tf in terms.items()]
+
+
+def _text_changed(doc_type, obj):
+    return any(attributes.get_history(obj, field).has_changes() for field in SEARCH_DOCUMENTS[doc_type][1])
+
+
+def _after_flush(session, flush_context):
+    connection = session.connection()
+    if search_backend(connection) != 'inverted':
+        return
+
+    stale, fresh = [], []
+    for obj in session.new:
+        doc_type = MODEL_DOC_TYPES.get(type(obj))
+        if doc_type:
+            fresh.extend(_postings_for(doc_type, obj))
+    for obj in session.dirty:
+        doc_type = MODEL_DOC_TYPES.get(type(obj))
+        if doc_type and obj not in session.deleted and _text_changed(doc_type, obj):
+            stale.append((doc_type, obj.id))
+            fresh.extend(_postings_for(doc_type, obj))
+    for obj in session.deleted:
+        doc_type = MODEL_DOC_TYPES.get(type(obj))
+        if doc_type:
+            stale.append((doc_type, obj.id))
+
+    table = SearchPosting.__table__
+    for doc_type in {doc_type for doc_type, _ in stale}:
+        ids = [doc_id for stale_type, doc_id in stale if stale_type == doc_type]
+        connection.execute(table.delete().where(table.c.doc_type == doc_type, table.c.doc_id.in_(ids)))
+    if fresh:
+        connection.execute(table.insert(), fresh)
+
+
+def register_search_listeners():
+    """Keep search_postings in step with ORM writes when the inverted backend is active"""
+    if not event.contains(db.session, 'after_flush', _after_flush):
+        event.listen(db.session, 'after_flush', _after_flush)
+
+
+def index_documents(doc_type, objects):
+    """Replace the postings of already-flushed objects; for writers that bypass the ORM"""
+    if search_backend() != 'inverted' or not objects:
+        return
+    table = SearchPosting.__table__
+    db.session.execute(table.delete().where(
+        table.c.doc_type == doc_type, table.c.doc_id.in_([obj.id for obj in objects])
+    ))
+    rows = [row for obj in objects for row in _postings_for(doc_type, obj)]
+    if rows:
+        db.session.execute(table.insert(), rows)
+
+
+def rebuild_search_index(user_id=None, batch_size=1000):
+    """Regenerate search_postings from the source tables; returns rows written"""
+    table = SearchPosting.__table__
+    delete = table.delete()
+    if user_id is not None:
+        delete = delete.where(table.c.user_id == user_id)
+    db.session.execute(delete)
+
+    written = 0
+    for doc_type, (model, fields) in SEARCH_DOCUMENTS.items():
+        columns = [model.id, model.user_id] + [getattr(model, field) for field in fields]
+        query = db.session.query(*columns)
+        if user_id is not None:
+            query = query.filter(model.user_id == user_id)
+        batch = []
+        for row in query.yield_per(batch_size):
+            batch.extend(_postings_for(doc_type, row))
+            if len(batch) >= batch_size:
+                db.session.execute(table.insert(), batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            db.session.execute(table.insert(), batch)
+            written += len(batch)
+    db.session.commit()
+    return written
+
+
+# --- Querying ---------------------------------------------------------------
+
+# Per-user document totals for the idf; clients have no counter and are counted directly
+DOC_TYPE_COUNTERS = {'case': 'cases', 'hearing': 'hearing_updates', 'document': 'documents'}
+
+
+def _document_count(user_id, doc_types):
+    """Number of the user's searchable documents of the given types"""
+    counters = get_counters(user_id)
+    total = sum(counters.get(DOC_TYPE_COUNTERS[doc_type], 0) for doc_type in doc_types if doc_type != 'client')
+    if 'client' in doc_types:
+        total += db.session.query(func.count(Client.id)).filter(Client.user_id == user_id).scalar()
+    return total
+
+
+def _prefix_match(column, prefix):
+    """column starts with prefix, as a range the (user_id, term) primary key can serve"""
+    return and_(column >= prefix, column < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+
+def _search_inverted(user_id, terms, doc_types, offset, limit):
+    """Rank documents matching every term (as a prefix, like the FULLTEXT
+    backend's term*) by tf-idf, entirely in SQL.
+
+    Each query term becomes a subquery of (document, summed tf) over the
+    postings whose term starts with it. The rarest one drives the query and
+    the others are joined to it, so the work is bounded by the rarest
+    term's document frequency rather than by the size of the index.
+    """
+    matches = {}
+    for term in terms:
+        matches[term] = db.session.query(
+            SearchPosting.doc_type, SearchPosting.doc_id, func.sum(SearchPosting.tf).label('tf')
+        ).filter(
+            SearchPosting.user_id == user_id,
+            _prefix_match(SearchPosting.term, term),
+            SearchPosting.doc_type.in_(doc_types)
+        ).group_by(SearchPosting.doc_type, SearchPosting.doc_id).subquery()
+
+    doc_freq = {}
+    for term in terms:
+        doc_freq[term] = db.session.query(func.count()).select_from(matches[term]).scalar()
+        if not doc_freq[term]:
+            return [], 0
+
+    # Guards against drifted counters: N is never below a document frequency
+    total_docs = max(_document_count(user_id, doc_types), *doc_freq.values())
+    ordered = sorted(terms, key=lambda term: doc_freq[term])
+    driver = matches[ordered[0]]
+
+    score = sum(
+        (matches[term].c.tf * math.log(1 + total_docs / doc_freq[term]) for term in ordered),
+        start=literal(0.0)
+    ).label('score')
+    query = db.session.query(driver.c.doc_type, driver.c.doc_id, score)
+    for term in ordered[1:]:
+        other = matches[term]
+        query = query.join(other, and_(other.c.doc_type == driver.c.doc_type, other.c.doc_id == driver.c.doc_id))
+
+    total = doc_freq[ordered[0]] if len(ordered) == 1 else query.order_by(None).count()
+    rows = query.order_by(score.desc(), driver.c.doc_id.desc()).offset(offset).limit(limit).all()
+    return [(doc_type, doc_id, float(value)) for doc_type, doc_id, value in rows], total
+
+
+def _search_fulltext(user_id, terms, doc_types, offset, limit):
+    """Query each table's FULLTEXT index and merge the ranked lists"""
+    boolean_query = ' '.join(f'+{term}*' for term in terms)
+    ranked, total = [], 0
+    for doc_type in doc_types:
+        model, fields = SEARCH_DOCUMENTS[doc_type]
+        columns = ', '.join(fields)
+        match = text(f'MATCH ({columns}) AGAINST (:q IN BOOLEAN MODE)').bindparams(q=boolean_query)
+        query = db.session.query(model.id, match.label('score')).filter(model.user_id == user_id, match)
+        total += query.order_by(None).count()
+        for doc_id, value in query.order_by(text('score DESC')).limit(offset + limit).all():
+            ranked.append((doc_type, doc_id, float(value)))
+    ranked.sort(key=lambda item: (-item[2], -item[1]))
+    return ranked[offset:offset + limit], total
+
+
+def highlight(value, terms):
+    """Escape value and wrap each matching word in <mark>, trimmed to a snippet"""
+    lowered = value.lower()
+    first = min((index for index in (lowered.find(term) for term in terms) if index >= 0), default=0)
+    start = max(0, first - SNIPPET_RADIUS)
+    end = min(len(value), first + SNIPPET_RADIUS * 2)
+    snippet = value[start:end]
+
+    pieces, last = [], 0
+    for match in TOKEN_RE.finditer(snippet):
+        word = match.group().lower()
+        if any(word.startswith(term) for term in terms):
+            pieces.append(escape(snippet[last:match.start()]))
+            pieces.append(f'<mark>{escape(match.group())}</mark>')
+            last = match.end()
+    pieces.append(escape(snippet[last:]))
+    return ('…' if start > 0 else '') + ''.join(pieces) + ('…' if end < len(value) else '')
+
+
+def _load_hits(user_id, ranked, terms):
+    """Fetch the ranked documents (one query per type) and build result entries"""
+    by_type = {}
+    for doc_type, doc_id, _ in ranked:
+        by_type.setdefault(doc_type, []).append(doc_id)
+
+    loaded = {}
+    for doc_type, ids in by_type.items():
+        model = SEARCH_DOCUMENTS[doc_type][0]
+        query = model.query.options(undefer('*')).filter(model.user_id == user_id, model.id.in_(ids))
+        for obj in query.all():
+            loaded[(doc_type, obj.id)] = obj
+
+    results = []
+    for doc_type, doc_id, score in ranked:
+        obj = loaded.get((doc_type, doc_id))
+        if obj is None:
+            continue
+        highlights = {}
+        for field in SEARCH_DOCUMENTS[doc_type][1]:
+            value = getattr(obj, field)
+            if value and any(token.startswith(term) for token in tokenize(value) for term in terms):
+                highlights[field] = highlight(str(value), terms)
+
+        if doc_type == 'case':
+            summary = {'case_number': obj.case_number, 'title': obj.title, 'status': obj.status}
+        elif doc_type == 'client':
+            summary = {'name': obj.name, 'email': obj.email, 'phone': obj.phone}
+        elif doc_type == 'document':
+            summary = {'case_id': obj.case_id, 'title': obj.title, 'file_name': obj.file_name,
+                       'file_type': obj.file_type}
+        else:
+            summary = {'case_id': obj.case_id, 'hearing_date': obj.hearing_date.isoformat()}
+
+        results.append({'type': doc_type, 'id': doc_id, 'score': round(score, 4),
+                        **summary, 'highlights': highlights})
+    return results
+
+
+def search(user_id, query, doc_types=None, offset=0, limit=20):
+    """Ranked search over a user's cases, clients, hearing updates and documents.
+
+    Every query term must match, as a word prefix.
+    Returns (results, total).
+    """
+    terms = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_TERMS]
+    doc_types = [doc_type for doc_type in (doc_types or SEARCH_DOCUMENTS) if doc_type in SEARCH_DOCUMENTS]
+    if not terms or not doc_types:
+        return [], 0
+
+    if search_backend() == 'fulltext':
+        ranked, total = _search_fulltext(user_id, terms, doc_types, offset, limit)
+    else:
+        ranked, total = _search_inverted(user_id, terms, doc_types, offset, limit)
+    return _load_hits(user_id, ranked, terms), total
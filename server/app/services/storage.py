@@ -0,0 +1,359 @@
+import os
+import shutil
+import tempfile
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import cached_property
+from flask import current_app
+
+# modified is naive UTC, like the rest of the schema
+StoredObject = namedtuple('StoredObject', 'key size modified')
+
+
+class StorageError(RuntimeError):
+    """A storage backend is misconfigured or its client library is missing"""
+
+
+def content_disposition(filename, as_attachment):
+    # Stored names went through secure_filename, so they are plain ASCII
+    safe_name = filename.replace('\\', '_').replace('"', '_')
+    return f"{'attachment' if as_attachment else 'inline'}; filename=\"{safe_name}\""
+
+
+class Storage(ABC):
+    """Where document files live, addressed by '/'-separated keys (blobs/ab/cd/<sha256>).
+
+    Keys are content-addressed, so an object is written once and never
+    changed: drivers need no locking or versioning.
+    """
+    name = None
+
+    @abstractmethod
+    def save(self, key, path, content_type=None):
+        """Store the local file at path under key; the file is consumed"""
+
+    @abstractmethod
+    def exists(self, key):
+        """Whether an object is stored under key"""
+
+    @abstractmethod
+    def delete(self, key):
+        """Remove key; a missing key is not an error"""
+
+    @abstractmethod
+    def local_file(self, key):
+        """Context manager yielding a local path with the object's bytes (a temporary copy for remote drivers).
+
+        Raises FileNotFoundError if there is no such object.
+        """
+
+    def local_path(self, key):
+        """Path on this machine's disk, when the driver stores files locally"""
+        return None
+
+    @abstractmethod
+    def iter_objects(self, prefix='', recursive=True):
+        """Yield StoredObjects under prefix in ascending key order, without buffering the listing.
+
+        With recursive=False only keys with no further '/' are listed.
+        """
+
+    def presigned_url(self, key, filename, content_type, as_attachment=True, expires_in=300):
+        """Time-limited URL the browser fetches directly, or None if the API must serve the bytes"""
+        return None
+
+
+class LocalStorage(Storage):
+    """Files under UPLOAD_FOLDER; served by Flask or by nginx (X-Accel-Redirect)"""
+    name = 'local'
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def save(self, key, path, content_type=None):
+        target = self._path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # Temp files are created under UPLOAD_FOLDER/tmp, so this is an atomic rename
+        os.replace(path, target)
+
+    def exists(self, key):
+        return os.path.isfile(self._path(key))
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    @contextmanager
+    def local_file(self, key):
+        path = self._path(key)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+        yield path
+
+    def local_path(self, key):
+        return self._path(key)
+
+    def iter_objects(self, prefix='', recursive=True):
+        directory = self._path(prefix.rstrip('/')) if prefix else self.root
+        return self._walk(directory, prefix, recursive)
+
+    def _walk(self, directory, prefix, recursive):
+        # One directory is sorted at a time; shard directories keep that small
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            key = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    yield from self._walk(entry.path, key + '/', recursive)
+            elif entry.is_file(follow_symlinks=False):
+                stat = entry.stat(follow_symlinks=False)
+                yield StoredObject(key, stat.st_size, datetime.utcfromtimestamp(stat.st_mtime))
+
+
+class S3Storage(Storage):
+    """Any S3-compatible service (AWS S3, MinIO, Cloudflare R2, ...); needs boto3.
+
+    Uploads above the multipart threshold are split into parts sent by
+    `max_concurrency` threads, and downloads to local copies use parallel
+    ranged GETs. Browsers get presigned GET URLs signed for
+    `public_endpoint_url`, which differs from `endpoint_url` when the API
+    reaches the service on an internal hostname (http://minio:9000).
+    """
+    name = 's3'
+
+    def __init__(self, bucket, prefix='', region=None, endpoint_url=None, public_endpoint_url=None,
+                 access_key_id=None, secret_access_key=None, addressing_style='auto',
+                 multipart_threshold=8 * 1024 * 1024, multipart_chunk_size=8 * 1024 * 1024, max_concurrency=4):
+        if not bucket:
+            raise StorageError('STORAGE_BACKEND=s3 needs S3_BUCKET')
+        try:
+            import boto3
+            from boto3.s3.transfer import TransferConfig
+            from botocore.config import Config as BotoConfig
+        except ImportError as e:
+            raise StorageError('STORAGE_BACKEND=s3 needs the boto3 package') from e
+
+        self.bucket = bucket
+        self.prefix = prefix.strip('/') + '/' if prefix.strip('/') else ''
+        self._boto3 = boto3
+        self._client_options = {
+            'region_name': region,
+            'aws_access_key_id': access_key_id,
+            'aws_secret_access_key': secret_access_key,
+            'config': BotoConfig(signature_version='s3v4', s3={'addressing_style': addressing_style},
+                                 max_pool_connections=max(10, max_concurrency * 2)),
+        }
+        self.endpoint_url = endpoint_url
+        self.public_endpoint_url = public_endpoint_url or endpoint_url
+        self.transfer = TransferConfig(multipart_threshold=multipart_threshold,
+                                       multipart_chunksize=multipart_chunk_size,
+                                       max_concurrency=max_concurrency, use_threads=max_concurrency > 1)
+
+    # Clients are thread-safe; create them on first use, after gunicorn forks
+    @cached_property
+    def client(self):
+        return self._boto3.client('s3', endpoint_url=self.endpoint_url, **self._client_options)
+
+    @cached_property
+    def signer(self):
+        if self.public_endpoint_url == self.endpoint_url:
+            return self.client
+        return self._boto3.client('s3', endpoint_url=self.public_endpoint_url, **self._client_options)
+
+    def _key(self, key):
+        return self.prefix + key
+
+    def _is_missing(self, error):
+        return error.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound')
+
+    def save(self, key, path, content_type=None):
+        extra = {'ContentType': content_type} if content_type else None
+        self.client.upload_file(path, self.bucket, self._key(key), ExtraArgs=extra, Config=self.transfer)
+        os.remove(path)
+
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except ClientError as e:
+            if self._is_missing(e):
+                return False
+            raise
+        return True
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    @contextmanager
+    def local_file(self, key):
+        from botocore.exceptions import ClientError
+        handle, path = tempfile.mkstemp(suffix='.download')
+        os.close(handle)
+        try:
+            try:
+                self.client.download_file(self.bucket, self._key(key), path, Config=self.transfer)
+            except ClientError as e:
+                if self._is_missing(e):
+                    raise FileNotFoundError(key) from e
+                raise
+            yield path
+        finally:
+            os.remove(path)
+
+    def iter_objects(self, prefix='', recursive=True):
+        # ListObjectsV2 returns keys in UTF-8 byte order, 1000 per page
+        options = {'Bucket': self.bucket, 'Prefix': self._key(prefix)}
+        if not recursive:
+            options['Delimiter'] = '/'
+        for page in self.client.get_paginator('list_objects_v2').paginate(**options):
+            for item in page.get('Contents', ()):
+                modified = item['LastModified'].astimezone(timezone.utc).replace(tzinfo=None)
+                yield StoredObject(item['Key'][len(self.prefix):], item['Size'], modified)
+
+    def presigned_url(self, key, filename, content_type, as_attachment=True, expires_in=300):
+        return self.signer.generate_presigned_url('get_object', ExpiresIn=expires_in, Params={
+            'Bucket': self.bucket,
+            'Key': self._key(key),
+            'ResponseContentType': content_type,
+            'ResponseContentDisposition': content_disposition(filename, as_attachment),
+            'ResponseCacheControl': f'private, max-age={expires_in}',
+        })
+
+
+class CloudinaryStorage(Storage):
+    """Private raw resources on Cloudinary; needs the cloudinary package.
+
+    Large files go through Cloudinary's chunked upload API. Download URLs
+    are signed and expiring, but Cloudinary names the downloaded file after
+    the object key, not the document's file name.
+    """
+    name = 'cloudinary'
+    TYPE = 'private'
+    RESOURCE_TYPE = 'raw'
+
+    def __init__(self, cloud_name, api_key, api_secret, chunk_size=20 * 1024 * 1024):
+        if not (cloud_name and api_key and api_secret):
+            raise StorageError('STORAGE_BACKEND=cloudinary needs the CLOUDINARY_* settings')
+        try:
+            import cloudinary
+            import cloudinary.api
+            import cloudinary.uploader
+            import cloudinary.utils
+        except ImportError as e:
+            raise StorageError('STORAGE_BACKEND=cloudinary needs the cloudinary package') from e
+        self.cloudinary = cloudinary
+        self.credentials = {'cloud_name': cloud_name, 'api_key': api_key, 'api_secret': api_secret}
+        self.chunk_size = chunk_size
+
+    def _options(self, **extra):
+        return dict(self.credentials, type=self.TYPE, resource_type=self.RESOURCE_TYPE, **extra)
+
+    def save(self, key, path, content_type=None):
+        self.cloudinary.uploader.upload_large(path, **self._options(public_id=key, overwrite=True,
+                                                                    chunk_size=self.chunk_size))
+        os.remove(path)
+
+    def exists(self, key):
+        try:
+            self.cloudinary.api.resource(key, **self._options())
+        except self.cloudinary.exceptions.NotFound:
+            return False
+        return True
+
+    def delete(self, key):
+        self.cloudinary.uploader.destroy(key, invalidate=True, **self._options())
+
+    def _signed_url(self, key, expires_in, as_attachment=True):
+        return self.cloudinary.utils.private_download_url(
+            key, '', expires_at=int(time.time()) + expires_in, attachment=as_attachment, **self._options()
+        )
+
+    @contextmanager
+    def local_file(self, key):
+        if not self.exists(key):
+            raise FileNotFoundError(key)
+        handle, path = tempfile.mkstemp(suffix='.download')
+        try:
+            with os.fdopen(handle, 'wb') as target, urllib.request.urlopen(self._signed_url(key, 300)) as source:
+                shutil.copyfileobj(source, target)
+            yield path
+        finally:
+            os.remove(path)
+
+    def iter_objects(self, prefix='', recursive=True):
+        # The Admin API lists by creation time, not by key
+        raise StorageError('Cloudinary storage cannot be listed in key order; clean it up from the Media Library')
+
+    def presigned_url(self, key, filename, content_type, as_attachment=True, expires_in=300):
+        return self._signed_url(key, expires_in, as_attachment)
+
+
+def create_storage(config):
+    backend = config['STORAGE_BACKEND']
+    if backend == 'local':
+        return LocalStorage(config['UPLOAD_FOLDER'])
+    if backend == 's3':
+        return S3Storage(
+            bucket=config['S3_BUCKET'],
+            prefix=config['S3_PREFIX'],
+            region=config['S3_REGION'],
+            endpoint_url=config['S3_ENDPOINT_URL'],
+            public_endpoint_url=config['S3_PUBLIC_ENDPOINT_URL'],
+            access_key_id=config['S3_ACCESS_KEY_ID'],
+            secret_access_key=config['S3_SECRET_ACCESS_KEY'],
+            addressing_style=config['S3_ADDRESSING_STYLE'],
+            multipart_threshold=config['S3_MULTIPART_THRESHOLD'],
+            multipart_chunk_size=config['S3_MULTIPART_CHUNK_SIZE'],
+            max_concurrency=config['S3_MAX_CONCURRENCY'],
+        )
+    if backend == 'cloudinary':
+        return CloudinaryStorage(config['CLOUDINARY_CLOUD_NAME'], config['CLOUDINARY_API_KEY'],
+                                 config['CLOUDINARY_API_SECRET'])
+    raise StorageError(f"Unknown STORAGE_BACKEND {backend!r}; use 'local', 's3' or 'cloudinary'")
+
+
+def configure_storage(app):
+    # Scratch files and resumable upload parts stay on local disk with every backend
+    if not app.config.get('UPLOAD_FOLDER'):
+        raise StorageError('UPLOAD_FOLDER must be set, whatever STORAGE_BACKEND is')
+    app.extensions['storage'] = create_storage(app.config)
+
+
+def get_storage():
+    return current_app.extensions['storage']
+
+
+def upload_local_files(storage, root, skip=('tmp',)):
+    """Copy every file under a local UPLOAD_FOLDER into storage, keeping existing objects.
+
+    For moving an installation from the local driver to a remote one;
+    returns (copied, skipped).
+    """
+    copied = skipped = 0
+    for directory, subdirs, files in os.walk(root):
+        if directory == root:
+            subdirs[:] = [name for name in subdirs if name not in skip]
+        for name in files:
+            key = os.path.relpath(os.path.join(directory, name), root).replace(os.sep, '/')
+            if storage.exists(key):
+                skipped += 1
+                continue
+            # save() consumes its input, so hand it a copy
+            handle, temp_path = tempfile.mkstemp(suffix='.upload')
+            os.close(handle)
+            shutil.copyfile(os.path.join(directory, name), temp_path)
+            storage.save(key, temp_path)
+            copied += 1
+    return copied, skipped
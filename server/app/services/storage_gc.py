@@ -0,0 +1,168 @@
+import re
+from contextlib import closing
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import LargeBinary, cast
+from app.extensions import db
+from app.models.blob import Blob
+from app.models.document import Document
+from app.models.upload_session import UploadSession
+from app.services.blobs import blob_key, thumbnail_key
+from app.services.storage import LocalStorage, get_storage
+
+SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+LEGACY_URL_PREFIX = '/uploads/'
+
+
+# --- What each stored key refers to (None: not a file we manage) ------------
+
+def _blob_ref(key):
+    sha256 = key.rsplit('/', 1)[-1]
+    return sha256 if SHA256_RE.match(sha256) and key == blob_key(sha256) else None
+
+
+def _thumbnail_ref(key):
+    sha256 = key.rsplit('/', 1)[-1][:-len('.jpg')]
+    return sha256 if SHA256_RE.match(sha256) and key == thumbnail_key(sha256) else None
+
+
+def _legacy_ref(key):
+    # Dotfiles (.gitkeep and the like) were never uploads
+    return None if key.startswith('.') else key
+
+
+def _upload_ref(key):
+    name = key.rsplit('/', 1)[-1]
+    return name[:-len('.upload')] if name.endswith('.upload') else None
+
+
+# --- The same references from the database, streamed in the same order ------
+
+def _stream(statement, batch_size):
+    """Yield the first column of each row over a dedicated connection, so
+    the session can keep querying while the cursor is open"""
+    with db.engine.connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(statement)
+        for row in result:
+            yield row[0]
+
+
+def _blob_refs(batch_size):
+    return _stream(db.select(Blob.sha256).order_by(Blob.sha256), batch_size)
+
+
+def _legacy_refs(batch_size):
+    # Binary order, to match storage listings whatever the column collation
+    names = _stream(db.select(Document.file_url).where(
+        Document.sha256.is_(None), Document.file_url.startswith(LEGACY_URL_PREFIX)
+    ).order_by(cast(Document.file_url, LargeBinary)), batch_size)
+    return (url[len(LEGACY_URL_PREFIX):] for url in names)
+
+
+def _upload_refs(batch_size):
+    return _stream(db.select(UploadSession.id).order_by(UploadSession.id), batch_size)
+
+
+def diff_sorted(objects, refs, ref_of):
+    """Merge stored objects with database references, both ascending.
+
+    Yields (object, ref) for objects nothing references (ref is None for
+    keys that are not ours) and (None, ref) for references whose object is
+    missing. Each stream is read once, so memory use is constant.
+    """
+    refs = iter(refs)
+    current = next(refs, None)
+    for obj in objects:
+        ref = ref_of(obj.key)
+        if ref is None:
+            if not obj.key.rsplit('/', 1)[-1].startswith('.'):
+                yield obj, None
+            continue
+        while current is not None and current < ref:
+            yield None, current
+            current = next(refs, None)
+        if current == ref:
+            while current == ref:
+                current = next(refs, None)
+        else:
+            yield obj, ref
+    while current is not None:
+        yield None, current
+        current = next(refs, None)
+
+
+def _still_unreferenced(sweep, ref):
+    """Re-check one candidate right before deleting it"""
+    if sweep in ('blobs', 'thumbnails'):
+        # On MySQL, FOR UPDATE on a missing key takes a gap lock: an upload
+        # of this content cannot claim the blob until the delete commits
+        query = db.select(Blob.sha256).where(Blob.sha256 == ref).with_for_update()
+    elif sweep == 'legacy':
+        query = db.select(Document.id).where(Document.sha256.is_(None),
+                                             Document.file_url == LEGACY_URL_PREFIX + ref)
+    else:
+        query = db.select(UploadSession.id).where(UploadSession.id == ref)
+    return db.session.execute(query).first() is None
+
+
+def collect_garbage(grace_period=None, dry_run=False, batch_size=1000):
+    """Delete stored files that no database row refers to.
+
+    Sweeps blobs, their thumbnails, pre-content-addressing files at the top
+    of storage (local storage, or S3 with a prefix) and the local tmp
+    directory. Each sweep merges a sorted
+    storage listing with a sorted database query instead of loading
+    either. Files modified within the grace period are kept: an upload
+    places its file before its transaction commits. Returns a report per
+    sweep.
+    """
+    if grace_period is None:
+        grace_period = current_app.config['STORAGE_GC_GRACE_PERIOD']
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_period)
+    storage = get_storage()
+    scratch = LocalStorage(current_app.config['UPLOAD_FOLDER'])
+
+    sweeps = [
+        # name, storage, listing, key -> ref, db refs, report missing files
+        ('blobs', storage, storage.iter_objects('blobs/'), _blob_ref, _blob_refs(batch_size), True),
+        ('thumbnails', storage, storage.iter_objects('thumbnails/'), _thumbnail_ref, _blob_refs(batch_size), False),
+        ('tmp', scratch, scratch.iter_objects('tmp/'), _upload_ref, _upload_refs(batch_size), False),
+    ]
+    report = {}
+    # Legacy files have no recognisable names, so every top-level key is
+    # taken for one. That holds only where the top level is ours alone: a
+    # bucket without S3_PREFIX may be shared with other applications
+    if isinstance(storage, LocalStorage) or getattr(storage, 'prefix', ''):
+        sweeps.insert(2, ('legacy', storage, storage.iter_objects('', recursive=False), _legacy_ref,
+                          _legacy_refs(batch_size), True))
+    else:
+        report['legacy'] = {'skipped': f'top-level files are not swept on {storage.name} storage without a prefix'}
+    for name, target, objects, ref_of, refs, count_missing in sweeps:
+        stats = report[name] = {'scanned': 0, 'orphaned': 0, 'recent': 0, 'deleted': 0, 'bytes_freed': 0}
+        if count_missing:
+            stats['missing'] = 0
+        with closing(refs):
+            for obj, ref in diff_sorted(_counted(objects, stats), refs, ref_of):
+                if obj is None:
+                    if count_missing:
+                        stats['missing'] += 1
+                    continue
+                stats['orphaned'] += 1
+                if obj.modified > cutoff:
+                    stats['recent'] += 1
+                    continue
+                if dry_run or (ref is not None and not _still_unreferenced(name, ref)):
+                    db.session.rollback()
+                    continue
+                target.delete(obj.key)
+                db.session.commit()
+                stats['deleted'] += 1
+                stats['bytes_freed'] += obj.size
+        db.session.rollback()
+    return report
+
+
+def _counted(objects, stats):
+    for obj in objects:
+        stats['scanned'] += 1
+        yield obj
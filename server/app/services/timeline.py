@@ -0,0 +1,71 @@
+from sqlalchemy import case, func, or_
+from app.extensions import db
+from app.models.hearing_update import HearingUpdate
+from app.schemas.resources import hearing_update_serializer
+from app.utils.pagination import keyset_page
+
+TIMELINE_PAGE_SIZE = 20
+# A hearing whose order or recorded action mentions this was adjourned
+ADJOURNMENT_PATTERN = '%adjourn%'
+
+
+def _adjourned():
+    return or_(func.lower(HearingUpdate.court_order).like(ADJOURNMENT_PATTERN),
+               func.lower(HearingUpdate.action_taken).like(ADJOURNMENT_PATTERN))
+
+
+def _summary(row):
+    if row is None:
+        return {'hearing_count': 0, 'first_hearing_date': None, 'last_hearing_date': None,
+                'next_hearing_date': None, 'adjournment_streak': 0}
+    return {
+        'hearing_count': row.hearing_count,
+        'first_hearing_date': row.first_hearing_date.isoformat() if row.first_hearing_date else None,
+        'last_hearing_date': row.last_hearing_date.isoformat() if row.last_hearing_date else None,
+        'next_hearing_date': row.latest_next_hearing_date.isoformat() if row.latest_next_hearing_date else None,
+        'adjournment_streak': int(row.adjournment_streak or 0),
+    }
+
+
+def case_timeline(case_id, user_id, fields=None, cursor=None, limit=TIMELINE_PAGE_SIZE):
+    """One page of a case's hearings, newest first; returns (rows, next_cursor, summary).
+
+    Later pages (with a cursor) are a plain keyset seek on (case_id,
+    hearing_date). The first page also carries the case summary, computed
+    by window functions over the case's hearings in the same query, so
+    opening a case reads one index range and serializes only `limit` rows:
+    - hearing_count, first_hearing_date, last_hearing_date
+    - next_hearing_date: the date set by the most recent hearing
+    - adjournment_streak: how many of the latest hearings in a row were
+      adjourned (ADJOURNMENT_PATTERN in the order or action taken)
+    summary is None for later pages.
+    """
+    columns = hearing_update_serializer.columns(fields, extra=('id', 'hearing_date'))
+    owned = (HearingUpdate.case_id == case_id, HearingUpdate.user_id == user_id)
+
+    if cursor:
+        rows, next_cursor = keyset_page(db.session.query(*columns).filter(*owned),
+                                        HearingUpdate.hearing_date, HearingUpdate.id, cursor, limit)
+        return rows, next_cursor, None
+
+    newest_first = (HearingUpdate.hearing_date.desc(), HearingUpdate.id.desc())
+    ranked = db.session.query(
+        *columns,
+        func.count().over().label('hearing_count'),
+        func.min(HearingUpdate.hearing_date).over().label('first_hearing_date'),
+        func.max(HearingUpdate.hearing_date).over().label('last_hearing_date'),
+        func.first_value(HearingUpdate.next_hearing_date, type_=db.Date).over(
+            order_by=newest_first).label('latest_next_hearing_date'),
+        # Hearings that were not adjourned, counted from the newest down to this one
+        func.sum(case((_adjourned(), 0), else_=1)).over(
+            order_by=newest_first, rows=(None, 0)).label('not_adjourned_since')
+    ).filter(*owned).subquery()
+
+    # Rows before the first non-adjourned hearing form the streak; a second
+    # window level is needed because windows cannot nest
+    query = db.session.query(
+        *ranked.c,
+        func.sum(case((ranked.c.not_adjourned_since == 0, 1), else_=0)).over().label('adjournment_streak')
+    )
+    rows, next_cursor = keyset_page(query, ranked.c.hearing_date, ranked.c.id, None, limit)
+    return rows, next_cursor, _summary(rows[0] if rows else None)
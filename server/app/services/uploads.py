@@ -0,0 +1,199 @@
+import hashlib
+import os
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from werkzeug.utils import secure_filename
+from app.extensions import db
+from app.models.document import Document
+from app.models.upload_session import UploadSession
+from app.models.user_counter import UserCounter
+from app.services.blobs import COPY_BUFFER_SIZE, BlobTooLarge, blob_key, copy_stream, store_blob, temp_dir
+from app.services.previews import enqueue_processing
+from app.utils.cache import TTLCache
+
+# Running SHA-256 state per upload, so each chunk is hashed once as it is
+# written. hashlib objects cannot be persisted, so this only helps while
+# one process receives every chunk. When a chunk lands on another worker
+# (or after a restart) hashing stops, and complete_upload reads the part
+# file once instead; rebuilding the state on every miss would re-read the
+# whole file per chunk when several workers share the uploads.
+_hashers = TTLCache(maxsize=256, ttl=6 * 3600)
+
+
+class UploadError(ValueError):
+    """A chunked upload request that cannot be applied; carries an HTTP status"""
+
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+def allowed_file(filename):
+    allowed = current_app.config['ALLOWED_EXTENSIONS']
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed
+
+
+def storage_usage(user_id):
+    """(bytes used, quota or None) from the user's storage_bytes counter"""
+    used = db.session.query(UserCounter.value).filter_by(user_id=user_id, name='storage_bytes').scalar() or 0
+    return used, current_app.config['STORAGE_QUOTA_BYTES'] or None
+
+
+def check_quota(user_id, size):
+    """Refuse a file that would take the user past STORAGE_QUOTA_BYTES.
+
+    A soft limit: two uploads finishing at the same moment can both pass.
+    """
+    used, quota = storage_usage(user_id)
+    if quota is not None and used + size > quota:
+        raise UploadError('Storage quota exceeded', 413, used_bytes=used, quota_bytes=quota)
+
+
+def part_path(upload):
+    """Where an upload's bytes collect: UPLOAD_FOLDER/tmp, whatever STORAGE_BACKEND is.
+
+    Every process that may receive the upload's requests must see this
+    directory: gunicorn workers on one host do, and replicas need it on a
+    shared volume or an upload's requests routed to one replica.
+    """
+    return os.path.join(temp_dir(), f'{upload.id}.upload')
+
+
+def create_document(user_id, case_id, title, description, file_name, temp_path, sha256, size):
+    """Store a fully received file as a blob and add the document row (caller commits).
+
+    Thumbnail and text extraction are queued in the same transaction, so
+    the job exists exactly when the document does. Raises UploadError if
+    the file would exceed the user's quota.
+    """
+    check_quota(user_id, size)
+    store_blob(temp_path, sha256, size)
+    document = Document(
+        case_id=case_id,
+        user_id=user_id,
+        title=title,
+        file_name=file_name,
+        file_url=f'/uploads/{blob_key(sha256)}',
+        file_type=file_name.rsplit('.', 1)[1].lower(),
+        file_size=size,
+        sha256=sha256,
+        description=description
+    )
+    db.session.add(document)
+    db.session.flush()
+    enqueue_processing(document)
+    return document
+
+
+def start_upload(user_id, case_id, title, description, file_name, file_size):
+    file_name = secure_filename(file_name or '')
+    if not file_name or not allowed_file(file_name):
+        raise UploadError('File type not allowed')
+    max_size = current_app.config['DOCUMENT_MAX_SIZE']
+    if not isinstance(file_size, int) or file_size <= 0:
+        raise UploadError('file_size must be a positive integer')
+    if file_size > max_size:
+        raise UploadError(f'File is larger than {max_size} bytes', 413)
+    check_quota(user_id, file_size)
+
+    upload = UploadSession(id=uuid.uuid4().hex, user_id=user_id, case_id=case_id, title=title,
+                           description=description, file_name=file_name, file_size=file_size, received=0)
+    db.session.add(upload)
+    open(part_path(upload), 'wb').close()
+    return upload
+
+
+def _cached_hasher(upload):
+    """The running hash of the bytes received so far, if this process has it"""
+    cached = _hashers.get(upload.id)
+    if cached is not None and cached[0] == upload.received:
+        # Work on a copy: a chunk that fails half way must not taint the cached state
+        return cached[1].copy()
+    return None
+
+
+def _hash_part(upload, path):
+    hasher = hashlib.sha256()
+    remaining = upload.received
+    with open(path, 'rb') as source:
+        while remaining:
+            block = source.read(min(COPY_BUFFER_SIZE, remaining))
+            if not block:
+                raise UploadError('Upload data was lost; start the upload again', 410)
+            hasher.update(block)
+            remaining -= len(block)
+    return hasher
+
+
+def append_chunk(upload, offset, stream):
+    """Append one chunk at `offset`, hashing it as it is written; returns the new offset.
+
+    The caller holds the session row lock, so chunks of one upload are
+    applied one at a time. Bytes past `received` from an interrupted
+    earlier attempt are discarded first.
+    """
+    if offset != upload.received:
+        raise UploadError('Offset does not match the bytes received so far', 409, offset=upload.received)
+
+    path = part_path(upload)
+    if not os.path.exists(path):
+        raise UploadError('Upload data was lost; start the upload again', 410)
+    hasher = _cached_hasher(upload) if upload.received else hashlib.sha256()
+    with open(path, 'r+b') as target:
+        target.truncate(upload.received)
+        target.seek(upload.received)
+        try:
+            written = copy_stream(stream, target, hasher, upload.file_size - upload.received)
+        except BlobTooLarge:
+            _hashers.invalidate(upload.id)
+            raise UploadError('Chunk runs past the declared file_size', 413)
+        target.flush()
+        os.fsync(target.fileno())
+
+    upload.received += written
+    if hasher is not None:
+        _hashers.set(upload.id, (upload.received, hasher))
+    else:
+        _hashers.invalidate(upload.id)
+    return upload.received
+
+
+def complete_upload(upload, expected_sha256=None):
+    """Turn a fully received upload into a document (caller commits)"""
+    if upload.received != upload.file_size:
+        raise UploadError('Upload is incomplete', 409, offset=upload.received)
+    path = part_path(upload)
+    if not os.path.exists(path):
+        raise UploadError('Upload data was lost; start the upload again', 410)
+    hasher = _cached_hasher(upload) or _hash_part(upload, path)
+    sha256 = hasher.hexdigest()
+    if expected_sha256 and expected_sha256.lower() != sha256:
+        discard_upload(upload)
+        raise UploadError('Checksum mismatch; the upload was discarded', 422, sha256=sha256)
+
+    document = create_document(upload.user_id, upload.case_id, upload.title, upload.description, upload.file_name,
+                               path, sha256, upload.file_size)
+    _hashers.invalidate(upload.id)
+    db.session.delete(upload)
+    return document
+
+
+def discard_upload(upload):
+    _hashers.invalidate(upload.id)
+    try:
+        os.remove(part_path(upload))
+    except FileNotFoundError:
+        pass
+    db.session.delete(upload)
+
+
+def purge_stale_uploads(max_age=None):
+    """Remove uploads untouched for UPLOAD_SESSION_TTL seconds; returns how many"""
+    max_age = max_age or timedelta(seconds=current_app.config['UPLOAD_SESSION_TTL'])
+    stale = UploadSession.query.filter(UploadSession.updated_at < datetime.utcnow() - max_age).all()
+    for upload in stale:
+        discard_upload(upload)
+    db.session.commit()
+    return len(stale)
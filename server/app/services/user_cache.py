@@ -0,0 +1,62 @@
+from collections import namedtuple
+from sqlalchemy import event
+from app.extensions import db
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+# Read-only snapshot of a user row, safe to share across requests and sessions
+CachedUser = namedtuple('CachedUser', ['id', 'email', 'full_name', 'bar_council_id', 'phone', 'address',
+                                       'is_active'])
+
+user_cache = TTLCache()
+
+
+def configure_user_cache(app):
+    user_cache.maxsize = app.config['USER_CACHE_SIZE']
+    user_cache.ttl = app.config['USER_CACHE_TTL']
+    user_cache.clear()
+
+
+def load_user(user_id):
+    """Return the CachedUser for user_id, or None if it does not exist"""
+    user = user_cache.get(user_id)
+    if user is None:
+        row = db.session.query(*(getattr(User, field) for field in CachedUser._fields)).filter(
+            User.id == user_id
+        ).first()
+        if row is None:
+            return None
+        user = CachedUser(*row)
+        user_cache.set(user_id, user)
+    return user
+
+
+def invalidate_user(user_id):
+    user_cache.invalidate(user_id)
+
+
+def _after_flush(session, flush_context):
+    changed = {obj.id for obj in session.dirty | session.deleted if isinstance(obj, User)}
+    if changed:
+        for user_id in changed:
+            invalidate_user(user_id)
+        # Drop them again once committed, in case a concurrent request cached
+        # the old row between this flush and the commit
+        session.info.setdefault('stale_users', set()).update(changed)
+
+
+def _after_commit(session):
+    for user_id in session.info.pop('stale_users', ()):
+        invalidate_user(user_id)
+
+
+def _after_rollback(session):
+    session.info.pop('stale_users', None)
+
+
+def register_user_cache_listeners():
+    """Invalidate cached users whenever the ORM updates or deletes them"""
+    for name, listener in (('after_flush', _after_flush), ('after_commit', _after_commit),
+                           ('after_rollback', _after_rollback)):
+        if not event.contains(db.session, name, listener):
+            event.listen(db.session, name, listener)
@@ -0,0 +1,28 @@
+from app.extensions import db
+
+
+def bulk_insert(model, rows):
+    """Insert rows for model and return their new primary keys, in order.
+
+    Where the dialect supports INSERT ... RETURNING for executemany
+    (MariaDB, PostgreSQL, SQLite) the ids come back with
+    sort_by_parameter_order, which SQLAlchemy keeps in input order with the
+    autoincrement key as the sentinel; it batches the rows where the
+    backend can guarantee that (MariaDB, PostgreSQL) and sends them one at
+    a time where it cannot (SQLite). Matching returned values back to the
+    input is not safe: the server may round them (DATETIME without
+    fractional seconds drops the microseconds). Other dialects (MySQL)
+    fall back to one INSERT per row in the same transaction. Every row
+    must carry the same keys.
+    """
+    if not rows:
+        return []
+
+    table = model.__table__
+    dialect = db.session.get_bind().dialect
+
+    if not getattr(dialect, 'insert_executemany_returning', False):
+        return [db.session.execute(table.insert(), row).inserted_primary_key[0] for row in rows]
+
+    result = db.session.execute(table.insert().returning(table.c.id, sort_by_parameter_order=True), rows)
+    return result.scalars().all()
@@ -0,0 +1,63 @@
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, gzip is used instead
+    brotli = None
+
+# Suffixes appended to a strong ETag once the body is encoded, so each
+# representation has its own validator (RFC 9110 section 8.8.3)
+ENCODING_ETAG_SUFFIXES = {'br': '-br', 'gzip': '-gzip'}
+
+
+def available_encodings():
+    """Content codings this process can produce, in order of preference"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encodings):
+    """Pick the best coding the client accepts, or None for identity"""
+    best, best_quality = None, 0
+    for coding in available_encodings():
+        quality = accept_encodings[coding]
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body, coding, config):
+    if coding == 'br':
+        return brotli.compress(body, quality=config['COMPRESS_BR_QUALITY'])
+    return gzip.compress(body, compresslevel=config['COMPRESS_GZIP_LEVEL'], mtime=0)
+
+
+def init_compression(app):
+    """Compress buffered responses above COMPRESS_MIN_SIZE with gzip or brotli"""
+    mimetypes = set(app.config['COMPRESS_MIMETYPES'])
+    min_size = app.config['COMPRESS_MIN_SIZE']
+
+    @app.after_request
+    def compress_response(response):
+        if not app.config['COMPRESS_ENABLED']:
+            return response
+        # Streamed bodies (exports, file downloads) handle their own encoding
+        if (response.status_code < 200 or response.status_code >= 300 or response.status_code == 204
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers or response.mimetype not in mimetypes):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        body = response.get_data()
+        if len(body) < min_size:
+            return response
+        coding = choose_encoding(request.accept_encodings)
+        if coding is None:
+            return response
+
+        response.set_data(compress(body, coding, app.config))
+        response.headers['Content-Encoding'] = coding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(etag + ENCODING_ETAG_SUFFIXES[coding], weak=weak)
+        return response
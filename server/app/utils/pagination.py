@@ -0,0 +1,99 @@
+import base64
+import json
+from datetime import date, datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class CursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Clamp the ?limit= query parameter to a sane page size"""
+    try:
+        limit = int(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, maximum))
+
+
+def parse_bool(value, default=True):
+    """Read a boolean query parameter such as ?count=false"""
+    if value is None or value == '':
+        return default
+    return value.strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+        raise CursorError('Invalid cursor')
+    return value
+
+
+def encode_cursor(sort_value, row_id):
+    """Build an opaque cursor from the last row's sort value and id"""
+    payload = json.dumps([_encode_value(sort_value), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; returns (sort_value, id)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return _decode_value(sort_value), int(row_id)
+    except CursorError:
+        raise
+    except (ValueError, TypeError):
+        raise CursorError('Invalid cursor')
+
+
+def keyset_page(query, sort_column, id_column, cursor=None, limit=DEFAULT_PAGE_SIZE, descending=True):
+    """Apply keyset pagination on (sort_column, id_column) to a query.
+
+    Rows after the cursor are selected with a seek predicate instead of an
+    OFFSET, so fetching the last page costs the same as fetching the first.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        if descending:
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < last_id)
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > last_id)
+            ))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    # Fetch one extra row to find out whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return rows, next_cursor
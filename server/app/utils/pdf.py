@@ -0,0 +1,107 @@
+import textwrap
+import zlib
+
+# A4 portrait, in points
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+MARGIN = 40
+
+# Courier is monospaced (600/1000 em per glyph), so wrapping needs no font metrics
+CHAR_WIDTH = 0.6
+
+
+def _escape(text):
+    # The core fonts use WinAnsiEncoding; other characters print as '?'
+    data = text.encode('cp1252', errors='replace')
+    return data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+class TextPDF:
+    """Minimal PDF writer for printable text reports.
+
+    Lays out headings and wrapped lines top to bottom on A4 pages in the
+    built-in Courier fonts, so it needs no PDF library and no font files.
+    Call render() once everything is added.
+    """
+
+    def __init__(self, title, footer=None):
+        self.title = title
+        self.footer = footer or title
+        self.pages = []
+        self._new_page()
+
+    def _new_page(self):
+        self.pages.append([])
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def _columns(self, size, indent):
+        return max(10, int((PAGE_WIDTH - 2 * MARGIN - indent) / (size * CHAR_WIDTH)))
+
+    def _draw(self, text, size, bold, indent):
+        leading = size * 1.3
+        if self.y - leading < MARGIN + 20:
+            self._new_page()
+        self.y -= leading
+        font = b'/F2' if bold else b'/F1'
+        self.pages[-1].append(b'BT %s %d Tf %.1f %.1f Td (%s) Tj ET' % (
+            font, size, MARGIN + indent, self.y, _escape(text)))
+
+    def heading(self, text, size=12, space_before=6):
+        """Bold text; starts a new page rather than leave it alone at the bottom"""
+        if self.y - space_before - 4 * size < MARGIN + 20:
+            self._new_page()
+        elif self.pages[-1]:
+            self.y -= space_before
+        for line in textwrap.wrap(text, self._columns(size, 0)) or ['']:
+            self._draw(line, size, True, 0)
+
+    def text(self, text, size=9, indent=0, bold=False):
+        """Wrap text to the page width; embedded newlines start new lines"""
+        columns = self._columns(size, indent)
+        for paragraph in (text or '').splitlines() or ['']:
+            for line in textwrap.wrap(paragraph, columns, subsequent_indent='  ') or ['']:
+                self._draw(line, size, bold, indent)
+
+    def space(self, points=6):
+        self.y -= points
+
+    def new_page(self):
+        """Continue on a fresh page, unless the current one is still blank"""
+        if self.pages[-1]:
+            self._new_page()
+
+    def render(self):
+        """Return the finished document as bytes"""
+        objects = [
+            b'<< /Type /Catalog /Pages 2 0 R >>',
+            None,  # page tree, filled in once the page objects are numbered
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>',
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /Courier-Bold /Encoding /WinAnsiEncoding >>',
+            b'<< /Title (%s) /Producer (Advocate Diary) >>' % _escape(self.title),
+        ]
+        page_ids = []
+        total = len(self.pages)
+        for number, commands in enumerate(self.pages, 1):
+            footer = f'{self.footer} - page {number} of {total}'
+            commands = commands + [b'BT /F1 8 Tf %d %d Td (%s) Tj ET' % (MARGIN, MARGIN - 15, _escape(footer))]
+            stream = zlib.compress(b'\n'.join(commands))
+            objects.append(b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream' % (len(stream), stream))
+            content_id = len(objects)
+            objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] '
+                           b'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>'
+                           % (PAGE_WIDTH, PAGE_HEIGHT, content_id))
+            page_ids.append(len(objects))
+        objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            b' '.join(b'%d 0 R' % page_id for page_id in page_ids), len(page_ids))
+
+        out = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(out))
+            out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+        xref = len(out)
+        out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+        for offset in offsets:
+            out += b'%010d 00000 n \n' % offset
+        out += b'trailer\n<< /Size %d /Root 1 0 R /Info 5 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+        return bytes(out)
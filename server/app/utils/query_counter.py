@@ -0,0 +1,35 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Collects the SQL statements executed on an engine"""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine):
+    """Count statements sent to the database inside the block.
+
+    Used to guard listing endpoints against N+1 lazy loads: run the same
+    request against a small and a large dataset and assert the counts match.
+
+        with count_queries(db.engine) as counter:
+            client.get('/api/calendar', headers=headers)
+        assert counter.count <= 3
+    """
+    counter = QueryCounter()
+    event.listen(engine, 'before_cursor_execute', counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter._record)
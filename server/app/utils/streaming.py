@@ -0,0 +1,25 @@
+import zlib
+
+# Bytes buffered before a chunk is handed to the WSGI server
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def chunked(lines, compress=False, chunk_size=STREAM_CHUNK_SIZE):
+    """Group text lines into ~chunk_size byte chunks, gzipping on the fly if asked"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    pending, size = [], 0
+    for line in lines:
+        data = line.encode('utf-8')
+        pending.append(data)
+        size += len(data)
+        if size >= chunk_size:
+            chunk = b''.join(pending)
+            pending, size = [], 0
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+    chunk = b''.join(pending)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
@@ -0,0 +1,161 @@
+"""Seed a large dataset and print query plans with and without the
+composite indexes added in migration c41d7e9b2a58.
+
+Usage:
+    python benchmarks/explain_indexes.py [--users 20] [--cases 1000] [--database-url URL]
+
+Each user gets --cases cases with hearing updates, calendar events and
+documents. The database defaults to a throwaway SQLite file; point
+--database-url at an empty MySQL schema to see the InnoDB plans.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+BENCH_INDEXES = {
+    'ix_calendar_events_user_id_event_date',
+    'ix_hearing_updates_user_id_hearing_date',
+    'ix_hearing_updates_case_id_hearing_date',
+    'ix_cases_user_id_status_created_at',
+    'ix_cases_user_id_created_at',
+    'ix_documents_case_id',
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--cases', type=int, default=1000, help='cases per user')
+    parser.add_argument('--database-url', default=None)
+    return parser.parse_args()
+
+
+def seed(db, users, cases_per_user):
+    from app.models.user import User
+    from app.models.case import Case
+    from app.models.calendar_event import CalendarEvent
+    from app.models.document import Document
+    from app.models.hearing_update import HearingUpdate
+
+    rng = random.Random(42)
+    statuses = ['Active', 'Pending', 'Closed', 'Won', 'Lost']
+    now = datetime.utcnow()
+
+    db.session.execute(db.insert(User), [{
+        'id': u, 'email': f'bench{u}@example.com', 'password_hash': 'x', 'full_name': f'Bench {u}',
+        'is_active': True, 'created_at': now, 'updated_at': now
+    } for u in range(1, users + 1)])
+
+    case_id = 0
+    for u in range(1, users + 1):
+        cases, hearings, events, documents = [], [], [], []
+        for _ in range(cases_per_user):
+            case_id += 1
+            created = now - timedelta(minutes=rng.randint(0, 5 * 365 * 24 * 60))
+            cases.append({
+                'id': case_id, 'user_id': u, 'case_number': f'B{case_id}', 'title': f'Case {case_id}',
+                'status': rng.choice(statuses), 'created_at': created, 'updated_at': created
+            })
+            for h in range(3):
+                hearing_date = date.today() - timedelta(days=rng.randint(0, 1500))
+                hearings.append({
+                    'case_id': case_id, 'user_id': u, 'hearing_date': hearing_date,
+                    'created_at': now, 'updated_at': now
+                })
+                events.append({
+                    'user_id': u, 'case_id': case_id, 'title': f'Hearing {case_id}/{h}', 'event_type': 'Hearing',
+                    'event_date': datetime.combine(hearing_date, datetime.min.time()),
+                    'is_completed': False, 'created_at': now, 'updated_at': now
+                })
+            documents.append({
+                'case_id': case_id, 'title': 'Petition', 'file_name': 'petition.pdf',
+                'file_url': '/uploads/petition.pdf', 'uploaded_at': now
+            })
+        db.session.execute(db.insert(Case), cases)
+        db.session.execute(db.insert(HearingUpdate), hearings)
+        db.session.execute(db.insert(CalendarEvent), events)
+        db.session.execute(db.insert(Document), documents)
+    db.session.commit()
+
+
+def hot_queries(users):
+    from app.models.case import Case
+    from app.models.calendar_event import CalendarEvent
+    from app.models.document import Document
+    from app.models.hearing_update import HearingUpdate
+
+    user_id = users // 2 or 1
+    return {
+        'cases by status': Case.query.filter_by(user_id=user_id, status='Active')
+            .order_by(Case.created_at.desc()).limit(50),
+        'cases page': Case.query.filter_by(user_id=user_id)
+            .order_by(Case.created_at.desc(), Case.id.desc()).limit(50),
+        'calendar': CalendarEvent.query.filter_by(user_id=user_id).order_by(CalendarEvent.event_date),
+        'all hearings': HearingUpdate.query.filter_by(user_id=user_id).order_by(HearingUpdate.hearing_date.desc()),
+        'case hearings': HearingUpdate.query.filter_by(case_id=42).order_by(HearingUpdate.hearing_date.desc()),
+        'case documents': Document.query.filter_by(case_id=42),
+    }
+
+
+def explain(db, query):
+    sql = str(query.statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    prefix = 'EXPLAIN QUERY PLAN ' if db.engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    rows = db.session.execute(db.text(prefix + sql)).fetchall()
+    return [' | '.join(str(col) for col in row) for row in rows]
+
+
+def report(db, users, label):
+    print(f'\n=== {label} ===')
+    for name, query in hot_queries(users).items():
+        started = time.perf_counter()
+        query.all()
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f'\n-- {name} ({elapsed:.1f} ms)')
+        for line in explain(db, query):
+            print('   ' + line)
+
+
+def main():
+    args = parse_args()
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+    else:
+        handle, path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        print(f'Seeding {args.users} users x {args.cases} cases...')
+        seed(db, args.users, args.cases)
+
+        indexes = [index for table in db.metadata.tables.values()
+                   for index in table.indexes if index.name in BENCH_INDEXES]
+
+        for index in indexes:
+            index.drop(db.engine)
+        db.session.execute(db.text('ANALYZE' if db.engine.dialect.name == 'sqlite' else 'SELECT 1'))
+        report(db, args.users, 'without composite indexes')
+
+        for index in indexes:
+            index.create(db.engine)
+        db.session.execute(db.text('ANALYZE' if db.engine.dialect.name == 'sqlite' else 'SELECT 1'))
+        report(db, args.users, 'with composite indexes')
+
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""HTTP load generator for comparing serving modes (dev server vs gunicorn).
+
+Usage:
+    python benchmarks/http_load.py --url http://127.0.0.1:5000 [--path /api/cases/]
+        [--concurrency 32] [--duration 15] [--email you@example.com --password ...]
+
+Each client thread keeps one HTTP/1.1 keep-alive connection and sends
+requests back to back for --duration seconds. With --email/--password it
+logs in first and sends the bearer token; --register creates the account
+(and --seed N cases) on a fresh database. Reports requests/sec, error
+counts and latency percentiles.
+
+Typical comparison, against the same MySQL database:
+
+    python run.py                                        # Werkzeug dev server
+    gunicorn -c gunicorn.conf.py wsgi:app                # production
+
+    python benchmarks/http_load.py --url http://127.0.0.1:5000 --path /api/cases/ \\
+        --email load@example.com --password load-pass --register --seed 200
+"""
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Connection:
+    """One keep-alive connection, reopened after errors"""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.factory = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.host = parts.netloc
+        self.conn = None
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        if self.conn is None:
+            self.conn = self.factory(self.host, timeout=30)
+        try:
+            self.conn.request(method, path, body=data, headers=headers)
+            response = self.conn.getresponse()
+            payload = response.read()
+            if response.getheader('Connection', '').lower() == 'close':
+                self.close()
+            return response.status, payload
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+def authenticate(args):
+    conn = Connection(args.url)
+    if args.register:
+        conn.request('POST', '/api/auth/register',
+                     {'email': args.email, 'password': args.password, 'full_name': 'Load Test'})
+    status, payload = conn.request('POST', '/api/auth/login', {'email': args.email, 'password': args.password})
+    if status != 200:
+        raise SystemExit(f'Login failed: {status} {payload[:200]!r}')
+    headers = {'Authorization': f"Bearer {json.loads(payload)['access_token']}"}
+    for i in range(args.seed):
+        conn.request('POST', '/api/cases/', {'case_number': f'LOAD-{time.time_ns()}-{i}',
+                                             'title': f'Load test case {i}'}, headers)
+    conn.close()
+    return headers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--path', default='/api/health')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--email')
+    parser.add_argument('--password')
+    parser.add_argument('--register', action='store_true', help='Register the account first')
+    parser.add_argument('--seed', type=int, default=0, help='Cases to create before the run')
+    args = parser.parse_args()
+
+    headers = authenticate(args) if args.email else {}
+    latencies, statuses, errors = [], {}, [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def client():
+        conn = Connection(args.url)
+        local, local_statuses, local_errors = [], {}, 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status, _ = conn.request('GET', args.path, headers=headers)
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                continue
+            local.append(time.perf_counter() - started)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(f'GET {args.url}{args.path}: concurrency {args.concurrency}, {elapsed:.1f}s')
+    print(f'  requests        {len(latencies)} ({errors[0]} connection errors)')
+    print(f'  statuses        {statuses}')
+    print(f'  throughput      {len(latencies) / elapsed:8.1f} req/sec')
+    if latencies:
+        print(f'  latency         p50 {percentile(latencies, 50) * 1000:7.1f} ms   '
+              f'p99 {percentile(latencies, 99) * 1000:7.1f} ms   '
+              f'mean {statistics.mean(latencies) * 1000:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Compare encode time and bytes on the wire for GET /api/hearing-updates/all.
+
+Usage:
+    python benchmarks/json_encoding.py [--rows 10000] [--repeat 5]
+
+Seeds a throwaway SQLite database with one user's hearing history, builds
+the endpoint's payload once, then times Flask's default JSON provider
+against app.utils.json_provider.FastJSONProvider and reports the body size
+with no content coding, gzip and (if installed) brotli.
+"""
+import argparse
+import gzip
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def best_of(repeat, run):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from flask.json.provider import DefaultJSONProvider
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from app.extensions import db
+    from app.models.case import Case
+    from app.models.hearing_update import HearingUpdate
+    from app.models.user import User
+    from app.utils import compression, json_provider
+
+    app = create_app('production')
+    with app.app_context():
+        db.create_all()
+        now = datetime.utcnow()
+        db.session.execute(db.insert(User), [{'id': 1, 'email': 'bench@example.com', 'password_hash': 'x',
+                                              'full_name': 'Bench'}])
+        db.session.execute(db.insert(Case), [{
+            'user_id': 1, 'case_number': f'B{i}', 'title': f'Case {i}', 'court_name': 'District Court',
+            'client_name': 'Client', 'status': 'Active', 'created_at': now, 'updated_at': now
+        } for i in range(100)])
+        db.session.execute(db.insert(HearingUpdate), [{
+            'user_id': 1, 'case_id': i % 100 + 1, 'hearing_date': date(2020, 1, 1) + timedelta(days=i % 2000),
+            'next_hearing_date': date(2020, 2, 1) + timedelta(days=i % 2000),
+            'action_taken': 'Arguments heard in part', 'court_order': f'Adjourned for evidence, order {i}',
+            'action_to_be_taken': 'File written statement', 'created_at': now, 'updated_at': now
+        } for i in range(args.rows)])
+        db.session.commit()
+        token = create_access_token(identity='1')
+
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}', 'Accept-Encoding': 'identity'}
+    payload = client.get('/api/hearing-updates/all', headers=headers).get_json()
+    print(f'{len(payload)} hearing updates, best of {args.repeat}')
+
+    with app.app_context():
+        default = DefaultJSONProvider(app)
+        fast = json_provider.FastJSONProvider(app)
+        encoders = {'flask default (json, sorted keys)': lambda: default.dumps(payload).encode('utf-8')}
+        stdlib = json_provider.FastJSONProvider(app)
+        stdlib.use_orjson = False
+        encoders['FastJSONProvider (stdlib fallback)'] = lambda: stdlib.dumps_bytes(payload)
+        if fast.use_orjson:
+            encoders['FastJSONProvider (orjson)'] = lambda: fast.dumps_bytes(payload)
+
+        for name, run in encoders.items():
+            elapsed, body = best_of(args.repeat, run)
+            print(f'  encode  {name:<36} {elapsed * 1000:>8.1f} ms')
+
+    sizes = {'identity': len(body)}
+    codings = {'gzip': lambda: gzip.compress(body, compresslevel=app.config['COMPRESS_GZIP_LEVEL'], mtime=0)}
+    if compression.brotli is not None:
+        codings['br'] = lambda: compression.brotli.compress(body, quality=app.config['COMPRESS_BR_QUALITY'])
+    print(f'  wire    {"identity":<36} {sizes["identity"]:>10,} bytes')
+    for coding, run in codings.items():
+        elapsed, compressed = best_of(args.repeat, run)
+        print(f'  wire    {coding:<36} {len(compressed):>10,} bytes  ({elapsed * 1000:.1f} ms to compress)')
+
+    # End to end through the test client, negotiated encoding included
+    for accept in ('identity', 'gzip', 'br, gzip'):
+        request_headers = dict(headers, **{'Accept-Encoding': accept})
+        elapsed, response = best_of(args.repeat, lambda: client.get('/api/hearing-updates/all',
+                                                                    headers=request_headers))
+        coding = response.headers.get('Content-Encoding', 'identity')
+        print(f'  request Accept-Encoding: {accept:<19} {elapsed * 1000:>8.1f} ms  '
+              f'{len(response.get_data()):>10,} bytes ({coding})')
+
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
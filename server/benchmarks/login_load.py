@@ -0,0 +1,134 @@
+"""Measure login throughput and latency percentiles under concurrency.
+
+Usage:
+    python benchmarks/login_load.py [--concurrency 16] [--requests 200] [--workers 2] [--rounds 12]
+    python benchmarks/login_load.py --url http://localhost:5000/api --email a@example.com --password secret
+
+Without --url the app runs in-process on a throwaway SQLite database with
+the given PASSWORD_HASH_WORKERS (0 hashes inline on the request thread)
+and bcrypt cost. While the logins run, a separate thread polls
+/api/health so the report shows how much the login spike slows down an
+unrelated endpoint.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def http_client(base_url):
+    def call(method, path, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = urllib.request.Request(base_url + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+    return call
+
+
+def in_process_client(args):
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    os.environ['PASSWORD_HASH_WORKERS'] = str(args.workers)
+    os.environ['BCRYPT_LOG_ROUNDS'] = str(args.rounds)
+
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app('production')
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+
+    def call(method, path, body=None):
+        return client.open('/api' + path, method=method, json=body).status_code
+    return call, path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='Base URL of a running API, e.g. http://localhost:5000/api')
+    parser.add_argument('--email', default='load@example.com')
+    parser.add_argument('--password', default='load-test-password')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=2, help='PASSWORD_HASH_WORKERS (in-process only)')
+    parser.add_argument('--rounds', type=int, default=12, help='BCRYPT_LOG_ROUNDS (in-process only)')
+    args = parser.parse_args()
+
+    db_path = None
+    if args.url:
+        call = http_client(args.url.rstrip('/'))
+    else:
+        call, db_path = in_process_client(args)
+        call('POST', '/auth/register', {'email': args.email, 'password': args.password, 'full_name': 'Load'})
+
+    # Warm up (starts the hashing pool)
+    call('POST', '/auth/login', {'email': args.email, 'password': args.password})
+
+    def login(_):
+        started = time.perf_counter()
+        status = call('POST', '/auth/login', {'email': args.email, 'password': args.password})
+        return status, time.perf_counter() - started
+
+    health, stop = [], threading.Event()
+
+    def poll_health():
+        while not stop.is_set():
+            started = time.perf_counter()
+            call('GET', '/health')
+            health.append(time.perf_counter() - started)
+            time.sleep(0.01)
+
+    poller = threading.Thread(target=poll_health, daemon=True)
+    poller.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        results = list(pool.map(login, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    poller.join()
+
+    latencies = [latency for status, latency in results if status == 200]
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+
+    target = args.url or f'in-process, workers={args.workers}, rounds={args.rounds}'
+    print(f'{args.requests} logins, concurrency {args.concurrency} ({target})')
+    print(f'  statuses        {statuses}')
+    print(f'  throughput      {len(latencies) / elapsed:8.1f} logins/sec')
+    if latencies:
+        print(f'  login latency   p50 {percentile(latencies, 50) * 1000:7.1f} ms   '
+              f'p99 {percentile(latencies, 99) * 1000:7.1f} ms   mean {statistics.mean(latencies) * 1000:7.1f} ms')
+    if health:
+        print(f'  /health latency p50 {percentile(health, 50) * 1000:7.1f} ms   '
+              f'p99 {percentile(health, 99) * 1000:7.1f} ms   ({len(health)} probes)')
+
+    if db_path:
+        os.remove(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Compare rows/sec of the hand-built case dicts the routes used to build
+against the compiled serializers in app.schemas.
+
+Usage:
+    python benchmarks/serializers.py [--rows 10000] [--repeat 5]
+
+Each variant is timed end to end (query + serialization) on a throwaway
+SQLite database.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+def legacy_dict(case):
+    # The per-row dict GET /api/cases built before the serializer layer
+    return {
+        'id': case.id,
+        'case_number': case.case_number,
+        'title': case.title,
+        'case_type': case.case_type,
+        'court_name': case.court_name,
+        'status': case.status,
+        'filing_date': case.filing_date.isoformat() if case.filing_date else None,
+        'client_name': case.client_name,
+        'client_address': case.client_address,
+        'client_phone': case.client_phone,
+        'opposite_party': case.opposite_party,
+        'otherside_counsel': case.otherside_counsel,
+        'party_type': case.party_type,
+        'description': case.description,
+        'remarks': case.remarks,
+        'notes': case.notes,
+        'created_at': case.created_at.isoformat()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    handle, path = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from app import create_app
+    from app.extensions import db
+    from app.models.case import Case
+    from app.models.user import User
+    from app.schemas.resources import CASE_LIST_FIELDS, CASE_SUMMARY_FIELDS, case_serializer
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        now = datetime.utcnow()
+        db.session.execute(db.insert(User), [{'id': 1, 'email': 'bench@example.com', 'password_hash': 'x',
+                                              'full_name': 'Bench'}])
+        db.session.execute(db.insert(Case), [{
+            'user_id': 1, 'case_number': f'B{i}', 'title': f'Case {i}', 'case_type': 'Civil',
+            'court_name': 'District Court', 'status': 'Active', 'filing_date': date(2024, 1, 1),
+            'client_name': 'Client', 'description': 'Suit for declaration ' * 5, 'notes': 'Notes',
+            'created_at': now, 'updated_at': now
+        } for i in range(args.rows)])
+        db.session.commit()
+
+        variants = {
+            'legacy: ORM instances + hand-built dicts': lambda: [
+                legacy_dict(case) for case in Case.query.filter_by(user_id=1).all()
+            ],
+            'compiled: ORM instances': lambda: case_serializer.dump_many(
+                Case.query.filter_by(user_id=1).all(), CASE_LIST_FIELDS
+            ),
+            'compiled: column tuples': lambda: case_serializer.dump_many(
+                db.session.query(*case_serializer.columns(CASE_LIST_FIELDS)).filter(Case.user_id == 1).all(),
+                CASE_LIST_FIELDS
+            ),
+            'compiled: column tuples, summary fields': lambda: case_serializer.dump_many(
+                db.session.query(*case_serializer.columns(CASE_SUMMARY_FIELDS)).filter(Case.user_id == 1).all(),
+                CASE_SUMMARY_FIELDS
+            ),
+        }
+
+        print(f'{args.rows} rows, best of {args.repeat}')
+        for name, run in variants.items():
+            best = float('inf')
+            for _ in range(args.repeat):
+                db.session.expunge_all()
+                started = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - started)
+            print(f'  {name:<42} {args.rows / best:>10,.0f} rows/sec')
+
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
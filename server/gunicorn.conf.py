@@ -0,0 +1,34 @@
+"""gunicorn settings for the API: gunicorn -c gunicorn.conf.py wsgi:app
+
+Workers and threads come from WEB_WORKERS / WEB_THREADS (see
+app/config.py). Each worker is a separate process with its own database
+pool, so DB_POOL_SIZE should cover WEB_THREADS and the database must
+allow WEB_WORKERS * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+"""
+import os
+from app.config import Config
+
+bind = os.getenv('BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}")
+
+# Threaded sync workers: requests mostly wait on MySQL, and threads share
+# one process's caches (user lookups, compiled serializers)
+worker_class = 'gthread'
+workers = Config.WEB_WORKERS
+threads = Config.WEB_THREADS
+
+# Recycle workers gradually so slow leaks cannot build up; the jitter keeps
+# them from all restarting at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Let in-flight requests (uploads, exports) finish on reload or shutdown
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = 5
+
+# Load the app in each worker, not the master, so no database connection
+# or process pool is inherited across fork
+preload_app = False
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
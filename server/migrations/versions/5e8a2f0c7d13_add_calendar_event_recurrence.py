@@ -0,0 +1,32 @@
+"""Add recurrence rule columns to calendar events
+
+Revision ID: 5e8a2f0c7d13
+Revises: c41d7e9b2a58
+Create Date: 2026-10-18 10:04:51.602937
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8a2f0c7d13'
+down_revision = 'c41d7e9b2a58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('recurrence', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('recurrence_interval', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('recurrence_until', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_calendar_events_user_id_recurrence', ['user_id', 'recurrence'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_calendar_events_user_id_recurrence')
+        batch_op.drop_column('recurrence_until')
+        batch_op.drop_column('recurrence_interval')
+        batch_op.drop_column('recurrence')
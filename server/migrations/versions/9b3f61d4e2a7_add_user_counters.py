@@ -0,0 +1,59 @@
+"""Add user_counters aggregate table
+
+Revision ID: 9b3f61d4e2a7
+Revises: 5e8a2f0c7d13
+Create Date: 2026-10-18 11:27:09.351846
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3f61d4e2a7'
+down_revision = '5e8a2f0c7d13'
+branch_labels = None
+depends_on = None
+
+
+user_counters = sa.table('user_counters', sa.column('user_id', sa.Integer), sa.column('name', sa.String),
+                         sa.column('value', sa.Integer))
+cases = sa.table('cases', sa.column('user_id', sa.Integer), sa.column('status', sa.String))
+hearing_updates = sa.table('hearing_updates', sa.column('user_id', sa.Integer))
+calendar_events = sa.table('calendar_events', sa.column('user_id', sa.Integer),
+                           sa.column('is_completed', sa.Boolean))
+
+
+def _backfill(table, name, *criteria):
+    """INSERT ... SELECT one counter per user; name may be a SQL expression"""
+    if isinstance(name, str):
+        name = sa.literal(name, sa.String)
+    query = sa.select(table.c.user_id, name, sa.func.count()).where(*criteria).group_by(table.c.user_id, name)
+    op.execute(user_counters.insert().from_select(['user_id', 'name', 'value'], query))
+
+
+def upgrade():
+    op.create_table('user_counters',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=80), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'name')
+    )
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.create_index('ix_calendar_events_user_id_is_completed_event_date', ['user_id', 'is_completed', 'event_date'], unique=False)
+
+    # Count existing rows, as rebuild_counters() does
+    _backfill(cases, 'cases')
+    _backfill(cases, sa.literal('cases:', sa.String) + sa.func.coalesce(cases.c.status, 'Unknown'))
+    _backfill(hearing_updates, 'hearing_updates')
+    _backfill(calendar_events, 'events')
+    _backfill(calendar_events, 'events:open',
+              sa.or_(calendar_events.c.is_completed.is_(False), calendar_events.c.is_completed.is_(None)))
+
+
+def downgrade():
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_calendar_events_user_id_is_completed_event_date')
+
+    op.drop_table('user_counters')
@@ -0,0 +1,78 @@
+"""Add background jobs table and document text, thumbnail and owner columns
+
+Revision ID: a6d2e8c41f37
+Revises: f3a1c9d20b64
+Create Date: 2026-10-18 15:04:17.552903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d2e8c41f37'
+down_revision = 'f3a1c9d20b64'
+branch_labels = None
+depends_on = None
+
+FULLTEXT_COLUMNS = ['title', 'file_name', 'description', 'extracted_text']
+
+
+def upgrade():
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_at', sa.DateTime(), nullable=False),
+    sa.Column('locked_by', sa.String(length=64), nullable=True),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.create_index('ix_jobs_status_run_at', ['status', 'run_at'], unique=False)
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('processing_status', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('has_thumbnail', sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.add_column(sa.Column('extracted_text', sa.Text().with_variant(mysql.MEDIUMTEXT(), 'mysql'),
+                                      nullable=True))
+
+    # Documents belong to the owner of their case
+    op.execute('UPDATE documents SET user_id = (SELECT cases.user_id FROM cases WHERE cases.id = documents.case_id)')
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index('ix_documents_user_id', ['user_id'], unique=False)
+        batch_op.create_foreign_key('fk_documents_user_id_users', 'users', ['user_id'], ['id'])
+
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('ft_documents_text', 'documents', FULLTEXT_COLUMNS, mysql_prefix='FULLTEXT')
+
+    # Existing documents keep processing_status NULL; queue them with
+    # `flask process-documents`, then `flask rebuild-search-index` on
+    # databases without FULLTEXT
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ft_documents_text', table_name='documents')
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_documents_user_id_users', type_='foreignkey')
+        batch_op.drop_index('ix_documents_user_id')
+        batch_op.drop_column('extracted_text')
+        batch_op.drop_column('has_thumbnail')
+        batch_op.drop_column('processing_status')
+        batch_op.drop_column('user_id')
+
+    with op.batch_alter_table('jobs', schema=None) as batch_op:
+        batch_op.drop_index('ix_jobs_status_run_at')
+
+    op.drop_table('jobs')
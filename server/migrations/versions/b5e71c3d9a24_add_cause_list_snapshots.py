@@ -0,0 +1,38 @@
+"""Add cause_list_snapshots and the hearing_updates next-hearing index
+
+Revision ID: b5e71c3d9a24
+Revises: d82b4f1e6c90
+Create Date: 2026-10-18 17:26:03.914480
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e71c3d9a24'
+down_revision = 'd82b4f1e6c90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cause_list_snapshots',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('list_date', sa.Date(), nullable=False),
+    sa.Column('versions', sa.String(length=64), nullable=False),
+    sa.Column('entries', sa.JSON(), nullable=False),
+    sa.Column('generated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'list_date')
+    )
+    with op.batch_alter_table('hearing_updates', schema=None) as batch_op:
+        batch_op.create_index('ix_hearing_updates_user_id_next_hearing_date', ['user_id', 'next_hearing_date'],
+                              unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('hearing_updates', schema=None) as batch_op:
+        batch_op.drop_index('ix_hearing_updates_user_id_next_hearing_date')
+
+    op.drop_table('cause_list_snapshots')
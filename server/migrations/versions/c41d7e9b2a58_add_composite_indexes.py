@@ -0,0 +1,61 @@
+"""Add composite indexes for per-user query paths
+
+Revision ID: c41d7e9b2a58
+Revises: a09702701dbe
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d7e9b2a58'
+down_revision = 'a09702701dbe'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.create_index('ix_calendar_events_user_id_event_date', ['user_id', 'event_date'], unique=False)
+
+    with op.batch_alter_table('hearing_updates', schema=None) as batch_op:
+        batch_op.create_index('ix_hearing_updates_user_id_hearing_date', ['user_id', 'hearing_date'], unique=False)
+        batch_op.create_index('ix_hearing_updates_case_id_hearing_date', ['case_id', 'hearing_date'], unique=False)
+
+    with op.batch_alter_table('cases', schema=None) as batch_op:
+        batch_op.create_index('ix_cases_user_id_status_created_at', ['user_id', 'status', 'created_at'], unique=False)
+        batch_op.create_index('ix_cases_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.create_index('ix_documents_case_id', ['case_id'], unique=False)
+
+
+def downgrade():
+    # On MySQL the new indexes took over from the implicit foreign key
+    # indexes, so plain ones have to be put back before they can be dropped.
+    restore_fk_indexes = op.get_bind().dialect.name == 'mysql'
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        if restore_fk_indexes:
+            batch_op.create_index('case_id', ['case_id'], unique=False)
+        batch_op.drop_index('ix_documents_case_id')
+
+    with op.batch_alter_table('cases', schema=None) as batch_op:
+        if restore_fk_indexes:
+            batch_op.create_index('user_id', ['user_id'], unique=False)
+        batch_op.drop_index('ix_cases_user_id_created_at')
+        batch_op.drop_index('ix_cases_user_id_status_created_at')
+
+    with op.batch_alter_table('hearing_updates', schema=None) as batch_op:
+        if restore_fk_indexes:
+            batch_op.create_index('case_id', ['case_id'], unique=False)
+            batch_op.create_index('user_id', ['user_id'], unique=False)
+        batch_op.drop_index('ix_hearing_updates_case_id_hearing_date')
+        batch_op.drop_index('ix_hearing_updates_user_id_hearing_date')
+
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        if restore_fk_indexes:
+            batch_op.create_index('user_id', ['user_id'], unique=False)
+        batch_op.drop_index('ix_calendar_events_user_id_event_date')
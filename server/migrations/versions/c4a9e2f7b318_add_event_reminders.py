@@ -0,0 +1,57 @@
+"""Add calendar_events.remind_at and reminder_deliveries
+
+Existing reminders are not scheduled until `flask rebuild-reminders` has
+filled remind_at (it needs recurrence expansion and EVENT_TIMEZONE).
+
+Revision ID: c4a9e2f7b318
+Revises: b5e71c3d9a24
+Create Date: 2026-10-18 19:02:41.337125
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a9e2f7b318'
+down_revision = 'b5e71c3d9a24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('remind_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_calendar_events_remind_at', ['remind_at'], unique=False)
+        batch_op.create_index('ix_calendar_events_updated_at', ['updated_at'], unique=False)
+
+    op.create_table('reminder_deliveries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('occurrence_at', sa.DateTime(), nullable=False),
+    sa.Column('sink', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['calendar_events.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id', 'occurrence_at', 'sink', name='uq_reminder_deliveries_event_occurrence_sink')
+    )
+    with op.batch_alter_table('reminder_deliveries', schema=None) as batch_op:
+        batch_op.create_index('ix_reminder_deliveries_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reminder_deliveries', schema=None) as batch_op:
+        batch_op.drop_index('ix_reminder_deliveries_user_id_created_at')
+
+    op.drop_table('reminder_deliveries')
+
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_calendar_events_updated_at')
+        batch_op.drop_index('ix_calendar_events_remind_at')
+        batch_op.drop_column('remind_at')
@@ -0,0 +1,38 @@
+"""Widen user_counters.value and count documents and storage bytes per user
+
+Revision ID: d82b4f1e6c90
+Revises: a6d2e8c41f37
+Create Date: 2026-10-18 16:41:52.208417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd82b4f1e6c90'
+down_revision = 'a6d2e8c41f37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Storage totals outgrow a 32-bit integer at 2 GiB
+    with op.batch_alter_table('user_counters', schema=None) as batch_op:
+        batch_op.alter_column('value', existing_type=sa.Integer(), type_=sa.BigInteger(), existing_nullable=False)
+
+    op.execute(
+        "INSERT INTO user_counters (user_id, name, value) "
+        "SELECT user_id, 'documents', COUNT(*) FROM documents GROUP BY user_id"
+    )
+    op.execute(
+        "INSERT INTO user_counters (user_id, name, value) "
+        "SELECT user_id, 'storage_bytes', COALESCE(SUM(file_size), 0) FROM documents GROUP BY user_id"
+    )
+
+
+def downgrade():
+    op.execute("DELETE FROM user_counters WHERE name IN ('documents', 'storage_bytes')")
+
+    with op.batch_alter_table('user_counters', schema=None) as batch_op:
+        batch_op.alter_column('value', existing_type=sa.BigInteger(), type_=sa.Integer(), existing_nullable=False)
@@ -0,0 +1,26 @@
+"""Add calendar_events.duration
+
+Revision ID: e2b86d4a0f19
+Revises: c4a9e2f7b318
+Create Date: 2026-10-18 19:48:12.604218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b86d4a0f19'
+down_revision = 'c4a9e2f7b318'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('duration', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.drop_column('duration')
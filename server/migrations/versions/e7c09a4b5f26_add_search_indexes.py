@@ -0,0 +1,54 @@
+"""Add FULLTEXT search indexes and search_postings fallback table
+
+Revision ID: e7c09a4b5f26
+Revises: 9b3f61d4e2a7
+Create Date: 2026-10-18 12:45:33.870412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7c09a4b5f26'
+down_revision = '9b3f61d4e2a7'
+branch_labels = None
+depends_on = None
+
+FULLTEXT_INDEXES = {
+    'cases': ('ft_cases_text', ['case_number', 'title', 'client_name', 'opposite_party', 'otherside_counsel',
+                                'court_name', 'description', 'remarks', 'notes']),
+    'clients': ('ft_clients_text', ['name', 'email', 'phone', 'address', 'notes']),
+    'hearing_updates': ('ft_hearing_updates_text', ['action_taken', 'court_order', 'action_to_be_taken']),
+}
+
+
+def upgrade():
+    op.create_table('search_postings',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('term', sa.String(length=64), nullable=False),
+    sa.Column('doc_type', sa.String(length=20), nullable=False),
+    sa.Column('doc_id', sa.Integer(), nullable=False),
+    sa.Column('tf', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'term', 'doc_type', 'doc_id')
+    )
+    with op.batch_alter_table('search_postings', schema=None) as batch_op:
+        batch_op.create_index('ix_search_postings_doc_type_doc_id', ['doc_type', 'doc_id'], unique=False)
+
+    if op.get_bind().dialect.name == 'mysql':
+        for table, (name, columns) in FULLTEXT_INDEXES.items():
+            op.create_index(name, table, columns, mysql_prefix='FULLTEXT')
+
+    # On other databases populate search_postings with `flask rebuild-search-index`
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        for table, (name, columns) in FULLTEXT_INDEXES.items():
+            op.drop_index(name, table_name=table)
+
+    with op.batch_alter_table('search_postings', schema=None) as batch_op:
+        batch_op.drop_index('ix_search_postings_doc_type_doc_id')
+
+    op.drop_table('search_postings')
@@ -0,0 +1,56 @@
+"""Add calendar sync numbers, tombstones and feed tokens
+
+Revision ID: f7d35c1a8e62
+Revises: e2b86d4a0f19
+Create Date: 2026-10-18 20:41:55.120734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7d35c1a8e62'
+down_revision = 'e2b86d4a0f19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('calendar_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('seq', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('calendar_tombstones', schema=None) as batch_op:
+        batch_op.create_index('ix_calendar_tombstones_deleted_at', ['deleted_at'], unique=False)
+        batch_op.create_index('ix_calendar_tombstones_user_id_seq', ['user_id', 'seq'], unique=False)
+
+    # Existing rows start at 0; a first (full) sync returns them all
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sync_seq', sa.BigInteger(), server_default='0', nullable=False))
+        batch_op.create_index('ix_calendar_events_user_id_sync_seq', ['user_id', 'sync_seq'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('calendar_feed_token', sa.String(length=64), nullable=True))
+        batch_op.create_unique_constraint('calendar_feed_token', ['calendar_feed_token'])
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_constraint('calendar_feed_token', type_='unique')
+        batch_op.drop_column('calendar_feed_token')
+
+    with op.batch_alter_table('calendar_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_calendar_events_user_id_sync_seq')
+        batch_op.drop_column('sync_seq')
+
+    with op.batch_alter_table('calendar_tombstones', schema=None) as batch_op:
+        batch_op.drop_index('ix_calendar_tombstones_user_id_seq')
+        batch_op.drop_index('ix_calendar_tombstones_deleted_at')
+
+    op.drop_table('calendar_tombstones')
@@ -8,4 +8,5 @@ def make_shell_context():
     return {'db': db}
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; production runs gunicorn with wsgi.py
+    app.run(debug=app.config['DEBUG'], host='0.0.0.0', port=5000)
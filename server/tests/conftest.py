@@ -0,0 +1,46 @@
+import os
+
+# Read when app.config is imported: an in-memory SQLite database unless
+# TEST_DATABASE_URL points elsewhere, no job thread, and bcrypt in-process
+# at its cheapest cost
+os.environ.setdefault('TEST_DATABASE_URL', 'sqlite://')
+os.environ.setdefault('JOB_RUNNER', 'worker')
+os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+os.environ.setdefault('BCRYPT_LOG_ROUNDS', '4')
+
+import pytest
+from app import create_app
+from app.extensions import db
+from app.services.storage import configure_storage
+from app.utils.query_counter import count_queries as _count_queries
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app('testing')
+    app.config['UPLOAD_FOLDER'] = str(tmp_path)
+    configure_storage(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    user = {'email': 'advocate@example.com', 'password': 'password123', 'full_name': 'Test Advocate'}
+    client.post('/api/auth/register', json=user)
+    response = client.post('/api/auth/login', json={'email': user['email'], 'password': user['password']})
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+
+@pytest.fixture
+def count_queries(app):
+    """count_queries() as a fixture: `with count_queries() as counter: ...`"""
+    return lambda: _count_queries(db.engine)
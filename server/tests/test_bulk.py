@@ -0,0 +1,43 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, TypeDecorator
+
+from app.extensions import db
+from app.models.calendar_event import CalendarEvent
+from app.models.user import User
+from app.utils.bulk import bulk_insert
+
+
+class SecondsDateTime(TypeDecorator):
+    """Reads DATETIME back without microseconds, as MariaDB does for a column without fractional precision"""
+    impl = DateTime
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        return value.replace(microsecond=0) if value else value
+
+
+def test_ids_follow_input_order_when_datetimes_are_rounded(app):
+    table = Table('bulk_rows', MetaData(), Column('id', Integer, primary_key=True),
+                  Column('name', String(20)), Column('created_at', SecondsDateTime))
+    table.create(db.engine)
+    try:
+        now = datetime(2030, 1, 7, 10, 0, 0, 123456)
+        rows = [{'name': f'row {i}', 'created_at': now} for i in range(5)]
+        ids = bulk_insert(SimpleNamespace(__table__=table), rows)
+        names = dict(db.session.execute(table.select().with_only_columns(table.c.id, table.c.name)).all())
+        assert [names[row_id] for row_id in ids] == [row['name'] for row in rows]
+    finally:
+        db.session.rollback()
+        table.drop(db.engine)
+
+
+def test_ids_for_identical_rows_are_distinct(app, auth_headers):
+    now = datetime(2030, 1, 7, 10, 0, 0, 654321)
+    user_id = db.session.query(User.id).scalar()
+    rows = [{'user_id': user_id, 'title': 'Hearing', 'event_date': now, 'is_completed': False,
+             'created_at': now, 'updated_at': now} for _ in range(3)]
+    ids = bulk_insert(CalendarEvent, rows)
+    assert len(set(ids)) == 3
+    assert db.session.query(CalendarEvent).filter(CalendarEvent.id.in_(ids)).count() == 3
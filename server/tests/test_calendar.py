@@ -0,0 +1,75 @@
+def _add_events(client, headers, count, offset=0):
+    for i in range(offset, offset + count):
+        case = client.post('/api/cases', headers=headers, json={
+            'case_number': f'CASE{i:03d}', 'title': f'Case {i}', 'case_type': 'Civil',
+            'court_name': 'District Court', 'status': 'Active'}).get_json()['case']
+        response = client.post('/api/calendar', headers=headers, json={
+            'title': f'Hearing {i}', 'event_date': f'2030-01-{i % 28 + 1:02d}T10:00:00', 'case_id': case['id']})
+        assert response.status_code == 201
+
+
+def _listing_queries(client, headers, count_queries, query_string=None):
+    client.get('/api/calendar', headers=headers, query_string=query_string)  # warm the user cache
+    with count_queries() as counter:
+        response = client.get('/api/calendar', headers=headers, query_string=query_string)
+    assert response.status_code == 200
+    return len(response.get_json()), counter.count
+
+
+def test_listing_query_count_does_not_grow_with_rows(client, auth_headers, count_queries):
+    _add_events(client, auth_headers, 1)
+    rows, few = _listing_queries(client, auth_headers, count_queries)
+    assert rows == 1
+
+    _add_events(client, auth_headers, 24, offset=1)
+    rows, many = _listing_queries(client, auth_headers, count_queries)
+    assert rows == 25
+    assert many == few
+
+
+def test_window_listing_query_count_does_not_grow_with_rows(client, auth_headers, count_queries):
+    window = {'start': '2030-01-01', 'end': '2030-02-01'}
+    _add_events(client, auth_headers, 1)
+    client.post('/api/calendar', headers=auth_headers, json={
+        'title': 'Weekly meeting', 'event_date': '2029-12-03T09:00:00', 'recurrence': 'weekly'})
+    rows, few = _listing_queries(client, auth_headers, count_queries, window)
+    assert rows == 1 + 4
+
+    _add_events(client, auth_headers, 24, offset=1)
+    rows, many = _listing_queries(client, auth_headers, count_queries, window)
+    assert rows == 25 + 4
+    assert many == few
+
+
+def test_recurrence_until_before_start_is_rejected(client, auth_headers):
+    response = client.post('/api/calendar', headers=auth_headers, json={
+        'title': 'Weekly meeting', 'event_date': '2030-01-07T09:00:00', 'recurrence': 'weekly',
+        'recurrence_until': '2030-01-06'})
+    assert response.status_code == 400
+
+    response = client.post('/api/calendar', headers=auth_headers, json={
+        'title': 'Weekly meeting', 'event_date': '2030-01-07T09:00:00', 'recurrence': 'weekly',
+        'recurrence_until': '2030-01-07'})
+    assert response.status_code == 201
+    event_id = response.get_json()['event']['id']
+
+    # Moving the start past the existing end date is rejected too
+    response = client.put(f'/api/calendar/{event_id}', headers=auth_headers, json={'event_date': '2030-02-01T09:00:00'})
+    assert response.status_code == 400
+    response = client.put(f'/api/calendar/{event_id}', headers=auth_headers, json={
+        'event_date': '2030-02-01T09:00:00', 'recurrence_until': '2030-06-01'})
+    assert response.status_code == 200
+
+
+def test_window_is_bounded_and_expanded_in_full(client, auth_headers):
+    client.post('/api/calendar', headers=auth_headers, json={
+        'title': 'Daily cause list', 'event_date': '2029-01-01T09:00:00', 'recurrence': 'daily'})
+
+    response = client.get('/api/calendar', headers=auth_headers,
+                          query_string={'start': '2030-01-01', 'end': '2031-01-01'})
+    assert response.status_code == 200
+    assert len(response.get_json()) == 365
+
+    response = client.get('/api/calendar', headers=auth_headers,
+                          query_string={'start': '2030-01-01', 'end': '2031-01-03'})
+    assert response.status_code == 400
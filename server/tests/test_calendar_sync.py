@@ -0,0 +1,46 @@
+import time
+
+
+def _sync(client, headers, token=None):
+    response = client.get('/api/calendar/sync', headers=headers, query_string={'token': token} if token else None)
+    return response.status_code, response.get_json()
+
+
+def _event(client, headers, title):
+    response = client.post('/api/calendar', headers=headers, json={'title': title, 'event_date': '2030-01-07T10:00:00'})
+    return response.get_json()['event']['id']
+
+
+def test_delta_lists_edits_and_deletions_after_the_token(client, auth_headers):
+    kept = _event(client, auth_headers, 'Kept')
+    edited = _event(client, auth_headers, 'Edited')
+    deleted = _event(client, auth_headers, 'Deleted')
+
+    status, full = _sync(client, auth_headers)
+    assert status == 200
+    assert sorted(event['id'] for event in full['events']) == sorted([kept, edited, deleted])
+    token = full['sync_token']
+
+    client.put(f'/api/calendar/{edited}', headers=auth_headers, json={'title': 'Edited again'})
+    client.delete(f'/api/calendar/{deleted}', headers=auth_headers)
+
+    status, delta = _sync(client, auth_headers, token)
+    assert status == 200
+    assert [(event['id'], event['title']) for event in delta['events']] == [(edited, 'Edited again')]
+    assert delta['deleted'] == [deleted]
+
+    # Nothing changed since the newer token
+    status, empty = _sync(client, auth_headers, delta['sync_token'])
+    assert (empty['events'], empty['deleted']) == ([], [])
+
+
+def test_expired_and_malformed_tokens(client, auth_headers, app):
+    _event(client, auth_headers, 'Hearing')
+    seq = _sync(client, auth_headers)[1]['sync_token'].split('.')[0]
+
+    expired = f"{seq}.{int(time.time()) - app.config['CALENDAR_TOMBSTONE_TTL'] - 60}"
+    status, body = _sync(client, auth_headers, expired)
+    assert status == 410
+    assert 'expired' in body['error']
+
+    assert _sync(client, auth_headers, 'not-a-token')[0] == 400
@@ -0,0 +1,25 @@
+from datetime import date
+
+import app.routes.hearing_updates as hearing_updates
+
+
+def test_default_day_is_part_of_the_etag(client, auth_headers, monkeypatch):
+    case = client.post('/api/cases', headers=auth_headers, json={
+        'case_number': 'CL1', 'title': 'Boundary dispute', 'case_type': 'Civil',
+        'court_name': 'District Court', 'status': 'Active'}).get_json()['case']
+    client.post('/api/hearing-updates', headers=auth_headers, json={
+        'case_id': case['id'], 'hearing_date': '2030-01-01', 'next_hearing_date': '2030-01-03'})
+
+    monkeypatch.setattr(hearing_updates, 'cause_list_today', lambda: date(2030, 1, 2))
+    first = client.get('/api/hearing-updates/cause-list', headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert client.get('/api/hearing-updates/cause-list', headers={
+        **auth_headers, 'If-None-Match': etag}).status_code == 304
+
+    # After midnight the same URL is a different list
+    monkeypatch.setattr(hearing_updates, 'cause_list_today', lambda: date(2030, 1, 3))
+    second = client.get('/api/hearing-updates/cause-list', headers={**auth_headers, 'If-None-Match': etag})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != etag
+    assert first.get_json() != second.get_json()
@@ -0,0 +1,97 @@
+import random
+from datetime import datetime, timedelta
+from itertools import combinations
+from types import SimpleNamespace
+
+from app.services.conflicts import Occurrence, clashes, event_end, sweep_conflicts
+
+
+def _occurrence(event_id, start, minutes, location=None):
+    event = SimpleNamespace(id=event_id, location=location)
+    return Occurrence(start, start + timedelta(minutes=minutes), event)
+
+
+def _pairs(found):
+    return sorted(tuple(sorted((first.event.id, second.event.id))) for first, second in found)
+
+
+def test_event_end_defaults():
+    assert event_end(datetime(2030, 1, 7, 10), 30) == datetime(2030, 1, 7, 10, 30)
+    assert event_end(datetime(2030, 1, 7, 10), None) == datetime(2030, 1, 7, 11)
+    # A date without a time (a hearing date) takes the whole day
+    assert event_end(datetime(2030, 1, 7), None) == datetime(2030, 1, 8)
+
+
+def test_touching_intervals_do_not_clash():
+    ten = datetime(2030, 1, 7, 10)
+    assert not clashes(_occurrence(1, ten, 60), _occurrence(2, ten + timedelta(hours=1), 60))
+    assert clashes(_occurrence(1, ten, 61), _occurrence(2, ten + timedelta(hours=1), 60))
+
+
+def test_same_event_and_same_place_do_not_clash():
+    ten = datetime(2030, 1, 7, 10)
+    assert not clashes(_occurrence(1, ten, 60), _occurrence(1, ten, 60))
+    assert not clashes(_occurrence(1, ten, 60, 'High Court'), _occurrence(2, ten, 60, ' high court '))
+    assert clashes(_occurrence(1, ten, 60, 'High Court'), _occurrence(2, ten, 60, 'District Court'))
+    # Without a place there is nothing to say they are on the same list
+    assert clashes(_occurrence(1, ten, 60), _occurrence(2, ten, 60, 'High Court'))
+
+
+def test_sweep_orders_pairs_by_start():
+    ten = datetime(2030, 1, 7, 10)
+    found = list(sweep_conflicts([
+        _occurrence(3, ten + timedelta(minutes=30), 60),
+        _occurrence(1, ten, 45),
+        _occurrence(2, ten + timedelta(hours=2), 30),
+    ]))
+    assert [(first.event.id, second.event.id) for first, second in found] == [(1, 3)]
+
+
+def test_sweep_matches_every_pair_comparison():
+    rng = random.Random(24)
+    day = datetime(2030, 1, 7)
+    places = [None, 'High Court', 'District Court']
+    occurrences = [_occurrence(i, day + timedelta(minutes=15 * rng.randrange(48)), 15 * rng.randrange(1, 9),
+                               rng.choice(places))
+                   for i in range(200)]
+
+    expected = _pairs((a, b) for a, b in combinations(occurrences, 2) if clashes(a, b))
+    assert expected
+    assert _pairs(sweep_conflicts(occurrences)) == expected
+
+
+def test_create_warns_about_clash_and_range_lists_it(client, auth_headers):
+    first = client.post('/api/calendar', headers=auth_headers, json={
+        'title': 'Client meeting', 'event_date': '2030-01-07T10:00:00', 'duration': 90, 'location': 'Office'})
+    assert first.status_code == 201
+    assert first.get_json()['conflicts'] == []
+
+    second = client.post('/api/calendar', headers=auth_headers, json={
+        'title': 'Hearing', 'event_date': '2030-01-07T11:00:00', 'location': 'High Court'})
+    assert second.status_code == 201
+    assert [conflict['title'] for conflict in second.get_json()['conflicts']] == ['Client meeting']
+
+    response = client.get('/api/calendar/conflicts', headers=auth_headers,
+                          query_string={'start': '2030-01-01', 'end': '2030-02-01'})
+    assert response.status_code == 200
+    pairs = response.get_json()
+    assert len(pairs) == 1
+    assert (pairs[0]['start'], pairs[0]['end']) == ('2030-01-07T11:00:00', '2030-01-07T11:30:00')
+    assert [event['title'] for event in pairs[0]['events']] == ['Client meeting', 'Hearing']
+
+
+def test_recurring_event_clashes_with_later_occurrence(client, auth_headers):
+    client.post('/api/calendar', headers=auth_headers, json={
+        'title': 'Weekly review', 'event_date': '2030-01-07T09:00:00', 'recurrence': 'weekly'})
+    response = client.post('/api/calendar', headers=auth_headers, json={
+        'title': 'Arbitration', 'event_date': '2030-01-21T09:30:00'})
+    assert response.status_code == 201
+    conflicts = response.get_json()['conflicts']
+    assert [(conflict['title'], conflict['event_date']) for conflict in conflicts] == [
+        ('Weekly review', '2030-01-21T09:00:00')]
+
+
+def test_conflict_range_is_bounded(client, auth_headers):
+    response = client.get('/api/calendar/conflicts', headers=auth_headers,
+                          query_string={'start': '2030-01-01', 'end': '2030-12-31'})
+    assert response.status_code == 400
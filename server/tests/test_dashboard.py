@@ -0,0 +1,52 @@
+from datetime import date
+
+from app.routes import dashboard
+from app.services.cause_list import cause_list_today
+
+
+def test_overdue_actions_counts_open_one_off_events(client, auth_headers):
+    def add(**event):
+        response = client.post('/api/calendar', headers=auth_headers, json={'title': 'Event', **event})
+        return response.get_json()['event']['id']
+
+    add(event_date='2020-01-01T10:00:00')
+    unset = add(event_date='2020-01-02T10:00:00')
+    client.put(f'/api/calendar/{unset}', headers=auth_headers, json={'is_completed': None})
+    done = add(event_date='2020-01-03T10:00:00')
+    client.put(f'/api/calendar/{done}', headers=auth_headers, json={'is_completed': True})
+    add(event_date='2020-01-06T10:00:00', recurrence='weekly')
+    add(event_date='2099-01-01T10:00:00')
+
+    summary = client.get('/api/dashboard/summary', headers=auth_headers).get_json()
+    assert summary['overdue_actions'] == 2
+    assert summary['events'] == {'total': 5, 'open': 4}
+
+
+def test_hearings_count_the_event_timezone_day_and_recurring_occurrences(client, auth_headers, monkeypatch):
+    # Wednesday 2030-01-09
+    monkeypatch.setattr(dashboard, 'cause_list_today', lambda: date(2030, 1, 9))
+
+    def add(event_date, **event):
+        response = client.post('/api/calendar', headers=auth_headers,
+                               json={'title': 'Hearing', 'event_type': 'Hearing', 'event_date': event_date, **event})
+        assert response.status_code == 201
+
+    add('2030-01-09T10:00:00')
+    add('2030-01-07T10:00:00')
+    add('2030-01-14T10:00:00')
+    add('2030-01-09T12:00:00', event_type='Meeting')
+    add('2029-12-01T11:00:00', recurrence='daily')
+    add('2029-12-05T09:00:00', recurrence='weekly')
+
+    summary = client.get('/api/dashboard/summary', headers=auth_headers).get_json()
+    assert summary['hearings_today'] == 1 + 1 + 1
+    assert summary['hearings_this_week'] == 2 + 7 + 1
+
+
+def test_today_is_the_event_timezone_date(app):
+    app.config['EVENT_TIMEZONE'] = 'Pacific/Kiritimati'
+    ahead = cause_list_today()
+    app.config['EVENT_TIMEZONE'] = 'Etc/GMT+12'
+    behind = cause_list_today()
+    # UTC+14 and UTC-12 are 26 hours apart, so never on the same date
+    assert ahead > behind
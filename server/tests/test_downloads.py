@@ -0,0 +1,66 @@
+import io
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+CONTENT = b'%PDF-1.4\n' + bytes(range(256)) * 16
+
+
+@pytest.fixture
+def document_id(client, auth_headers):
+    case = client.post('/api/cases', headers=auth_headers, json={
+        'case_number': 'DL1', 'title': 'Download case', 'case_type': 'Civil',
+        'court_name': 'District Court', 'status': 'Active'}).get_json()['case']
+    response = client.post('/api/documents/upload', headers=auth_headers, content_type='multipart/form-data', data={
+        'case_id': str(case['id']), 'title': 'Petition', 'file': (io.BytesIO(CONTENT), 'petition.pdf')})
+    assert response.status_code == 201
+    return response.get_json()['document']['id']
+
+
+def _link_token(client, headers, document_id):
+    response = client.post(f'/api/documents/{document_id}/link', headers=headers)
+    assert response.status_code == 200
+    return parse_qs(urlsplit(response.get_json()['url']).query)['token'][0]
+
+
+def _download(client, document_id, token, **kwargs):
+    return client.get(f'/api/documents/{document_id}/download', query_string={'token': token}, **kwargs)
+
+
+def test_link_token_downloads_with_range_support(client, auth_headers, document_id):
+    token = _link_token(client, auth_headers, document_id)
+
+    response = _download(client, document_id, token)
+    assert response.status_code == 200
+    assert response.get_data() == CONTENT
+    assert 'attachment' in response.headers['Content-Disposition']
+    assert 'private' in response.headers['Cache-Control']
+
+    partial = _download(client, document_id, token, headers={'Range': 'bytes=9-18'})
+    assert partial.status_code == 206
+    assert partial.headers['Content-Range'] == f'bytes 9-18/{len(CONTENT)}'
+    assert partial.get_data() == CONTENT[9:19]
+
+
+def test_expired_and_tampered_tokens_are_rejected(client, auth_headers, document_id, app):
+    token = _link_token(client, auth_headers, document_id)
+
+    tampered = token[:-2] + ('AA' if token[-2:] != 'AA' else 'BB')
+    assert _download(client, document_id, tampered).status_code == 401
+    # A token names one document
+    assert _download(client, document_id + 1, token).status_code == 401
+    assert client.get(f'/api/documents/{document_id}/download').status_code == 401
+
+    app.config['DOWNLOAD_TOKEN_TTL'] = -1
+    assert _download(client, document_id, token).status_code == 401
+
+
+def test_other_users_cannot_download(client, auth_headers, document_id):
+    other = {'email': 'other@example.com', 'password': 'password123', 'full_name': 'Other Advocate'}
+    client.post('/api/auth/register', json=other)
+    login = client.post('/api/auth/login', json={'email': other['email'], 'password': other['password']})
+    other_headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+
+    assert client.get(f'/api/documents/{document_id}/download', headers=other_headers).status_code == 404
+    assert client.post(f'/api/documents/{document_id}/link', headers=other_headers).status_code == 404
+    assert client.get(f'/api/documents/{document_id}/download', headers=auth_headers).status_code == 200
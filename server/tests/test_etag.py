@@ -0,0 +1,48 @@
+def _add_case(client, headers, number):
+    response = client.post('/api/cases', headers=headers, json={
+        'case_number': number, 'title': f'Case {number}', 'case_type': 'Civil',
+        'court_name': 'District Court', 'status': 'Active'})
+    assert response.status_code == 201
+
+
+def test_matching_etag_is_304_without_loading_rows(client, auth_headers, count_queries):
+    _add_case(client, auth_headers, 'ET1')
+    first = client.get('/api/cases', headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    with count_queries() as counter:
+        cached = client.get('/api/cases', headers={**auth_headers, 'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.headers['ETag'] == etag
+    assert cached.get_data() == b''
+    assert not [statement for statement in counter.statements if 'FROM cases' in statement]
+
+    with count_queries() as counter:
+        client.get('/api/cases', headers=auth_headers)
+    assert [statement for statement in counter.statements if 'FROM cases' in statement]
+
+
+def test_write_changes_the_etag(client, auth_headers):
+    _add_case(client, auth_headers, 'ET1')
+    etag = client.get('/api/cases', headers=auth_headers).headers['ETag']
+
+    _add_case(client, auth_headers, 'ET2')
+    response = client.get('/api/cases', headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert len(response.get_json()) == 2
+
+    # Collections not named by the view keep its ETag
+    etag = response.headers['ETag']
+    assert client.post('/api/clients', headers=auth_headers, json={'name': 'Client'}).status_code == 201
+    assert client.get('/api/cases', headers={**auth_headers, 'If-None-Match': etag}).status_code == 304
+
+
+def test_each_query_string_has_its_own_etag(client, auth_headers):
+    _add_case(client, auth_headers, 'ET1')
+    etag = client.get('/api/cases', headers=auth_headers).headers['ETag']
+    response = client.get('/api/cases', headers={**auth_headers, 'If-None-Match': etag},
+                          query_string={'view': 'summary'})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
@@ -0,0 +1,35 @@
+def _case(client, headers):
+    response = client.post('/api/cases', headers=headers, json={
+        'case_number': 'HU1', 'title': 'Partition suit', 'case_type': 'Civil',
+        'court_name': 'District Court', 'status': 'Active'})
+    return response.get_json()['case']['id']
+
+
+def test_batch_atomic_must_be_a_boolean(client, auth_headers):
+    case_id = _case(client, auth_headers)
+    updates = [{'case_id': case_id, 'hearing_date': '2030-01-02'}, {'case_id': case_id}]
+
+    response = client.post('/api/hearing-updates/batch', headers=auth_headers,
+                           json={'updates': updates, 'atomic': 'false'})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'atomic must be true or false'
+
+    response = client.post('/api/hearing-updates/batch', headers=auth_headers,
+                           json={'updates': updates, 'atomic': False})
+    assert response.status_code == 201
+    assert [item['status'] for item in response.get_json()['results']] == ['created', 'error']
+
+
+def test_batch_items_must_be_objects(client, auth_headers):
+    case_id = _case(client, auth_headers)
+    updates = [1, 'x', None, {'case_id': case_id, 'hearing_date': '2030-01-02'}]
+
+    response = client.post('/api/hearing-updates/batch', headers=auth_headers,
+                           json={'updates': updates, 'atomic': False})
+    assert response.status_code == 201
+    results = response.get_json()['results']
+    assert [item['status'] for item in results] == ['error', 'error', 'error', 'created']
+    assert results[0]['error'] == 'Each update must be an object'
+
+    response = client.post('/api/hearing-updates/batch', headers=auth_headers, json=updates)
+    assert response.status_code == 400
@@ -0,0 +1,63 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.ics import _Clock, escape_text, event_lines, fold, recurrence_rule
+from app.services.recurrence import expand_occurrences
+
+
+def _row(**fields):
+    values = dict(id=1, title='Hearing', description=None, event_type=None, event_date=datetime(2030, 1, 7, 10),
+                  duration=None, location=None, reminder_time=None, recurrence=None, recurrence_interval=None,
+                  recurrence_until=None, sync_seq=3, created_at=None, updated_at=datetime(2029, 12, 1, 8))
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+def _unfold(text):
+    return text.replace('\r\n ', '')
+
+
+def test_folding_keeps_multibyte_characters_whole():
+    line = 'SUMMARY:' + 'न्यायालय सुनवाई ' * 10
+    folded = fold(line)
+    assert folded.endswith('\r\n')
+    assert all(len(part.encode('utf-8')) <= 75 for part in folded[:-2].split('\r\n'))
+    assert _unfold(folded[:-2]) == line
+    assert fold('SUMMARY:short') == 'SUMMARY:short\r\n'
+
+
+def test_text_escaping():
+    assert escape_text('Arguments; reply, rejoinder\\notes\r\nnext') == \
+        'Arguments\\; reply\\, rejoinder\\\\notes\\nnext'
+
+
+def test_until_is_utc_for_zoned_events():
+    row = _row(recurrence='weekly', recurrence_until=datetime(2030, 2, 1, 23, 59))
+    lines = event_lines(row, _Clock('Asia/Kolkata'))
+    assert 'DTSTART;TZID=Asia/Kolkata:20300107T100000' in lines
+    assert 'RRULE:FREQ=WEEKLY;INTERVAL=1;UNTIL=20300201T182900Z' in lines
+
+    all_day = _row(event_date=datetime(2030, 1, 7), recurrence='daily', recurrence_interval=2,
+                   recurrence_until=datetime(2030, 1, 31))
+    lines = event_lines(all_day, _Clock('Asia/Kolkata'))
+    assert 'DTSTART;VALUE=DATE:20300107' in lines
+    assert 'RRULE:FREQ=DAILY;INTERVAL=2;UNTIL=20300131' in lines
+
+
+@pytest.mark.parametrize('start, rule, interval', [
+    (datetime(2024, 1, 29, 9), 'monthly', 1),
+    (datetime(2024, 1, 30, 9), 'monthly', 1),
+    (datetime(2024, 1, 31, 9), 'monthly', 1),
+    (datetime(2024, 1, 31, 9), 'monthly', 5),
+    (datetime(2024, 2, 29, 9), 'yearly', 1),
+    (datetime(2024, 3, 15, 9), 'monthly', 2),
+])
+def test_rrule_matches_server_expansion(start, rule, interval):
+    rrule = pytest.importorskip('dateutil.rrule')
+    row = _row(event_date=start, recurrence=rule, recurrence_interval=interval)
+    text = recurrence_rule(row, False, _Clock('UTC'))
+    published = list(rrule.rrulestr(text[len('RRULE:'):], dtstart=start).between(
+        start, datetime(2032, 1, 1), inc=True))
+    assert published == list(expand_occurrences(start, rule, interval, None, start, datetime(2032, 1, 1)))
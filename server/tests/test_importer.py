@@ -0,0 +1,60 @@
+import io
+
+import app.services.importer as importer
+
+SHEET = (
+    'Case Number,Title,Court Name,Hearing Date,Action Taken,Next Hearing Date,Action To Be Taken\n'
+    'IMP1,Land acquisition,High Court,2030-01-02,Heard xyzzy arguments,2030-01-10,File reply\n'
+    'IMP1,,,2030-01-10,Reply xyzzy filed,,\n'
+    'IMP2,,District Court,,,,\n'
+    'IMP3,Tenancy,District Court,,,,\n'
+)
+
+
+def _import(client, headers, sheet=SHEET):
+    return client.post('/api/cases/import', headers=headers, content_type='multipart/form-data',
+                       data={'file': (io.BytesIO(sheet.encode()), 'cases.csv')})
+
+
+def test_import_indexes_hearings_and_creates_calendar_events(client, auth_headers):
+    report = _import(client, auth_headers).get_json()
+    assert (report['cases_imported'], report['hearings_imported']) == (2, 2)
+    assert report['errors'] == [{'row': 4, 'error': 'Case title is required'}]
+
+    found = client.get('/api/search', headers=auth_headers, query_string={'q': 'xyzzy', 'types': 'hearing'})
+    assert found.get_json()['total'] == 2
+
+    events = client.get('/api/calendar', headers=auth_headers).get_json()
+    assert [(event['title'], event['event_date'], event['location']) for event in events] == [
+        ('Hearing: Land acquisition', '2030-01-10T00:00:00', 'High Court')]
+
+    synced = client.get('/api/calendar/sync', headers=auth_headers).get_json()
+    assert [event['id'] for event in synced['events']] == [events[0]['id']]
+    assert int(synced['sync_token'].split('.')[0]) > 0
+
+    summary = client.get('/api/dashboard/summary', headers=auth_headers).get_json()
+    assert summary['events'] == {'total': 1, 'open': 1}
+    assert summary['hearing_updates'] == 2
+
+
+def test_failed_chunk_does_not_add_errors_to_rejected_rows(client, auth_headers, monkeypatch):
+    def failing_insert(model, rows):
+        raise RuntimeError('disk full')
+    monkeypatch.setattr(importer, 'bulk_insert', failing_insert)
+
+    report = _import(client, auth_headers).get_json()
+    assert report['cases_imported'] == 0
+    assert report['errors'] == [
+        {'row': 2, 'error': 'Chunk failed: disk full'},
+        {'row': 3, 'error': 'Chunk failed: disk full'},
+        {'row': 4, 'error': 'Case title is required'},
+        {'row': 5, 'error': 'Chunk failed: disk full'},
+    ]
+
+
+def test_cli_reports_an_empty_file_as_an_error(app, auth_headers, tmp_path):
+    path = tmp_path / 'empty.csv'
+    path.write_bytes(b'')
+    result = app.test_cli_runner().invoke(args=['import-cases', str(path), '--user-email', 'advocate@example.com'])
+    assert result.exit_code == 1
+    assert 'Error: File is empty' in result.output
@@ -0,0 +1,14 @@
+from datetime import date
+
+
+def test_responses_are_compact_unless_asked_to_indent(app):
+    with app.test_request_context():
+        body = app.json.response({'day': date(2030, 1, 7), 'name': 'Nyāya'}).get_data()
+        assert body == '{"day":"2030-01-07","name":"Nyāya"}'.encode('utf-8')
+
+        app.json.compact = False
+        try:
+            body = app.json.response({'day': date(2030, 1, 7)}).get_data()
+        finally:
+            app.json.compact = None
+        assert body == b'{\n  "day": "2030-01-07"\n}\n'
@@ -0,0 +1,44 @@
+import os
+import time
+
+import pytest
+
+from app.services import passwords as passwords_module
+from app.services.passwords import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(rounds=4, workers=1, max_pending=1, timeout=30)
+    hasher.hash('start the worker')
+    yield hasher
+    hasher.shutdown()
+
+
+def test_timed_out_job_keeps_its_slot_until_it_ends(hasher):
+    hasher.timeout = 0.2
+    with pytest.raises(PasswordHasherBusy, match='timed out'):
+        hasher._run(time.sleep, 1)
+    # Still sleeping in the pool, so the only slot is taken
+    with pytest.raises(PasswordHasherBusy, match='Too many'):
+        hasher.hash('password123')
+
+    time.sleep(1.5)
+    hasher.timeout = 30
+    assert hasher.check(hasher.hash('password123'), 'password123')
+
+
+def test_dead_worker_replaces_the_pool(hasher):
+    with pytest.raises(PasswordHasherBusy, match='restarted'):
+        hasher._run(os._exit, 1)
+    assert hasher.check(hasher.hash('password123'), 'password123')
+
+
+def test_busy_hasher_returns_503(client, auth_headers, monkeypatch):
+    def busy(*args):
+        raise PasswordHasherBusy('Too many password operations in progress')
+
+    monkeypatch.setattr(passwords_module.passwords, 'check', busy)
+    response = client.post('/api/auth/login', json={'email': 'advocate@example.com', 'password': 'password123'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from app.services.recurrence import expand_occurrences
+
+
+def expand(dtstart, rule, interval=1, until=None, start=None, end=None):
+    return list(expand_occurrences(dtstart, rule, interval, until, start or dtstart, end))
+
+
+def test_weekly_occurrences_inside_window():
+    assert expand(datetime(2024, 1, 1, 10), 'weekly', start=datetime(2024, 1, 10), end=datetime(2024, 1, 31)) == [
+        datetime(2024, 1, 15, 10), datetime(2024, 1, 22, 10), datetime(2024, 1, 29, 10)]
+
+
+def test_window_start_on_an_occurrence_includes_it():
+    assert expand(datetime(2024, 1, 1, 9), 'daily', interval=2, start=datetime(2024, 1, 5, 9),
+                  end=datetime(2024, 1, 9, 9)) == [datetime(2024, 1, 5, 9), datetime(2024, 1, 7, 9)]
+
+
+def test_window_end_is_exclusive_and_until_is_inclusive():
+    dtstart = datetime(2024, 1, 1)
+    assert expand(dtstart, 'daily', end=datetime(2024, 1, 3)) == [datetime(2024, 1, 1), datetime(2024, 1, 2)]
+    assert expand(dtstart, 'daily', until=datetime(2024, 1, 2), end=datetime(2024, 2, 1)) == [
+        datetime(2024, 1, 1), datetime(2024, 1, 2)]
+
+
+def test_monthly_clamps_to_short_months_without_drifting():
+    occurrences = expand(datetime(2024, 1, 31), 'monthly', end=datetime(2024, 5, 1))
+    assert occurrences == [datetime(2024, 1, 31), datetime(2024, 2, 29), datetime(2024, 3, 31), datetime(2024, 4, 30)]
+
+
+def test_monthly_window_far_after_start():
+    occurrences = expand(datetime(2000, 3, 15), 'monthly', interval=3, start=datetime(2024, 1, 1),
+                         end=datetime(2024, 12, 31))
+    assert occurrences == [datetime(2024, 3, 15), datetime(2024, 6, 15), datetime(2024, 9, 15), datetime(2024, 12, 15)]
+
+
+def test_yearly_leap_day():
+    assert expand(datetime(2024, 2, 29), 'yearly', end=datetime(2026, 3, 1)) == [
+        datetime(2024, 2, 29), datetime(2025, 2, 28), datetime(2026, 2, 28)]
+
+
+def test_unknown_rule_and_window_before_start_yield_nothing():
+    assert expand(datetime(2024, 1, 1), 'hourly', end=datetime(2024, 2, 1)) == []
+    assert expand(datetime(2024, 6, 1), 'daily', start=datetime(2024, 1, 1), end=datetime(2024, 2, 1)) == []
+
+
+def test_long_window_yields_every_occurrence():
+    occurrences = expand(datetime(2000, 1, 1), 'daily', end=datetime(2004, 1, 1))
+    assert len(occurrences) == 4 * 365 + 1
+    assert occurrences[-1] == datetime(2003, 12, 31)
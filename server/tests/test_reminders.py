@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.calendar_event import CalendarEvent
+from app.models.reminder_delivery import ReminderDelivery
+from app.services.jobs import run_next
+from app.services.reminder_sinks import ReminderSink, register_sink
+from app.services.reminders import ReminderScheduler, deliver_reminder, fire_reminder
+
+sent = []
+
+
+@register_sink
+class RecordingSink(ReminderSink):
+    name = 'recording'
+
+    def send(self, reminder):
+        sent.append((reminder.event_id, reminder.event_date))
+
+
+@pytest.fixture(autouse=True)
+def utc_events(app):
+    app.config['EVENT_TIMEZONE'] = 'UTC'
+    sent.clear()
+
+
+def _event(client, headers, **fields):
+    response = client.post('/api/calendar', headers=headers, json={'title': 'Hearing', 'reminder_time': 30, **fields})
+    assert response.status_code == 201
+    return response.get_json()['event']['id']
+
+
+def _remind_at(event_id):
+    db.session.expire_all()
+    return db.session.get(CalendarEvent, event_id).remind_at
+
+
+def _scheduler(now):
+    scheduler = ReminderScheduler(lookahead=3600, poll_interval=1, change_margin=60)
+    scheduler.extend_window(now)
+    return scheduler
+
+
+def test_one_off_reminder_fires_once(client, auth_headers):
+    starts = datetime.utcnow().replace(microsecond=0) + timedelta(minutes=10)
+    event_id = _event(client, auth_headers, event_date=starts.isoformat())
+    # 30 minutes before an event 10 minutes away: due at once
+    assert _remind_at(event_id) == starts - timedelta(minutes=30)
+
+    now = datetime.utcnow()
+    assert _scheduler(now).fire_due(now, ['recording']) == 1
+    assert _remind_at(event_id) is None
+    # A restarted scheduler finds nothing left to fire
+    assert _scheduler(now).fire_due(now, ['recording']) == 0
+
+    while run_next():
+        pass
+    assert sent == [(event_id, starts)]
+    assert [delivery.status for delivery in ReminderDelivery.query.all()] == ['sent']
+
+
+def test_editing_event_date_moves_remind_at(client, auth_headers):
+    event_id = _event(client, auth_headers, event_date='2030-01-07T10:00:00')
+    assert _remind_at(event_id) == datetime(2030, 1, 7, 9, 30)
+
+    client.put(f'/api/calendar/{event_id}', headers=auth_headers, json={'event_date': '2030-01-08T15:00:00'})
+    assert _remind_at(event_id) == datetime(2030, 1, 8, 14, 30)
+
+    client.put(f'/api/calendar/{event_id}', headers=auth_headers, json={'is_completed': True})
+    assert _remind_at(event_id) is None
+
+
+def test_recurring_reminder_moves_to_the_next_occurrence(client, auth_headers):
+    event_id = _event(client, auth_headers, event_date='2030-01-07T10:00:00', recurrence='weekly')
+    remind_at = _remind_at(event_id)
+    assert remind_at == datetime(2030, 1, 7, 9, 30)
+
+    assert fire_reminder(event_id, remind_at, ['recording']) == datetime(2030, 1, 14, 9, 30)
+    assert _remind_at(event_id) == datetime(2030, 1, 14, 9, 30)
+    assert [(delivery.occurrence_at, delivery.status) for delivery in ReminderDelivery.query.all()] == [
+        (datetime(2030, 1, 7, 10), 'pending')]
+    # The old entry no longer matches the row, so firing it again does nothing
+    assert fire_reminder(event_id, remind_at, ['recording']) is None
+    assert ReminderDelivery.query.count() == 1
+
+
+def test_interrupted_send_is_not_repeated(client, auth_headers):
+    event_id = _event(client, auth_headers, event_date='2030-01-07T10:00:00')
+    event = db.session.get(CalendarEvent, event_id)
+    delivery = ReminderDelivery(event_id=event_id, user_id=event.user_id, occurrence_at=datetime(2030, 1, 7, 10),
+                                sink='recording', status='sending', attempts=1)
+    db.session.add(delivery)
+    db.session.commit()
+
+    # The job is re-run after a worker died mid-send
+    deliver_reminder({'delivery_id': delivery.id})
+    db.session.commit()
+    assert sent == []
+    assert db.session.get(ReminderDelivery, delivery.id).status == 'interrupted'
+
+    deliver_reminder({'delivery_id': delivery.id})
+    assert sent == []
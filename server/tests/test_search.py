@@ -0,0 +1,45 @@
+import math
+
+from app.services.search import search
+
+
+def _add_case(client, headers, number, title, **fields):
+    response = client.post('/api/cases', headers=headers, json={
+        'case_number': number, 'title': title, 'case_type': 'Civil', 'court_name': 'District Court',
+        'status': 'Active', **fields})
+    assert response.status_code == 201
+    return response.get_json()['case']['id']
+
+
+def _search(client, headers, q, **params):
+    response = client.get('/api/search', headers=headers, query_string={'q': q, **params})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_terms_match_as_prefixes(client, auth_headers):
+    survey = _add_case(client, auth_headers, 'C1', 'Land survey dispute')
+    _add_case(client, auth_headers, 'C2', 'Surety bond recovery')
+    _add_case(client, auth_headers, 'C3', 'Tenancy matter')
+
+    found = _search(client, auth_headers, 'surv')
+    assert [hit['id'] for hit in found['results']] == [survey]
+    assert found['total'] == 1
+    assert {hit['id'] for hit in _search(client, auth_headers, 'sur')['results']} == {survey, survey + 1}
+    assert [hit['id'] for hit in _search(client, auth_headers, 'lan sur')['results']] == [survey]
+    assert _search(client, auth_headers, 'landx')['total'] == 0
+
+
+def test_idf_uses_the_number_of_documents(app, client, auth_headers):
+    for number in range(1, 10):
+        _add_case(client, auth_headers, f'P{number}', 'Property appeal')
+    rare = _add_case(client, auth_headers, 'R1', 'Property writ petition')
+
+    results, total = search(1, 'writ')
+    assert total == 1 and results[0]['id'] == rare
+    # One matching case out of ten, with tf 1
+    assert results[0]['score'] == round(math.log(1 + 10 / 1), 4)
+
+    results, _ = search(1, 'property')
+    assert results[0]['score'] == round(math.log(1 + 10 / 10), 4)
+
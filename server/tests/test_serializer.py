@@ -0,0 +1,26 @@
+from itertools import combinations
+
+import pytest
+
+from app.schemas.resources import case_serializer
+from app.schemas.serializer import COMPILED_CACHE_SIZE
+
+
+def test_parse_fields_returns_declaration_order():
+    first, second, third = case_serializer.fields[:3]
+    assert case_serializer.parse_fields(f'{third}, {first},{second},{first}') == (first, second, third)
+    with pytest.raises(ValueError, match='Unknown fields: nope'):
+        case_serializer.parse_fields(f'{first},nope')
+
+
+def test_permuted_fields_share_one_compiled_function():
+    first, second = case_serializer.fields[:2]
+    forward = case_serializer.compile(case_serializer.parse_fields(f'{first},{second}'))
+    backward = case_serializer.compile(case_serializer.parse_fields(f'{second},{first}'))
+    assert forward is backward
+
+
+def test_compiled_cache_is_bounded():
+    for subset in list(combinations(case_serializer.fields, 2))[:COMPILED_CACHE_SIZE * 2]:
+        case_serializer.compile(subset)
+    assert len(case_serializer._compiled) == COMPILED_CACHE_SIZE
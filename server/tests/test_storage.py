@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from app.services.storage import S3Storage, Storage
+
+moto = pytest.importorskip('moto')
+boto3 = pytest.importorskip('boto3')
+
+PART_SIZE = 5 * 1024 * 1024  # the smallest part S3 accepts
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    for name in ('AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_SESSION_TOKEN'):
+        monkeypatch.setenv(name, 'testing')
+    with moto.mock_aws():
+        boto3.client('s3', region_name='us-east-1').create_bucket(Bucket='documents')
+        yield S3Storage('documents', prefix='advdiary/', region='us-east-1',
+                        multipart_threshold=PART_SIZE, multipart_chunk_size=PART_SIZE, max_concurrency=2)
+
+
+def _file(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_storage_drivers_must_implement_every_operation():
+    with pytest.raises(TypeError):
+        Storage()
+
+
+def test_multipart_save_round_trip(s3, tmp_path):
+    data = os.urandom(2 * PART_SIZE + 123)
+    path = _file(tmp_path, 'big.upload', data)
+    s3.save('blobs/ab/cd/big', path, 'application/pdf')
+
+    assert not os.path.exists(path)
+    head = s3.client.head_object(Bucket='documents', Key='advdiary/blobs/ab/cd/big')
+    assert head['ETag'].strip('"').endswith('-3')
+    assert head['ContentType'] == 'application/pdf'
+    with s3.local_file('blobs/ab/cd/big') as local:
+        with open(local, 'rb') as handle:
+            assert handle.read() == data
+    assert not os.path.exists(local)
+
+
+def test_list_exists_and_delete(s3, tmp_path):
+    for key in ('blobs/ab/cd/2', 'blobs/ab/cd/1', 'legacy.pdf', 'blobs/ef/01/3'):
+        s3.save(key, _file(tmp_path, 'part', key.encode()))
+    # Outside the prefix: never listed
+    s3.client.put_object(Bucket='documents', Key='other/file', Body=b'x')
+
+    assert [obj.key for obj in s3.iter_objects()] == ['blobs/ab/cd/1', 'blobs/ab/cd/2', 'blobs/ef/01/3', 'legacy.pdf']
+    assert [obj.key for obj in s3.iter_objects('blobs/ab/')] == ['blobs/ab/cd/1', 'blobs/ab/cd/2']
+    assert [obj.key for obj in s3.iter_objects('', recursive=False)] == ['legacy.pdf']
+    assert next(s3.iter_objects('legacy')).size == len(b'legacy.pdf')
+
+    assert s3.exists('legacy.pdf')
+    s3.delete('legacy.pdf')
+    assert not s3.exists('legacy.pdf')
+    s3.delete('legacy.pdf')  # a missing key is not an error
+    with pytest.raises(FileNotFoundError):
+        with s3.local_file('legacy.pdf'):
+            pass
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.storage import S3Storage, StoredObject
+from app.services.storage_gc import collect_garbage, diff_sorted
+
+
+def _objects(*keys):
+    return [StoredObject(key, 1, datetime(2024, 1, 1)) for key in keys]
+
+
+def _ref(key):
+    return None if key.startswith('other/') else key.rsplit('/', 1)[-1]
+
+
+def _diff(keys, refs):
+    return [(obj.key if obj else None, ref) for obj, ref in diff_sorted(_objects(*keys), refs, _ref)]
+
+
+def test_unreferenced_objects_and_missing_files():
+    assert _diff(['x/a', 'x/b', 'x/d'], ['b', 'c', 'e']) == [
+        ('x/a', 'a'), (None, 'c'), ('x/d', 'd'), (None, 'e')]
+
+
+def test_everything_referenced_yields_nothing():
+    assert _diff(['x/a', 'x/b'], ['a', 'b']) == []
+
+
+def test_duplicate_references_match_one_object():
+    # Several documents can share one content-addressed blob
+    assert _diff(['x/a', 'x/b'], ['a', 'a', 'a', 'b', 'b']) == []
+
+
+def test_foreign_keys_are_reported_and_dotfiles_skipped():
+    assert _diff(['other/.gitkeep', 'other/readme', 'x/a'], ['a']) == [('other/readme', None)]
+
+
+def test_empty_sides():
+    assert _diff([], ['a', 'b']) == [(None, 'a'), (None, 'b')]
+    assert _diff(['x/a'], []) == [('x/a', 'a')]
+
+
+def _s3_storage(app, monkeypatch, prefix):
+    moto = pytest.importorskip('moto')
+    boto3 = pytest.importorskip('boto3')
+    for name in ('AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_SESSION_TOKEN'):
+        monkeypatch.setenv(name, 'testing')
+    mock = moto.mock_aws()
+    mock.start()
+    boto3.client('s3', region_name='us-east-1').create_bucket(Bucket='shared')
+    storage = S3Storage('shared', prefix=prefix, region='us-east-1')
+    monkeypatch.setitem(app.extensions, 'storage', storage)
+    return mock, storage
+
+
+@pytest.mark.parametrize('prefix, swept', [('', False), ('advdiary', True)])
+def test_legacy_sweep_needs_a_bucket_prefix(app, monkeypatch, prefix, swept):
+    mock, storage = _s3_storage(app, monkeypatch, prefix)
+    try:
+        # Another application's file at the top of a shared bucket
+        storage.client.put_object(Bucket='shared', Key=storage.prefix + 'report.pdf', Body=b'x')
+        report = collect_garbage(grace_period=-60)
+        assert ('skipped' not in report['legacy']) == swept
+        assert storage.exists('report.pdf') != swept
+    finally:
+        mock.stop()
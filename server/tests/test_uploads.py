@@ -0,0 +1,44 @@
+import hashlib
+
+import pytest
+
+import app.services.uploads as uploads
+
+CONTENT = b'%PDF-1.4\n' + bytes(range(256)) * 64
+
+
+def _upload(client, headers, chunk_size, between_chunks=lambda: None):
+    case = client.post('/api/cases', headers=headers, json={
+        'case_number': 'UP1', 'title': 'Upload case', 'case_type': 'Civil',
+        'court_name': 'District Court', 'status': 'Active'}).get_json()['case']
+    started = client.post('/api/documents/uploads', headers=headers, json={
+        'case_id': case['id'], 'title': 'Petition', 'file_name': 'petition.pdf', 'file_size': len(CONTENT)})
+    assert started.status_code == 201
+    upload_id = started.get_json()['upload_id']
+
+    for offset in range(0, len(CONTENT), chunk_size):
+        between_chunks()
+        response = client.put(f'/api/documents/uploads/{upload_id}', data=CONTENT[offset:offset + chunk_size],
+                              headers={**headers, 'Upload-Offset': str(offset),
+                                       'Content-Type': 'application/octet-stream'})
+        assert response.status_code == 200
+    between_chunks()
+    return client.post(f'/api/documents/uploads/{upload_id}/complete', headers=headers,
+                       json={'sha256': hashlib.sha256(CONTENT).hexdigest()})
+
+
+@pytest.mark.parametrize('other_worker', [False, True])
+def test_chunks_hash_to_the_file_digest(client, auth_headers, other_worker):
+    # A cleared hasher cache stands in for chunks landing on different workers
+    response = _upload(client, auth_headers, 4000, uploads._hashers.clear if other_worker else lambda: None)
+    assert response.status_code == 201
+    assert response.get_json()['document']['sha256'] == hashlib.sha256(CONTENT).hexdigest()
+
+
+def test_part_file_is_read_once_when_the_hash_state_is_missing(client, auth_headers, monkeypatch):
+    reads = []
+    hash_part = uploads._hash_part
+    monkeypatch.setattr(uploads, '_hash_part', lambda *args: reads.append(args) or hash_part(*args))
+
+    assert _upload(client, auth_headers, 2000, uploads._hashers.clear).status_code == 201
+    assert len(reads) == 1
@@ -0,0 +1,61 @@
+import pytest
+
+from app.extensions import db
+from app.models.user import User
+from app.services.user_cache import user_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(user_cache, 'clock', clock)
+    user_cache.clear()
+    return clock
+
+
+def _user_queries(counter):
+    return [statement for statement in counter.statements if 'FROM users' in statement]
+
+
+def test_one_request_reads_the_user_once(client, auth_headers, count_queries, clock):
+    with count_queries() as counter:
+        response = client.get('/api/hearing-updates/cause-list', headers=auth_headers,
+                              query_string={'date': '2030-01-07', 'format': 'pdf'})
+    assert response.status_code == 200
+    # The JWT lookup and the PDF heading share one read
+    assert len(_user_queries(counter)) == 1
+
+    with count_queries() as counter:
+        assert client.get('/api/auth/me', headers=auth_headers).status_code == 200
+    assert _user_queries(counter) == []
+
+
+def test_deactivation_through_the_orm_takes_effect_at_once(client, auth_headers, app, clock):
+    assert client.get('/api/auth/me', headers=auth_headers).status_code == 200
+
+    result = app.test_cli_runner().invoke(args=['set-user-active', 'advocate@example.com', '--inactive'])
+    assert result.exit_code == 0
+    assert client.get('/api/auth/me', headers=auth_headers).status_code == 401
+
+
+def test_deactivation_elsewhere_takes_effect_within_the_ttl(client, auth_headers, app, clock):
+    assert client.get('/api/auth/me', headers=auth_headers).status_code == 200
+
+    # Another worker's write: this process's cache is not told
+    table = User.__table__
+    db.session.execute(table.update().where(table.c.email == 'advocate@example.com').values(is_active=False))
+    db.session.commit()
+    assert client.get('/api/auth/me', headers=auth_headers).status_code == 200
+
+    clock.now += app.config['USER_CACHE_TTL'] + 1
+    response = client.get('/api/auth/me', headers=auth_headers)
+    assert response.status_code == 401
+    assert response.get_json()['error'] == 'Account is deactivated or no longer exists'
@@ -0,0 +1,10 @@
+"""Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+
+Uses the configuration named by FLASK_ENV, defaulting to 'production'
+(run.py is the Werkzeug development server).
+"""
+import os
+from app import create_app
+from app.config import config
+
+app = create_app(os.getenv('FLASK_ENV') if os.getenv('FLASK_ENV') in config else 'production')